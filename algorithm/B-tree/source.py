@@ -0,0 +1,355 @@
+"""
+Build a disk-backed B-tree
+The tree keeps signed 64-bit integer keys and values in fixed-size pages of a
+single file. Values only live in the leaves and the leaves are chained left to
+right (the B+-tree layout), so range scans never go back up the tree.
+"""
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from typing import Iterable
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+NO_PAGE = -1
+
+
+class Node:
+    """ A B-tree page decoded into Python lists """
+
+    __slots__ = ("page_id", "is_leaf", "keys", "values", "children", "next_leaf", "dirty")
+
+    def __init__(self, page_id: int, is_leaf: bool):
+        self.page_id = page_id
+        self.is_leaf = is_leaf
+        self.keys = []
+        self.values = []        # leaf only
+        self.children = []      # internal only, len(keys) + 1 page ids
+        self.next_leaf = NO_PAGE
+        self.dirty = False
+
+
+class BTree:
+    """ The B-tree
+
+    Page 0 holds the metadata. Every other page is one node: a 16 byte header
+    (kind, key count, next leaf) followed by the keys and then the values of a
+    leaf or the child page ids of an internal node. Pages are read and written
+    with pread/pwrite and decoded nodes are kept in an LRU page cache; dirty
+    nodes are written back when they are evicted or on flush().
+    """
+
+    MAGIC = b"BTREEPG1"
+    META = struct.Struct("<8sIIqqqq")     # magic, page size, order, root, page count, height, length
+    HEADER = struct.Struct("<BxxxIq")     # is leaf, key count, next leaf
+
+    def __init__(self, path: str, order: int = None, page_size: int = 4096, cache_size: int = 256):
+        """ Object Initialization, an existing file is opened with its own page size and order
+
+        :param path: the path of the index file
+        :param order: the maximum number of keys in a node, by default as many as fit in a page
+        :param page_size: the size of every page in bytes
+        :param cache_size: the maximum number of nodes kept in the page cache
+        """
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.cache = OrderedDict()
+        self.cache_size = max(cache_size, 4)
+        self.hits = 0
+        self.misses = 0
+        if os.fstat(self.fd).st_size > 0:
+            magic, self.page_size, self.order, self.root, self.page_count, self.height, self.length = \
+                self.META.unpack(os.pread(self.fd, self.META.size, 0))
+            if magic != self.MAGIC:
+                os.close(self.fd)
+                raise ValueError("{} is not a B-tree file".format(path))
+        else:
+            capacity = (page_size - self.HEADER.size - 8) // 16
+            assert capacity >= 3, "The page size is too small"
+            self.page_size = page_size
+            self.order = capacity if order is None else order
+            assert 3 <= self.order <= capacity, "The order must be between 3 and {}".format(capacity)
+            self.page_count = 1
+            self.height = 1
+            self.length = 0
+            self.root = self.new_node(True).page_id
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, key: int):
+        return self.get(key, None) is not None
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def cache_info(self) -> CacheInfo:
+        """ Report the page cache statistics, in the same shape as functools.lru_cache """
+        return CacheInfo(self.hits, self.misses, self.cache_size, len(self.cache))
+
+    # Page I/O
+    def encode(self, node: Node) -> bytes:
+        body = array("q", node.keys).tobytes() + array("q", node.values if node.is_leaf else node.children).tobytes()
+        page = self.HEADER.pack(node.is_leaf, len(node.keys), node.next_leaf) + body
+        return page + bytes(self.page_size - len(page))
+
+    def decode(self, page_id: int, page: bytes) -> Node:
+        is_leaf, count, next_leaf = self.HEADER.unpack_from(page)
+        node = Node(page_id, bool(is_leaf))
+        node.next_leaf = next_leaf
+        offset = self.HEADER.size
+        keys = array("q")
+        keys.frombytes(page[offset:offset + 8 * count])
+        node.keys = keys.tolist()
+        offset += 8 * count
+        pointers = array("q")
+        pointers.frombytes(page[offset:offset + 8 * (count if node.is_leaf else count + 1)])
+        if node.is_leaf:
+            node.values = pointers.tolist()
+        else:
+            node.children = pointers.tolist()
+        return node
+
+    def write_page(self, node: Node):
+        os.pwrite(self.fd, self.encode(node), node.page_id * self.page_size)
+        node.dirty = False
+
+    def load(self, page_id: int) -> Node:
+        """ Get a node through the page cache
+
+        :param page_id: the id of the page
+        :return: the decoded node
+        """
+        node = self.cache.get(page_id)
+        if node is not None:
+            self.hits += 1
+            self.cache.move_to_end(page_id)
+            return node
+        self.misses += 1
+        node = self.decode(page_id, os.pread(self.fd, self.page_size, page_id * self.page_size))
+        self.cache[page_id] = node
+        self.evict()
+        return node
+
+    def store(self, node: Node):
+        """ Mark a node as modified, it is written back when evicted or flushed
+
+        :param node: a node whose lists were changed
+        :return: None
+        """
+        node.dirty = True
+        self.cache[node.page_id] = node
+        self.cache.move_to_end(node.page_id)
+        self.evict()
+
+    def evict(self):
+        while len(self.cache) > self.cache_size:
+            _, node = self.cache.popitem(last=False)
+            if node.dirty:
+                self.write_page(node)
+
+    def new_node(self, is_leaf: bool) -> Node:
+        node = Node(self.page_count, is_leaf)
+        self.page_count += 1
+        self.store(node)
+        return node
+
+    def flush(self):
+        """ Write every dirty page and the metadata to the file
+
+        :return: None
+        """
+        for node in self.cache.values():
+            if node.dirty:
+                self.write_page(node)
+        meta = self.META.pack(self.MAGIC, self.page_size, self.order, self.root,
+                              self.page_count, self.height, self.length)
+        os.pwrite(self.fd, meta + bytes(self.page_size - len(meta)), 0)
+
+    def close(self):
+        if self.fd is not None:
+            self.flush()
+            os.close(self.fd)
+            self.fd = None
+            self.cache.clear()
+
+    # Queries
+    def find_leaf(self, key: int) -> Node:
+        node = self.load(self.root)
+        while not node.is_leaf:
+            node = self.load(node.children[bisect_right(node.keys, key)])
+        return node
+
+    def get(self, key: int, default=None):
+        """ Look up the value of a key
+
+        :param key: a signed 64-bit integer
+        :param default: the value returned if the key is absent
+        :return: the value of the key or default
+        """
+        node = self.find_leaf(key)
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            return node.values[i]
+        return default
+
+    def items(self, start: int = None, stop: int = None):
+        """ Scan the keys in ascending order along the leaf chain
+
+        :param start: the smallest key to report, from the first key if None
+        :param stop: the first key not to report, up to the last key if None
+        :return: a generator of (key, value) pairs with start <= key < stop
+        """
+        if start is None:
+            node = self.load(self.root)
+            while not node.is_leaf:
+                node = self.load(node.children[0])
+            i = 0
+        else:
+            node = self.find_leaf(start)
+            i = bisect_left(node.keys, start)
+        while True:
+            keys, values, next_leaf = node.keys, node.values, node.next_leaf
+            for j in range(i, len(keys)):
+                if stop is not None and keys[j] >= stop:
+                    return
+                yield keys[j], values[j]
+            if next_leaf == NO_PAGE:
+                return
+            node, i = self.load(next_leaf), 0
+
+    # Updates
+    def insert(self, key: int, value: int):
+        """ Insert a key or replace its value
+
+        :param key: a signed 64-bit integer
+        :param value: a signed 64-bit integer
+        :return: None
+        """
+        split = self.insert_aux(self.load(self.root), key, value)
+        if split is not None:
+            separator, right_page = split
+            root = self.new_node(False)
+            root.keys = [separator]
+            root.children = [self.root, right_page]
+            self.root = root.page_id
+            self.height += 1
+
+    def insert_aux(self, node: Node, key: int, value: int):
+        """ Insert below node
+
+        :return: None, or the separator key and page id of a new right sibling of node
+        """
+        if node.is_leaf:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                node.values[i] = value
+                self.store(node)
+                return None
+            node.keys.insert(i, key)
+            node.values.insert(i, value)
+            self.length += 1
+            self.store(node)
+        else:
+            i = bisect_right(node.keys, key)
+            split = self.insert_aux(self.load(node.children[i]), key, value)
+            if split is None:
+                return None
+            separator, right_page = split
+            node.keys.insert(i, separator)
+            node.children.insert(i + 1, right_page)
+            self.store(node)
+        if len(node.keys) <= self.order:
+            return None
+        return self.split(node)
+
+    def split(self, node: Node) -> tuple:
+        """ Move the upper half of an overflowing node into a new right sibling
+
+        :param node: a node with order + 1 keys
+        :return: the separator key and the page id of the new node
+        """
+        middle = len(node.keys) // 2
+        right = self.new_node(node.is_leaf)
+        if node.is_leaf:
+            right.keys, node.keys = node.keys[middle:], node.keys[:middle]
+            right.values, node.values = node.values[middle:], node.values[:middle]
+            right.next_leaf, node.next_leaf = node.next_leaf, right.page_id
+            separator = right.keys[0]
+        else:
+            separator = node.keys[middle]
+            right.keys, node.keys = node.keys[middle + 1:], node.keys[:middle]
+            right.children, node.children = node.children[middle + 1:], node.children[:middle + 1]
+        self.store(node)
+        self.store(right)
+        return separator, right.page_id
+
+    def bulk_load(self, pairs: Iterable):
+        """ Build the tree bottom-up from sorted pairs: full leaves are written
+            left to right, then every internal level is built from the one below
+
+        :param pairs: (key, value) pairs in strictly ascending key order
+        :return: None
+        """
+        assert self.length == 0, "Bulk loading needs an empty tree"
+        level = []          # (first key, page id) of every node of the current level
+        leaf = None
+        previous_key = None
+        for key, value in pairs:
+            assert previous_key is None or key > previous_key, "The keys must be strictly ascending"
+            previous_key = key
+            if leaf is None or len(leaf.keys) == self.order:
+                new_leaf = self.new_node(True)
+                if leaf is not None:
+                    leaf.next_leaf = new_leaf.page_id
+                    self.store(leaf)
+                leaf = new_leaf
+                level.append((key, leaf.page_id))
+            leaf.keys.append(key)
+            leaf.values.append(value)
+            self.length += 1
+        if leaf is None:
+            return
+        self.store(leaf)
+
+        self.height = 1
+        fan_out = self.order + 1
+        while len(level) > 1:
+            # spread the children evenly so that no node of the level is nearly empty
+            count = -(-len(level) // fan_out)
+            upper_level = []
+            for n in range(count):
+                group = level[n * len(level) // count:(n + 1) * len(level) // count]
+                node = self.new_node(False)
+                node.keys = [first_key for first_key, _ in group[1:]]
+                node.children = [page_id for _, page_id in group]
+                self.store(node)
+                upper_level.append((group[0][0], node.page_id))
+            level = upper_level
+            self.height += 1
+        self.root = level[0][1]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    index_path = os.path.join(tempfile.gettempdir(), "btree.idx")
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    with BTree(index_path, order=4, cache_size=8) as tree:
+        for k in [10, 20, 5, 6, 12, 30, 7, 17]:
+            tree.insert(k, k * 100)
+        print(list(tree.items(6, 20)), tree.height)
+    with BTree(index_path) as tree:
+        print(tree.get(17), len(tree), tree.cache_info())
+    os.remove(index_path)
@@ -0,0 +1,213 @@
+"""
+Build Binomial Heap
+A min-heap made of a root list of binomial trees ordered by degree
+"""
+from __future__ import annotations
+
+
+class Handle:
+    """ The entry of an item, returned by insert and accepted by decrease_key """
+
+    __slots__ = ("key", "value", "node")
+
+    def __init__(self, key, value, node: Node):
+        self.key = key
+        self.value = value
+        self.node = node
+
+    def __repr__(self):
+        return "Handle({!r}, {!r})".format(self.key, self.value)
+
+
+class Node:
+    """ A binomial tree node. Children are kept in a singly linked list through
+        sibling, from the highest degree down; the same link chains the roots
+    """
+
+    __slots__ = ("handle", "degree", "parent", "child", "sibling")
+
+    def __init__(self, key, value):
+        self.handle = Handle(key, value, self)
+        self.degree = 0
+        self.parent = None
+        self.child = None
+        self.sibling = None
+
+
+class BinomialHeap:
+    def __init__(self):
+        self.head = None        # the root with the smallest degree
+        self.min_node = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def link(child: Node, parent: Node):
+        """ Make one binomial tree the leftmost child of another of the same degree
+
+        :param child: the root with the larger key
+        :param parent: the root with the smaller key
+        :return: None
+        """
+        child.parent = parent
+        child.sibling = parent.child
+        parent.child = child
+        parent.degree += 1
+
+    @staticmethod
+    def merge_roots(head_1: Node, head_2: Node) -> Node:
+        """ Merge two root lists into one list sorted by degree
+
+        :param head_1: the head of a root list
+        :param head_2: the head of a root list
+        :return: the head of the merged root list
+        """
+        dummy = tail = Node(None, None)
+        while head_1 is not None and head_2 is not None:
+            if head_1.degree <= head_2.degree:
+                tail.sibling, head_1 = head_1, head_1.sibling
+            else:
+                tail.sibling, head_2 = head_2, head_2.sibling
+            tail = tail.sibling
+        tail.sibling = head_1 if head_1 is not None else head_2
+        return dummy.sibling
+
+    def union(self, head: Node):
+        """ Merge a root list into this heap and link the roots of equal degree
+
+        :param head: the head of a root list sorted by degree
+        :return: None
+        """
+        head = self.merge_roots(self.head, head)
+        if head is None:
+            self.head = self.min_node = None
+            return
+        previous, current, following = None, head, head.sibling
+        while following is not None:
+            if current.degree != following.degree or \
+                    (following.sibling is not None and following.sibling.degree == current.degree):
+                previous, current = current, following
+            elif current.handle.key <= following.handle.key:
+                current.sibling = following.sibling
+                self.link(following, current)
+            else:
+                if previous is None:
+                    head = following
+                else:
+                    previous.sibling = following
+                self.link(current, following)
+                current = following
+            following = current.sibling
+        self.head = head
+        self.update_min()
+
+    def update_min(self):
+        self.min_node = None
+        root = self.head
+        while root is not None:
+            if self.min_node is None or root.handle.key < self.min_node.handle.key:
+                self.min_node = root
+            root = root.sibling
+
+    def insert(self, key, value=None) -> Handle:
+        """ Insert an item in amortized O(1): like incrementing a binary counter,
+            the new tree is only linked while the roots in front have its degree
+
+        :param key: a comparable key
+        :param value: an optional payload
+        :return: the handle of the new item
+        """
+        node = Node(key, value)
+        handle = node.handle
+        while self.head is not None and self.head.degree == node.degree:
+            root, self.head = self.head, self.head.sibling
+            root.sibling = None
+            if root.handle.key <= node.handle.key:
+                root, node = node, root
+            self.link(root, node)
+        node.sibling = self.head
+        self.head = node
+        # node is now the root above every linked root, including the old minimum if it was linked
+        if self.min_node is None or node.handle.key <= self.min_node.handle.key:
+            self.min_node = node
+        self.size += 1
+        return handle
+
+    def find_min(self) -> Handle:
+        """ Get the item with the smallest key in O(1)
+
+        :return: the handle of that item
+        """
+        assert self.min_node is not None, "The heap is empty"
+        return self.min_node.handle
+
+    def extract_min(self) -> Handle:
+        """ Remove the item with the smallest key in O(log n)
+
+        :return: the handle of the removed item
+        """
+        assert self.min_node is not None, "The heap is empty"
+        minimum = self.min_node
+
+        # unlink the minimum root from the root list
+        if self.head is minimum:
+            self.head = minimum.sibling
+        else:
+            root = self.head
+            while root.sibling is not minimum:
+                root = root.sibling
+            root.sibling = minimum.sibling
+
+        # its children, from the highest degree down, become a root list in reverse
+        children = None
+        child = minimum.child
+        while child is not None:
+            child.parent = None
+            child.sibling, children, child = children, child, child.sibling
+        self.union(children)
+        self.size -= 1
+        minimum.handle.node = None
+        return minimum.handle
+
+    def meld(self, other: BinomialHeap):
+        """ Move every item of another heap into this heap in O(log n)
+
+        :param other: a binomial heap which is left empty
+        :return: None
+        """
+        self.size += other.size
+        self.union(other.head)
+        other.head = other.min_node = None
+        other.size = 0
+
+    def decrease_key(self, handle: Handle, key):
+        """ Lower the key of an item in O(log n) by swapping it up its tree
+
+        :param handle: the handle returned by insert
+        :param key: a key not larger than the current one
+        :return: None
+        """
+        assert handle.node is not None, "The item is not in the heap"
+        assert not key > handle.key, "The new key is larger than the current key"
+        handle.key = key
+        node = handle.node
+        parent = node.parent
+        while parent is not None and key < parent.handle.key:
+            node.handle, parent.handle = parent.handle, node.handle
+            node.handle.node, parent.handle.node = node, parent
+            node, parent = parent, parent.parent
+        if parent is None and key < self.min_node.handle.key:
+            self.min_node = node
+
+
+if __name__ == "__main__":
+    heap = BinomialHeap()
+    handles = [heap.insert(key, "item-{}".format(key)) for key in [12, 7, 25, 15, 28, 33, 41]]
+    other = BinomialHeap()
+    for key in [18, 3, 37]:
+        other.insert(key)
+    heap.meld(other)
+    heap.decrease_key(handles[4], 1)
+    print([heap.extract_min().key for _ in range(len(heap))])
@@ -3,6 +3,12 @@ Implement pattern matching solution
 Boyer-Moore Algorithm
 
 """
+import time
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import Iterable
+
+from . import matching
 
 
 def generate_z_values(pattern: str) -> list:
@@ -29,15 +35,12 @@ def generate_z_values(pattern: str) -> list:
             # Case 2b
             else:
                 assert z_values[k - l] >= r - k + 1, "Z value can not be increased since its value is too small"
-                z_k = z_values[k - l]
-                if z_values[k - l] + k > length:
-                    z_k = length - k
-                else:
-                    for i in range(length - r - 1):  # operation with length value and index value
-                        if pattern[r + 1 + i] != pattern[r - k + 1 + i]:
-                            break
-                        else:
-                            z_k += 1
+                z_k = r - k + 1
+                for i in range(length - r - 1):  # operation with length value and index value
+                    if pattern[r + 1 + i] != pattern[r - k + 1 + i]:
+                        break
+                    else:
+                        z_k += 1
                 z_values[k] = z_k
                 l, r = k, k + z_k - 1
         k += 1
@@ -48,24 +51,22 @@ class BoyerMoore:
     def __init__(self, text: str, pattern: str = None):
         self.text = text
         self.pattern = pattern
-        self.bad_character_matrix = None
+        self.bad_character_table = None
         self.z_suffix = None
         self.good_suffix = None
         self.matched_prefix = None
 
-    def generate_bad_character(self) -> list:
+    def generate_bad_character(self) -> dict:
+        """ Build the extended bad-character table. Each character of the
+            pattern is mapped to the sorted list of positions where it occurs,
+            which costs O(m) space for any str/bytes alphabet
+
+        :return: a dict object mapping a character to its ascending positions
+        """
         assert self.pattern is not None, "The pattern is empty"
-        m = len(self.pattern)
-        result = []
-        for i in range(m):
-            if i == 0:
-                result.append([0 for _ in range(26)])
-            else:
-                current_record = result[-1]
-                position = ord(self.pattern[i - 1]) - 97    # ascii lowercase start from 97
-                new_record = [item for item in current_record]
-                new_record[position] = i-1
-                result.append(new_record)
+        result = {}
+        for i, character in enumerate(self.pattern):
+            result.setdefault(character, []).append(i)
         return result
 
     def generate_z_suffix(self) -> list:
@@ -86,85 +87,250 @@ class BoyerMoore:
     def generate_matched_prefix(self) -> list:
         assert self.pattern is not None, "The pattern is empty"
         z_values = generate_z_values(self.pattern)
-        length = len(z_values)
-        matched_prefix = [0 for _ in range(length)]
-        matched_prefix[-1] = len(self.pattern)
-        longest_prefix_length = 1 if self.pattern[0] == self.pattern[-1] else 0
-        for i in range(length-1, 0, -1):
-            if z_values[i] > longest_prefix_length and z_values[i] == i - 1:
-                longest_prefix_length = z_values[i]
-            matched_prefix[length-i-1] = longest_prefix_length
-        return matched_prefix[::-1]+[0]
-
-    def get_next_shift(self, index: int, counter: int) -> int:
         m = len(self.pattern)
-        character = self.pattern[index]
-        bad_character_shift = m - self.bad_character_matrix[counter][ord(character)-97] - 1
-        if self.good_suffix[index+1] != 0:
-            good_suffix_shift = m - self.good_suffix[index+1] - 1
-        else:
-            good_suffix_shift = m - self.matched_prefix[index+1] - 1
-        return max(bad_character_shift, good_suffix_shift)
+        matched_prefix = [0 for _ in range(m+1)]
+        matched_prefix[0] = m
+        longest_prefix_length = 0
+        for i in range(m-1, 0, -1):
+            if z_values[i] + i == m:
+                longest_prefix_length = max(longest_prefix_length, z_values[i])
+            matched_prefix[i] = longest_prefix_length
+        return matched_prefix
 
-    def find(self, pattern: str) -> int:
-        """ Implement Boyer-Moore Algorithm to find the
-                first occurrence of input substring. The text only contains
-                LOWERCASE letter in this case
+    def find(self, pattern: str, stats=None) -> list:
+        """ Implement Boyer-Moore Algorithm to find all
+                occurrences of input substring. Both text and pattern may be
+                any str or bytes object. The preprocessed pattern is taken
+                from the compiled pattern cache
 
             Arg:
                 :param pattern: the substring of the original string
+                :param stats: a collections.Counter which receives the event counts and
+                    the time of the "preprocess" and "search" phases, None to disable
             Rtn:
-                :return: the index of first occurrence of pattern
+                :return: the ascending indexes of all occurrences of pattern
             Time Complexity (Worst case): O(M+N)
         """
-        # Preprocessing
+        if stats is not None:
+            start = time.perf_counter()
+            compiled_pattern = compile_pattern(pattern)
+            stats["time.preprocess"] += time.perf_counter() - start
+        else:
+            compiled_pattern = compile_pattern(pattern)
         self.pattern = pattern
-        self.bad_character_matrix = self.generate_bad_character()
-        self.z_suffix = self.generate_z_suffix()
-        self.good_suffix = self.generate_good_suffix()
-        self.matched_prefix = self.generate_matched_prefix()
+        self.bad_character_table = compiled_pattern.bad_character_table
+        self.z_suffix = compiled_pattern.z_suffix
+        self.good_suffix = compiled_pattern.good_suffix
+        self.matched_prefix = compiled_pattern.matched_prefix
+        return compiled_pattern.find(self.text, stats)
+
+    # the shift rules live on the immutable BoyerMoorePattern, these look them up for the current pattern
+    def get_bad_character_shift(self, index: int, character) -> int:
+        return compile_pattern(self.pattern).get_bad_character_shift(index, character)
+
+    def get_good_suffix_shift(self, index: int) -> int:
+        return compile_pattern(self.pattern).get_good_suffix_shift(index)
+
+    def get_next_shift(self, index: int, character) -> int:
+        return compile_pattern(self.pattern).get_next_shift(index, character)
+
+
+class BoyerMoorePattern(matching.ImmutablePattern):
+    """ An immutable, preprocessed Boyer-Moore pattern which can be
+        reused to search any number of texts
+    """
 
-        print(self.bad_character_matrix)
-        print(self.z_suffix)
-        print(self.good_suffix)
-        print(self.matched_prefix)
-        m, n = len(self.pattern), len(self.text)
+    __slots__ = ("pattern", "bad_character_table", "z_suffix", "good_suffix", "matched_prefix")
+
+    def __init__(self, pattern: str):
+        assert len(pattern) > 0, "The pattern is empty"
+        builder = BoyerMoore(None, pattern)
+        bad_character_table = builder.generate_bad_character()
+        builder.z_suffix = builder.generate_z_suffix()
+        self.set_fields(
+            pattern=pattern,
+            bad_character_table=MappingProxyType(
+                {character: tuple(positions) for character, positions in bad_character_table.items()}),
+            z_suffix=tuple(builder.z_suffix),
+            good_suffix=tuple(builder.generate_good_suffix()),
+            matched_prefix=tuple(builder.generate_matched_prefix()))
+
+    def get_bad_character_shift(self, index: int, character) -> int:
+        """ Find the shift given by the extended bad-character rule
+
+        :param index: the position of the mismatch in the pattern
+        :param character: the text character which caused the mismatch
+        :return: the distance to the rightmost occurrence of character left of index
+        """
+        positions = self.bad_character_table.get(character)
+        if not positions:
+            return index + 1
+        rank = bisect_left(positions, index)
+        if rank == 0:
+            return index + 1
+        return index - positions[rank - 1]
+
+    def get_good_suffix_shift(self, index: int) -> int:
+        """ Find the shift given by the good-suffix and matched-prefix rules
+
+        :param index: the position of the mismatch in the pattern
+        :return: a positive shift value
+        """
+        m = len(self.pattern)
+        if index == m - 1:
+            return 1
+        if self.good_suffix[index+1] != 0:
+            return m - self.good_suffix[index+1]
+        return m - self.matched_prefix[index+1]
+
+    def get_next_shift(self, index: int, character) -> int:
+        """ Find the shift after a mismatch, the larger of the two rules
+
+        :param index: the position of the mismatch in the pattern
+        :param character: the text character which caused the mismatch
+        :return: a positive shift value
+        """
+        return max(self.get_bad_character_shift(index, character), self.get_good_suffix_shift(index))
+
+    def find(self, text: str, stats=None) -> list:
+        """ Find all occurrences of this pattern in the text
+
+        :param text: a str or bytes object of the same type as the pattern
+        :param stats: a collections.Counter which receives the event counts, see
+            find_with_stats, None to disable
+        :return: the ascending indexes of all occurrences of pattern
+        """
+        if stats is not None:
+            return self.find_with_stats(text, stats)
+        pattern = self.pattern
+        m, n = len(pattern), len(text)
 
         # Implement Galil's Optimization
-        naive_shift = 1
+        # [skip_start, skip_stop] is the region of the pattern known to match the current window
         occurrence = []
         j = 0
-        stop_point = -1
+        skip_start, skip_stop = -1, -1
         while j < n - m + 1:
-            mismatched_index = None
-            counter = m - 1
-            for i in range(m-1, stop_point, -1):
-                if self.pattern[i] != self.text[j+i]:
-                    mismatched_index = i
-                    stop_point = i-1
-                    counter -= 1
-                    break
-            if mismatched_index is not None:
-                if mismatched_index + 1 >= m:
+            i = m - 1
+            while i >= 0:
+                if skip_start <= i <= skip_stop:
+                    i = skip_start - 1
+                elif pattern[i] != text[j+i]:
                     break
-                j += max(self.get_next_shift(mismatched_index+1, counter), naive_shift)
+                else:
+                    i -= 1
+            if i >= 0:
+                shift = self.get_next_shift(i, text[j+i])
+                # Galil's rule only applies after a shift taken from the good suffix
+                if i < m - 1 and shift == self.get_good_suffix_shift(i):
+                    if self.good_suffix[i+1] != 0:
+                        skip_start, skip_stop = self.good_suffix[i+1] - (m - i - 1), self.good_suffix[i+1] - 1
+                    else:
+                        skip_start, skip_stop = 0, self.matched_prefix[i+1] - 1
+                else:
+                    skip_start, skip_stop = -1, -1
             else:
                 occurrence.append(j)
-                j += max(self.matched_prefix[0], naive_shift)
+                shift = m - self.matched_prefix[1] if m > 1 else 1
+                skip_start, skip_stop = 0, m - shift - 1
+            j += shift
         return occurrence
 
+    def find_with_stats(self, text: str, stats) -> list:
+        """ The instrumented twin of find, see "Instrumentation" in the algorithm package
+
+            comparisons             the pattern characters compared against the text
+            shifts.bad_character    the shifts given by the bad-character rule
+            shifts.good_suffix      the shifts given by the good-suffix or matched-prefix rule
+            shifts.match            the shifts after an occurrence
+            galil.skipped           the characters skipped by Galil's rule
+            time.search             the time of the search
+
+        :param text: a str or bytes object of the same type as the pattern
+        :param stats: a collections.Counter which receives the event counts
+        :return: the ascending indexes of all occurrences of pattern
+        """
+        start = time.perf_counter()
+        pattern = self.pattern
+        m, n = len(pattern), len(text)
+        comparisons = bad_character_shifts = good_suffix_shifts = match_shifts = skipped = 0
+
+        occurrence = []
+        j = 0
+        skip_start, skip_stop = -1, -1
+        while j < n - m + 1:
+            i = m - 1
+            while i >= 0:
+                if skip_start <= i <= skip_stop:
+                    skipped += i - skip_start + 1
+                    i = skip_start - 1
+                else:
+                    comparisons += 1
+                    if pattern[i] != text[j+i]:
+                        break
+                    i -= 1
+            if i >= 0:
+                shift = self.get_next_shift(i, text[j+i])
+                good_suffix_shift = self.get_good_suffix_shift(i)
+                if shift == good_suffix_shift:
+                    good_suffix_shifts += 1
+                else:
+                    bad_character_shifts += 1
+                if i < m - 1 and shift == good_suffix_shift:
+                    if self.good_suffix[i+1] != 0:
+                        skip_start, skip_stop = self.good_suffix[i+1] - (m - i - 1), self.good_suffix[i+1] - 1
+                    else:
+                        skip_start, skip_stop = 0, self.matched_prefix[i+1] - 1
+                else:
+                    skip_start, skip_stop = -1, -1
+            else:
+                occurrence.append(j)
+                match_shifts += 1
+                shift = m - self.matched_prefix[1] if m > 1 else 1
+                skip_start, skip_stop = 0, m - shift - 1
+            j += shift
+
+        stats["comparisons"] += comparisons
+        stats["shifts.bad_character"] += bad_character_shifts
+        stats["shifts.good_suffix"] += good_suffix_shifts
+        stats["shifts.match"] += match_shifts
+        stats["galil.skipped"] += skipped
+        stats["time.search"] += time.perf_counter() - start
+        return occurrence
+
+    def find_stream(self, chunks: Iterable):
+        """ Search a text which arrives as a sequence of chunks, see matching.find_stream
+
+        :param chunks: an iterable of str or bytes objects of the same type as the pattern
+        :return: a generator of the absolute indexes of all occurrences of pattern
+        """
+        return matching.find_stream(chunks, self.pattern, self.find)
+
+
+# get the BoyerMoorePattern of a pattern, preprocessed once and kept in an LRU cache
+compile_pattern = matching.pattern_cache(BoyerMoorePattern)
+
+
+def find_stream(chunks: Iterable, pattern: str):
+    """ Find all occurrences of pattern in a chunked text, see BoyerMoorePattern.find_stream
+
+    :param chunks: an iterable of str or bytes objects
+    :param pattern: a non-empty str or bytes object
+    :return: a generator of the absolute indexes of all occurrences of pattern
+    """
+    return compile_pattern(pattern).find_stream(chunks)
+
 
 if __name__ == "__main__":
-    # text = "aaacababacabaabcabcabacababacababjdcn"
-    # target = "acababacaba"
     # word = "sdafffsdffqewrfqewrdsf;lrewjgkregnkngjkjfdkhgjklrem,gfdjkhgbjkfdhbjkbnruigfiu2tqrqwr"
     # target = "wrfqewrdsf;lrewjgkregnkngjkjfd"
     # text = "tbapxabbbtbapxababtbapxabaxababay"
     # target = "tbapxab"
-    # p_by = BoyerMoore(target, word)
-    # print(p_by.generate_matched_prefix())
+    text = "aaacababacabaabcabcabacababacababjdcn"
+    target = "acababacaba"
     print("Test")
     p_by = BoyerMoore(text)
     index = p_by.find(target)
     print(index)
-    # assert text[index[0]:index[0] + len(target)] == target, "Failed"
+    print(compile_pattern.cache_info())
+    assert text[index[0]:index[0] + len(target)] == target, "Failed"
@@ -0,0 +1,77 @@
+"""
+Benchmark DisjointSet.union_many, sequentially and split into forests
+
+The edges are random pairs of the items 0..n-1. The parallel path of
+union_many reduces every chunk of edges to a spanning forest in a worker,
+merges the forests pairwise in the pool and links the last forest in the
+parent process. The machine this was measured on has a single core, so the
+steps are timed one after another in this process and the time of a run on
+4 cores is the sum of the slowest step of every stage, without the cost of
+pickling the chunks to the workers:
+
+    items      edges      sequential    chunk    merges    final link    4 cores
+    10^6       2 * 10^6   4.27s         1.50s    3.62s     2.04s         7.16s
+    10^5       2 * 10^6   2.82s         0.45s    0.26s     0.14s         0.86s
+
+With as many edges as items a forest is as large as its chunk, so merging
+and linking the forests costs more than the unions it replaces and the
+sequential path is faster. With many more edges than items the forests have
+at most n - 1 edges and the 4 core estimate is 3.3 times faster than the
+sequential path. The speedup on real cores was not measured here.
+
+Run from this directory: python benchmark.py
+"""
+import random
+import time
+
+import source
+from source import DisjointSet
+
+WORKERS = 4
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def link_forest(disjoint_set: DisjointSet, forest) -> int:
+    return sum(disjoint_set.link(forest[i], forest[i + 1]) for i in range(0, len(forest), 2))
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    print("{:<11}{:<11}{:<14}{:<9}{:<10}{:<14}{}".format(
+        "items", "edges", "sequential", "chunk", "merges", "final link", "{} cores".format(WORKERS)))
+    for n, e in ((10 ** 6, 2 * 10 ** 6), (10 ** 5, 2 * 10 ** 6)):
+        edges = [(random.randrange(n), random.randrange(n)) for _ in range(e)]
+        sequential = DisjointSet(range(n))
+        _, sequential_time = timed(sequential.union_many, edges)
+
+        source.start_worker(None, n)
+        forests = []
+        chunk_time = 0
+        for chunk in source.edge_chunks(edges, -(-e // WORKERS)):
+            forest, elapsed = timed(source.reduce_edges, chunk)
+            forests.append(forest)
+            chunk_time = max(chunk_time, elapsed)
+        # the pool merges the forests pairwise, the merges of one level run side by side
+        merge_time = 0
+        while len(forests) > 1:
+            level_time = 0
+            merged_forests = []
+            for i in range(0, len(forests) - 1, 2):
+                forest, elapsed = timed(source.reduce_forests, forests[i], forests[i + 1])
+                merged_forests.append(forest)
+                level_time = max(level_time, elapsed)
+            merged_forests.extend(forests[len(forests) - len(forests) % 2:])
+            forests = merged_forests
+            merge_time += level_time
+        parallel = DisjointSet(range(n))
+        _, link_time = timed(link_forest, parallel, forests[0])
+        assert parallel.components() == sequential.components()
+
+        print("{:<11}{:<11}{:<14}{:<9}{:<10}{:<14}{:.2f}s".format(
+            n, e, "{:.2f}s".format(sequential_time), "{:.2f}s".format(chunk_time), "{:.2f}s".format(merge_time),
+            "{:.2f}s".format(link_time), chunk_time + merge_time + link_time))
@@ -1,77 +1,135 @@
 """
 Build Disjoint Set
 """
+import operator
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# the number of edges union_many reads from its input at once
+CHUNK_SIZE = 1 << 18
 
 
 class DisjointSet:
-    def __init__(self, data: list, mode: str = "size"):
+    AGGREGATES = {"sum": operator.add, "min": min, "max": max}
+
+    def __init__(self, data: list, mode: str = "size", aggregate=None, values: list = None):
         """ Object Initialization
 
         :param data: a 1D list that need to stored in this Disjoint list
         :param mode: it decides what will be stored in parent array and how union work. (size/height)
+        :param aggregate: "sum", "min", "max" or a binary function kept for every set, None to disable
+        :param values: the value of every item for the aggregate, the items themselves by default
         """
         self.index_data = self.generate_data_index(data)
-        self.parent_array = [-1 for _ in range(len(data))]
+        self.items = None if self.index_data is None else list(data)    # index -> item
+        self.parent_array = array("q", [-1]) * len(data)
         self.mode = mode
+        self.num_components = len(data)
+        # set sizes are only implicit in the parent array in size mode
+        self.size_array = array("q", [1]) * len(data) if mode == "height" else None
+        self.aggregate = self.AGGREGATES.get(aggregate, aggregate)
+        self.aggregate_values = None
+        if self.aggregate is not None:
+            self.aggregate_values = list(data) if values is None else list(values)
+            assert len(self.aggregate_values) == len(data), "Every item needs a value"
 
     @staticmethod
     def generate_data_index(data):
-        """ Create a dictionary to store data and its index for later reference
+        """ Create a dictionary to store data and its index for later reference.
+            When the data are exactly the integers 0..n-1 no dictionary is needed,
+            the items are their own indexes
 
         :param data: a 1d list data
-        :return: a dictionary object stored the data and its index
+        :return: a dictionary object stored the data and its index, None for 0..n-1
         """
+        if isinstance(data, range) and data == range(len(data)):
+            return None
+        if all(type(data[i]) is int and data[i] == i for i in range(len(data))):
+            return None
         result = {}
         for i in range(len(data)):
             result[data[i]] = i
         return result
 
+    def get_index(self, item) -> int:
+        """ Get the position of an item in the parent array
+
+        :param item: a node item may exist in the tree
+        :return: the index of the item
+        """
+        if self.index_data is None:
+            assert type(item) is int and 0 <= item < len(self.parent_array), \
+                "Input item is not existed in this Disjoint Set"
+            return item
+        index = self.index_data.get(item)
+        assert index is not None, "Input item is not existed in this Disjoint Set"
+        return index
+
+    def find_root(self, index: int) -> int:
+        """ Find the index of the root above an index. Path halving points every
+            visited node at its grandparent, which keeps the trees nearly flat
+
+        :param index: the index of a node item
+        :return: the index of the root item
+        """
+        parent_array = self.parent_array
+        parent = parent_array[index]
+        while parent >= 0:
+            grandparent = parent_array[parent]
+            if grandparent < 0:
+                return parent
+            parent_array[index] = grandparent
+            index, parent = grandparent, parent_array[grandparent]
+        return index
+
     def find(self, item: int):
         """ Find the root of the tree containing the input item
 
         :param item: a node item may exist in the tree
         :return: the value of root item of the subtree/subset
         """
-        assert item in self.index_data.keys(), "Input item is not existed in this Disjoint Set"
-        flag = True
-        current = item
-        while flag:
-            index = self.index_data[current]
-            if self.parent_array[index] >= 0:
-                current = self.parent_array[index]
-            else:
-                return current
+        root = self.find_root(self.get_index(item))
+        return root if self.items is None else self.items[root]
 
-    def union(self, item_1: int, item_2: int):
+    def union(self, item_1: int, item_2: int) -> bool:
         """ Union the root node of the tree with smaller number of
             elements to the root for the larger one
 
         :param item_1: the value of a node item
         :param item_2: the value of a node item
-        :return: None
+        :return: True if two trees were merged, False if the items were already connected
+        """
+        return self.link(self.get_index(item_1), self.get_index(item_2))
+
+    def link(self, index_1: int, index_2: int) -> bool:
+        """ Union the trees containing two indexes
+
+        :param index_1: the index of a node item
+        :param index_2: the index of a node item
+        :return: True if two trees were merged, False if they were the same tree
         """
         def union_by_height():
             if value_1 <= value_2:
-                self.parent_array[index_2] = root_1
-                self.parent_array[index_1] -= 1
+                self.parent_array[index_2] = index_1
+                if value_1 == value_2:
+                    self.parent_array[index_1] -= 1
             else:
-                self.parent_array[index_1] = root_2
-                self.parent_array[index_2] -= 1
+                self.parent_array[index_1] = index_2
 
         def union_by_size():
             if value_1 <= value_2:
-                self.parent_array[index_2] = root_1
-                self.parent_array[index_1] = -(abs(value_1) + abs(value_2))
+                self.parent_array[index_2] = index_1
+                self.parent_array[index_1] = value_1 + value_2
             else:
-                self.parent_array[index_1] = root_2
-                self.parent_array[index_2] = -(abs(value_1) + abs(value_2))
-
-        root_1 = self.find(item_1)
-        root_2 = self.find(item_2)
+                self.parent_array[index_1] = index_2
+                self.parent_array[index_2] = value_1 + value_2
 
-        assert root_1 != root_2, "Unionised items are located in the same tree"
-        index_1 = self.index_data[root_1]
-        index_2 = self.index_data[root_2]
+        index_1 = self.find_root(index_1)
+        index_2 = self.find_root(index_2)
+        if index_1 == index_2:
+            return False
 
         value_1 = self.parent_array[index_1]
         value_2 = self.parent_array[index_2]
@@ -80,6 +138,248 @@ class DisjointSet:
             union_by_height()
         else:
             union_by_size()
+        root, child = (index_2, index_1) if self.parent_array[index_1] >= 0 else (index_1, index_2)
+        if self.size_array is not None:
+            self.size_array[root] += self.size_array[child]
+        if self.aggregate is not None:
+            self.aggregate_values[root] = self.aggregate(self.aggregate_values[root], self.aggregate_values[child])
+        self.num_components -= 1
+        return True
+
+    def union_many(self, edges, workers: int = 1, chunk_size: int = CHUNK_SIZE) -> int:
+        """ Union the items of every edge. With several workers, every process
+            maps a chunk of the edges to indexes and reduces it to a spanning
+            forest, the forests are reduced pairwise in the pool as well, and only
+            the last forest, at most n - 1 edges, is linked here. This pays off
+            when there are many more edges than items; with about as many edges
+            as items the forests are as large as the input and the sequential
+            path is faster, see benchmark.py
+
+        :param edges: an iterable of item pairs, or an (k, 2) NumPy array
+        :param workers: the number of processes
+        :param chunk_size: the number of edges read from the input at once
+        :return: the number of unions which merged two trees
+        """
+        get_index = self.get_index
+        merged = 0
+        if workers <= 1:
+            for chunk in edge_chunks(edges, chunk_size):
+                if hasattr(chunk, "tolist"):
+                    chunk = chunk.tolist()
+                for item_1, item_2 in chunk:
+                    merged += self.link(get_index(item_1), get_index(item_2))
+            return merged
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=start_worker,
+                                 initargs=(self.index_data, len(self.parent_array))) as executor:
+            pending = deque()
+            forests = []
+
+            def collect():
+                forests.append(pending.popleft().result())
+                if len(forests) == 2:
+                    pending.append(executor.submit(reduce_forests, forests.pop(), forests.pop()))
+
+            for chunk in edge_chunks(edges, chunk_size):
+                pending.append(executor.submit(reduce_edges, chunk))
+                if len(pending) >= 2 * workers:
+                    collect()
+            while pending:
+                collect()
+        for forest in forests:
+            for i in range(0, len(forest), 2):
+                merged += self.link(forest[i], forest[i + 1])
+        return merged
+
+    def add(self, item, value=None) -> int:
+        """ Add a new item as a set of its own in amortized O(1)
+
+        :param item: a new item
+        :param value: the value of the item for the aggregate, the item itself by default
+        :return: the index of the new item
+        """
+        index = len(self.parent_array)
+        if self.index_data is None and not (type(item) is int and item == index):
+            # the items are no longer 0..n-1, switch to the dictionary index
+            self.index_data = {i: i for i in range(index)}
+            self.items = list(range(index))
+        if self.index_data is not None:
+            assert item not in self.index_data, "Input item is already existed in this Disjoint Set"
+            self.index_data[item] = index
+            self.items.append(item)
+        self.parent_array.append(-1)
+        if self.size_array is not None:
+            self.size_array.append(1)
+        if self.aggregate is not None:
+            self.aggregate_values.append(item if value is None else value)
+        self.num_components += 1
+        return index
+
+    def size_of(self, item) -> int:
+        """ Get the number of items in the set containing the input item
+
+        :param item: a node item may exist in the tree
+        :return: the size of its set
+        """
+        root = self.find_root(self.get_index(item))
+        return self.size_array[root] if self.size_array is not None else -self.parent_array[root]
+
+    def aggregate_of(self, item):
+        """ Get the aggregate of the values in the set containing the input item
+
+        :param item: a node item may exist in the tree
+        :return: the aggregated value of its set
+        """
+        assert self.aggregate is not None, "No aggregate is kept by this Disjoint Set"
+        return self.aggregate_values[self.find_root(self.get_index(item))]
+
+    def find_many(self, items) -> list:
+        """ Find the roots of many items at once
+
+        :param items: an iterable of items, or a 1D NumPy array
+        :return: a list with the root item of every input item
+        """
+        if hasattr(items, "tolist"):
+            items = items.tolist()
+        get_index, find_root = self.get_index, self.find_root
+        roots = [find_root(get_index(item)) for item in items]
+        return roots if self.items is None else [self.items[root] for root in roots]
+
+    def components(self) -> array:
+        """ Label every item with the id of its set. Set ids are numbered
+            0, 1, 2, ... in the order of their first item
+
+        :return: an array whose i-th value is the set id of the i-th item
+        """
+        labels = array("q", [-1]) * len(self.parent_array)
+        root_labels = {}
+        for index in range(len(self.parent_array)):
+            root = self.find_root(index)
+            labels[index] = root_labels.setdefault(root, len(root_labels))
+        return labels
+
+
+def edge_chunks(edges, size: int):
+    """ Cut edges into chunks without copying the whole input
+
+    :param edges: an iterable of item pairs, or an (k, 2) NumPy array
+    :param size: the number of edges in a chunk
+    :return: a generator of NumPy slices or lists of pairs
+    """
+    if hasattr(edges, "tolist") and hasattr(edges, "shape"):
+        for start in range(0, len(edges), size):
+            yield edges[start:start + size]
+        return
+    iterator = iter(edges)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# the state of a worker process of DisjointSet.union_many, set by start_worker
+worker_index = None
+worker_parent = None
+
+
+def start_worker(index_data: dict, n: int):
+    """ Keep the item index and a parent array for the lifetime of a worker process
+
+    :param index_data: the item -> index dictionary, None for the items 0..n-1
+    :param n: the number of items
+    """
+    global worker_index, worker_parent
+    worker_index = index_data
+    worker_parent = array("q", [-1]) * n
+
+
+def reduce_edges(chunk) -> array:
+    """ Reduce a chunk of item pairs to a spanning forest, this runs in the
+        worker processes of DisjointSet.union_many
+
+    :param chunk: a list of item pairs, or an (k, 2) NumPy array
+    :return: the flattened (index, root index) pairs of every touched non-root node
+    """
+    if hasattr(chunk, "tolist"):
+        chunk = chunk.tolist()
+    flat_edges = array("q")
+    if worker_index is None:
+        n = len(worker_parent)
+        for item_1, item_2 in chunk:
+            assert type(item_1) is int and type(item_2) is int and 0 <= item_1 < n and 0 <= item_2 < n, \
+                "Input item is not existed in this Disjoint Set"
+            flat_edges.append(item_1)
+            flat_edges.append(item_2)
+    else:
+        get = worker_index.get
+        for item_1, item_2 in chunk:
+            index_1, index_2 = get(item_1), get(item_2)
+            assert index_1 is not None and index_2 is not None, "Input item is not existed in this Disjoint Set"
+            flat_edges.append(index_1)
+            flat_edges.append(index_2)
+    return spanning_forest(flat_edges)
+
+
+def reduce_forests(forest_1: array, forest_2: array) -> array:
+    """ Merge two spanning forests into one, this runs in the worker processes
+
+    :param forest_1: flattened index pairs
+    :param forest_2: flattened index pairs
+    :return: the flattened (index, root index) pairs of the merged forest
+    """
+    forest_1.extend(forest_2)
+    return spanning_forest(forest_1)
+
+
+def spanning_forest(flat_edges: array) -> array:
+    """ Reduce index pairs to a spanning forest of the nodes they touch. The
+        parent array of the worker is used with union by size and path halving,
+        and the touched entries are reset afterwards for the next chunk
+
+    :param flat_edges: the index pairs of the edges, flattened
+    :return: the flattened (index, root index) pairs of every touched non-root node
+    """
+    parent = worker_parent
+    children = array("q")
+    pairs = iter(flat_edges)
+    for root_1, root_2 in zip(pairs, pairs):
+        # path halving, inlined for both ends of the edge
+        up = parent[root_1]
+        while up >= 0:
+            above = parent[up]
+            if above < 0:
+                root_1 = up
+                break
+            parent[root_1] = above
+            root_1, up = above, parent[above]
+        up = parent[root_2]
+        while up >= 0:
+            above = parent[up]
+            if above < 0:
+                root_2 = up
+                break
+            parent[root_2] = above
+            root_2, up = above, parent[above]
+        if root_1 != root_2:
+            size_1, size_2 = parent[root_1], parent[root_2]
+            if size_1 > size_2:
+                root_1, root_2 = root_2, root_1
+            parent[root_1] = size_1 + size_2
+            parent[root_2] = root_1
+            children.append(root_2)
+
+    forest = array("q")
+    for child in children:
+        root = child
+        while parent[root] >= 0:
+            root = parent[root]
+        parent[child] = root
+        forest.append(child)
+        forest.append(root)
+    for i in range(len(forest)):
+        parent[forest[i]] = -1
+    return forest
 
 
 if __name__ == "__main__":
@@ -90,5 +390,11 @@ if __name__ == "__main__":
     disjoint_set.union(5, 7)
     disjoint_set.union(3, 7)
     print(disjoint_set.parent_array)
+    print(disjoint_set.union(3, 4))
+    disjoint_set.union_many([(0, 1), (1, 2), (2, 0)])
+    print(disjoint_set.components())
 
-
+    weighted_set = DisjointSet(["a", "b", "c"], aggregate="sum", values=[1, 2, 3])
+    weighted_set.add("d", 4)
+    weighted_set.union("a", "d")
+    print(weighted_set.size_of("d"), weighted_set.aggregate_of("a"), weighted_set.num_components)
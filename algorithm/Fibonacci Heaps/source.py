@@ -0,0 +1,284 @@
+"""
+Build Fibonacci Heap
+A min-heap with O(1) amortized insert and decrease-key, used by the
+Dijkstra and Prim drivers below
+"""
+from __future__ import annotations
+
+
+class Node:
+    """ A Fibonacci heap node, it is also the handle of its item. Siblings
+        form a circular doubly linked list through left and right
+    """
+
+    __slots__ = ("key", "value", "degree", "parent", "child", "left", "right", "mark")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.degree = 0
+        self.parent = None
+        self.child = None
+        self.left = self
+        self.right = self
+        self.mark = False
+
+    def __repr__(self):
+        return "Node({!r}, {!r})".format(self.key, self.value)
+
+
+class FibonacciHeap:
+    def __init__(self):
+        self.min_node = None    # a node of the root list with the smallest key
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def splice(node_1: Node, node_2: Node):
+        """ Join two circular lists into one
+
+        :param node_1: a node of a circular list
+        :param node_2: a node of another circular list
+        :return: None
+        """
+        right_1, left_2 = node_1.right, node_2.left
+        node_1.right, node_2.left = node_2, node_1
+        left_2.right, right_1.left = right_1, left_2
+
+    @staticmethod
+    def unlink(node: Node):
+        """ Remove a node from its circular list, leaving it as a list of its own """
+        node.left.right, node.right.left = node.right, node.left
+        node.left = node.right = node
+
+    def insert(self, key, value=None) -> Node:
+        """ Insert an item in O(1) by adding a single-node tree to the root list
+
+        :param key: a comparable key
+        :param value: an optional payload
+        :return: the node of the item, which is its handle for decrease_key
+        """
+        node = Node(key, value)
+        if self.min_node is None:
+            self.min_node = node
+        else:
+            self.splice(self.min_node, node)
+            if key < self.min_node.key:
+                self.min_node = node
+        self.size += 1
+        return node
+
+    def find_min(self) -> Node:
+        assert self.min_node is not None, "The heap is empty"
+        return self.min_node
+
+    def meld(self, other: FibonacciHeap):
+        """ Move every item of another heap into this heap in O(1)
+
+        :param other: a Fibonacci heap which is left empty
+        :return: None
+        """
+        if other.min_node is None:
+            return
+        if self.min_node is None:
+            self.min_node = other.min_node
+        else:
+            self.splice(self.min_node, other.min_node)
+            if other.min_node.key < self.min_node.key:
+                self.min_node = other.min_node
+        self.size += other.size
+        other.min_node = None
+        other.size = 0
+
+    def extract_min(self) -> Node:
+        """ Remove the item with the smallest key in O(log n) amortized
+
+        :return: the removed node
+        """
+        assert self.min_node is not None, "The heap is empty"
+        minimum = self.min_node
+
+        # move the children of the minimum to the root list
+        child = minimum.child
+        if child is not None:
+            node = child
+            while True:
+                node.parent = None
+                node = node.right
+                if node is child:
+                    break
+            self.splice(minimum, child)
+            minimum.child = None
+
+        if minimum.right is minimum:
+            self.min_node = None
+        else:
+            self.min_node = minimum.right
+            self.unlink(minimum)
+            self.consolidate()
+        self.size -= 1
+        minimum.degree = 0
+        # a removed node belongs to no list, which decrease_key checks
+        minimum.left = minimum.right = None
+        return minimum
+
+    def consolidate(self):
+        """ Link the roots of equal degree until all degrees differ. The roots
+            are collected first, so the loop is iterative and never revisits
+            a root list that is being rewritten
+
+        :return: None
+        """
+        roots = []
+        node = self.min_node
+        while True:
+            roots.append(node)
+            node = node.right
+            if node is self.min_node:
+                break
+        by_degree = []
+        for node in roots:
+            self.unlink(node)
+            while node.degree < len(by_degree) and by_degree[node.degree] is not None:
+                other = by_degree[node.degree]
+                by_degree[node.degree] = None
+                if other.key < node.key:
+                    node, other = other, node
+                # make other a child of node
+                other.parent = node
+                other.mark = False
+                if node.child is None:
+                    node.child = other
+                else:
+                    self.splice(node.child, other)
+                node.degree += 1
+            while len(by_degree) <= node.degree:
+                by_degree.append(None)
+            by_degree[node.degree] = node
+
+        self.min_node = None
+        for node in by_degree:
+            if node is None:
+                continue
+            if self.min_node is None:
+                self.min_node = node
+            else:
+                self.splice(self.min_node, node)
+                if node.key < self.min_node.key:
+                    self.min_node = node
+
+    def decrease_key(self, node: Node, key):
+        """ Lower the key of an item in O(1) amortized by cutting it from its
+            parent, followed by cascading cuts of marked ancestors
+
+        :param node: the handle returned by insert, still in the heap
+        :param key: a key not larger than the current one
+        :return: None
+        """
+        assert self.min_node is not None, "The heap is empty"
+        assert node.left is not None, "The node was extracted from the heap"
+        assert not key > node.key, "The new key is larger than the current key"
+        node.key = key
+        parent = node.parent
+        if parent is not None and key < parent.key:
+            child = node
+            while True:
+                self.cut(child, parent)
+                child, parent = parent, parent.parent
+                if parent is None:
+                    break
+                if not child.mark:
+                    child.mark = True
+                    break
+        # a node left below its parent has a key no smaller than the minimum
+        if key < self.min_node.key:
+            self.min_node = node
+
+    def cut(self, node: Node, parent: Node):
+        """ Move a node from the children of parent to the root list """
+        if parent.child is node:
+            parent.child = node.right if node.right is not node else None
+        self.unlink(node)
+        parent.degree -= 1
+        node.parent = None
+        node.mark = False
+        self.splice(self.min_node, node)
+
+
+def dijkstra(graph: dict, source) -> dict:
+    """ Find the shortest distances from source with a Fibonacci heap. Every
+        vertex is inserted once and improved with decrease_key, so the heap
+        never holds more than one entry per vertex
+
+    :param graph: a dict mapping every vertex to a list of (neighbour, non-negative weight)
+    :param source: the start vertex
+    :return: a dict mapping every reachable vertex to its distance
+    """
+    heap = FibonacciHeap()
+    handles = {source: heap.insert(0, source)}
+    distances = {}
+    while len(heap):
+        node = heap.extract_min()
+        vertex, distance = node.value, node.key
+        distances[vertex] = distance
+        for neighbour, weight in graph.get(vertex, ()):
+            if neighbour in distances:
+                continue
+            handle = handles.get(neighbour)
+            if handle is None:
+                handles[neighbour] = heap.insert(distance + weight, neighbour)
+            elif distance + weight < handle.key:
+                heap.decrease_key(handle, distance + weight)
+    return distances
+
+
+def prim(graph: dict, root=None) -> list:
+    """ Build a minimum spanning tree of the component of root with a Fibonacci heap
+
+    :param graph: an undirected graph, a dict mapping every vertex to a list of (neighbour, weight)
+    :param root: the start vertex, the first vertex of graph by default
+    :return: the tree edges as (parent, vertex, weight) tuples
+    """
+    if root is None:
+        root = next(iter(graph))
+    heap = FibonacciHeap()
+    handles = {root: heap.insert(0, root)}
+    parents = {root: None}
+    in_tree = set()
+    edges = []
+    while len(heap):
+        node = heap.extract_min()
+        vertex = node.value
+        in_tree.add(vertex)
+        if parents[vertex] is not None:
+            edges.append((parents[vertex], vertex, node.key))
+        for neighbour, weight in graph.get(vertex, ()):
+            if neighbour in in_tree:
+                continue
+            handle = handles.get(neighbour)
+            if handle is None:
+                handles[neighbour] = heap.insert(weight, neighbour)
+                parents[neighbour] = vertex
+            elif weight < handle.key:
+                heap.decrease_key(handle, weight)
+                parents[neighbour] = vertex
+    return edges
+
+
+if __name__ == "__main__":
+    heap = FibonacciHeap()
+    nodes = [heap.insert(key) for key in [23, 7, 21, 3, 18, 52, 38, 39, 41]]
+    heap.extract_min()
+    heap.decrease_key(nodes[5], 1)
+    print([heap.extract_min().key for _ in range(len(heap))])
+
+    graph = {
+        "a": [("b", 4), ("c", 1)],
+        "b": [("a", 4), ("c", 2), ("d", 5)],
+        "c": [("a", 1), ("b", 2), ("d", 8)],
+        "d": [("b", 5), ("c", 8)],
+    }
+    print(dijkstra(graph, "a"))
+    print(prim(graph, "a"))
@@ -2,6 +2,10 @@
 Implement pattern matching
 
 """
+import time
+from typing import Iterable
+
+from . import matching
 
 
 def naive_algorithm(pattern: str, text: str) -> int:
@@ -21,77 +25,324 @@ def naive_algorithm(pattern: str, text: str) -> int:
         for j in range(m):
             if text[i+j] != pattern[j]:
                 break
-        if j+1 == m:
+        else:
             return i
 
 
+def extend_z_values(string: str, z_values: list, start: int = 1, stats=None) -> list:
+    """ Fill in the Z-values of string from position start onwards. The
+        values before start must already be computed and no Z-box may
+        cross start, which holds right after a unique separator
+
+    Arg:
+        :param string: the string whose Z-values are computed
+        :param z_values: a list of len(string) values, valid before start
+        :param start: the first position to compute
+        :param stats: a collections.Counter which receives the event counts, see
+            extend_z_values_with_stats, None to disable
+    Rtn:
+        :return: the completed z_values list
+    """
+    if stats is not None:
+        return extend_z_values_with_stats(string, z_values, start, stats)
+    length = len(string)
+    l, r = 0, 0
+    k = start
+    while k < length:
+        # Case 1
+        if k > r:
+            z_k = 0
+            for i in range(length - k):
+                if string[i] != string[k + i]:
+                    break
+                else:
+                    z_k += 1
+            if z_k > 0:
+                l, r = k, k + z_k - 1
+                z_values[k] = z_k
+        else:
+            # Case 2a
+            if z_values[k - l] < r - k + 1:
+                z_values[k] = z_values[k - l]
+            # Case 2b
+            else:
+                assert z_values[k - l] >= r - k + 1, "Z value can not be increased since its value is too small"
+                z_k = r - k + 1
+                for i in range(length - r - 1):  # operation with length value and index value
+                    if string[r + 1 + i] != string[r - k + 1 + i]:
+                        break
+                    else:
+                        z_k += 1
+                z_values[k] = z_k
+                l, r = k, k + z_k - 1
+        k += 1
+    return z_values
+
+
+def extend_z_values_with_stats(string: str, z_values: list, start: int, stats) -> list:
+    """ The instrumented twin of extend_z_values, see "Instrumentation" in the algorithm package
+
+        comparisons         the characters compared
+        z.explicit          the positions outside any Z-box (Case 1)
+        z.box_reuses        the Z-values copied from inside a Z-box (Case 2a)
+        z.box_extensions    the Z-boxes extended past their right end (Case 2b)
+        time.z_values       the time of the computation
+
+    Arg:
+        :param string: the string whose Z-values are computed
+        :param z_values: a list of len(string) values, valid before start
+        :param start: the first position to compute
+        :param stats: a collections.Counter which receives the event counts
+    Rtn:
+        :return: the completed z_values list
+    """
+    started = time.perf_counter()
+    comparisons = explicit = box_reuses = box_extensions = 0
+    length = len(string)
+    l, r = 0, 0
+    k = start
+    while k < length:
+        # Case 1
+        if k > r:
+            explicit += 1
+            z_k = 0
+            for i in range(length - k):
+                comparisons += 1
+                if string[i] != string[k + i]:
+                    break
+                else:
+                    z_k += 1
+            if z_k > 0:
+                l, r = k, k + z_k - 1
+                z_values[k] = z_k
+        else:
+            # Case 2a
+            if z_values[k - l] < r - k + 1:
+                box_reuses += 1
+                z_values[k] = z_values[k - l]
+            # Case 2b
+            else:
+                box_extensions += 1
+                z_k = r - k + 1
+                for i in range(length - r - 1):
+                    comparisons += 1
+                    if string[r + 1 + i] != string[r - k + 1 + i]:
+                        break
+                    else:
+                        z_k += 1
+                z_values[k] = z_k
+                l, r = k, k + z_k - 1
+        k += 1
+    stats["comparisons"] += comparisons
+    stats["z.explicit"] += explicit
+    stats["z.box_reuses"] += box_reuses
+    stats["z.box_extensions"] += box_extensions
+    stats["time.z_values"] += time.perf_counter() - started
+    return z_values
+
+
 class GusfieldZ:
     def __init__(self, text: str, pattern: str = None):
         self.pattern = pattern
         self.text = text
-        self.concatenated_str = None
         self.z_values = None
 
-    def generate_z_values(self) -> list:
-        assert self.concatenated_str is not None, "The pattern is empty"
-        length = len(self.concatenated_str)
-        z_values = [0 for _ in range(length)]
-        l, r = 0, 0
-        k = 1
-        while k < length:
+    def _load_pattern(self, pattern: str, stats=None):
+        if stats is None:
+            compiled_pattern = compile_pattern(pattern)
+        else:
+            start = time.perf_counter()
+            compiled_pattern = compile_pattern(pattern)
+            stats["time.preprocess"] += time.perf_counter() - start
+        self.pattern = pattern
+        self.z_values = compiled_pattern.z_values
+        return compiled_pattern
+
+    def find(self, pattern: str, stats=None):
+        """ Implement Gusfield's Z-algorithm to find the
+        first occurrence of input substring. The Z-values
+        of the pattern are taken from the compiled pattern cache
+        and the text is scanned against them in place
+
+        Arg:
+            :param pattern: the original string
+            :param stats: a collections.Counter which receives the event counts and
+                the time of the "preprocess" and "search" phases, None to disable
+        Rtn:
+            :return: the index of first occurrence of pattern
+
+        Time complexity (Worst Case): P(m+n)
+        """
+        return self._load_pattern(pattern, stats).find(self.text, stats)
+
+    def find_all(self, pattern: str, stats=None) -> list:
+        """ Find all occurrences of input substring, with
+        the same result type as BoyerMoore.find
+
+        Arg:
+            :param pattern: the original string
+            :param stats: a collections.Counter which receives the event counts and
+                the time of the "preprocess" and "search" phases, None to disable
+        Rtn:
+            :return: the ascending indexes of all occurrences of pattern
+
+        Time complexity (Worst Case): P(m+n)
+        """
+        return self._load_pattern(pattern, stats).find_all(self.text, stats)
+
+
+class ZPattern(matching.ImmutablePattern):
+    """ An immutable pattern whose Z-values are computed once and
+        reused to search any number of texts. No separator is
+        needed, so text and pattern may be any str or bytes object
+    """
+
+    __slots__ = ("pattern", "z_values")
+
+    def __init__(self, pattern: str):
+        assert len(pattern) > 0, "The pattern is empty"
+        z_values = extend_z_values(pattern, [0 for _ in range(len(pattern))])
+        z_values[0] = len(pattern)
+        self.set_fields(pattern=pattern, z_values=tuple(z_values))
+
+    def finditer(self, text: str, stats=None):
+        """ Compute the Z-value of every text position against the
+            pattern without building pattern + "$" + text. A Z-box inside
+            the text never exceeds m characters, so the pattern Z-values
+            are enough to reuse it and only O(m) extra memory is needed
+
+        :param text: a str or bytes object of the same type as the pattern
+        :param stats: a collections.Counter which receives the event counts, see
+            finditer_with_stats, None to disable
+        :return: a generator of the ascending indexes of all occurrences of pattern
+        """
+        if stats is not None:
+            yield from self.finditer_with_stats(text, stats)
+            return
+        pattern, z_values = self.pattern, self.z_values
+        m, n = len(pattern), len(text)
+        l, r = 0, -1    # text[l..r] matches pattern[0..r-l]
+        for k in range(n - m + 1):
             # Case 1
             if k > r:
                 z_k = 0
-                for i in range(length - k):
-                    if self.concatenated_str[i] != self.concatenated_str[k + i]:
-                        break
-                    else:
-                        z_k += 1
+                while z_k < m and pattern[z_k] == text[k + z_k]:
+                    z_k += 1
                 if z_k > 0:
                     l, r = k, k + z_k - 1
-                    z_values[k] = z_k
+            # Case 2a
+            elif z_values[k - l] < r - k + 1:
+                z_k = z_values[k - l]
+            # Case 2b
             else:
+                z_k = r - k + 1
+                while z_k < m and pattern[z_k] == text[k + z_k]:
+                    z_k += 1
+                l, r = k, k + z_k - 1
+            if z_k == m:
+                yield k
+
+    def finditer_with_stats(self, text: str, stats):
+        """ The instrumented twin of finditer, see "Instrumentation" in the algorithm
+            package. The counts are added when the generator is exhausted or closed
+
+            comparisons         the pattern characters compared against the text
+            z.explicit          the text positions outside any Z-box (Case 1)
+            z.box_reuses        the Z-values copied from the pattern (Case 2a)
+            z.box_extensions    the Z-boxes extended past their right end (Case 2b)
+            time.search         the time spent in the scan, without the consumer
+
+        :param text: a str or bytes object of the same type as the pattern
+        :param stats: a collections.Counter which receives the event counts
+        :return: a generator of the ascending indexes of all occurrences of pattern
+        """
+        pattern, z_values = self.pattern, self.z_values
+        m, n = len(pattern), len(text)
+        comparisons = explicit = box_reuses = box_extensions = 0
+        elapsed = 0.0
+        started = time.perf_counter()
+        l, r = 0, -1
+        try:
+            for k in range(n - m + 1):
+                # Case 1
+                if k > r:
+                    explicit += 1
+                    z_k = 0
+                    while z_k < m:
+                        comparisons += 1
+                        if pattern[z_k] != text[k + z_k]:
+                            break
+                        z_k += 1
+                    if z_k > 0:
+                        l, r = k, k + z_k - 1
                 # Case 2a
-                if z_values[k - l] < r - k + 1:
-                    z_values[k] = z_values[k - l]
+                elif z_values[k - l] < r - k + 1:
+                    box_reuses += 1
+                    z_k = z_values[k - l]
                 # Case 2b
                 else:
-                    assert z_values[k - l] >= r - k + 1, "Z value can not be increased since its value is too small"
-                    z_k = z_values[k - l]
-                    if z_values[k-l] + k > length:
-                        z_k = length - k
-                    else:
-                        for i in range(length - r - 1):  # operation with length value and index value
-                            if self.concatenated_str[r + 1 + i] != self.concatenated_str[r - k + 1 + i]:
-                                break
-                            else:
-                                z_k += 1
-                    z_values[k] = z_k
+                    box_extensions += 1
+                    z_k = r - k + 1
+                    while z_k < m:
+                        comparisons += 1
+                        if pattern[z_k] != text[k + z_k]:
+                            break
+                        z_k += 1
                     l, r = k, k + z_k - 1
-            k += 1
-        return z_values
+                if z_k == m:
+                    elapsed += time.perf_counter() - started
+                    yield k
+                    started = time.perf_counter()
+            elapsed += time.perf_counter() - started
+        finally:
+            stats["comparisons"] += comparisons
+            stats["z.explicit"] += explicit
+            stats["z.box_reuses"] += box_reuses
+            stats["z.box_extensions"] += box_extensions
+            stats["time.search"] += elapsed
 
-    def find(self, pattern: str):
-        """ Implement Gusfield's Z-algorithm to find the
-        first occurrence of input substring. "$" is used
-        as the combined operator in this case.
+    def find(self, text: str, stats=None):
+        """ Find the first occurrence of this pattern in the text
 
-        Arg:
-            :param pattern: the original string
-        Rtn:
-            :return: the index of first occurrence of pattern
+        :param text: the string to be searched
+        :param stats: a collections.Counter which receives the event counts, None to disable
+        :return: the index of first occurrence of pattern, None if not found
+        """
+        occurrences = self.finditer(text, stats)
+        index = next(occurrences, None)
+        occurrences.close()
+        return index
 
-        Time complexity (Worst Case): P(m+n)
+    def find_all(self, text: str, stats=None) -> list:
+        """ Find all occurrences of this pattern in the text
+
+        :param text: the string to be searched
+        :param stats: a collections.Counter which receives the event counts, None to disable
+        :return: the ascending indexes of all occurrences of pattern
         """
-        self.pattern = pattern
-        m = len(pattern)
-        self.concatenated_str = self.pattern + "$" + self.text
-        self.z_values = self.generate_z_values()
+        return list(self.finditer(text, stats))
+
+    def find_stream(self, chunks: Iterable):
+        """ Search a text which arrives as a sequence of chunks, see matching.find_stream
+
+        :param chunks: an iterable of str or bytes objects of the same type as the pattern
+        :return: a generator of the absolute indexes of all occurrences of pattern
+        """
+        return matching.find_stream(chunks, self.pattern, self.finditer)
 
-        # Find out the first occurrence
-        for i, z_value in enumerate(self.z_values):
-            if z_value == m:
-                return i - 1 - m
+
+# get the ZPattern of a pattern, preprocessed once and kept in an LRU cache
+compile_pattern = matching.pattern_cache(ZPattern)
+
+
+def find_stream(chunks: Iterable, pattern: str):
+    """ Find all occurrences of pattern in a chunked text, see ZPattern.find_stream
+
+    :param chunks: an iterable of str or bytes objects
+    :param pattern: a non-empty str or bytes object
+    :return: a generator of the absolute indexes of all occurrences of pattern
+    """
+    return compile_pattern(pattern).find_stream(chunks)
 
 
 if __name__ == "__main__":
@@ -99,8 +350,8 @@ if __name__ == "__main__":
     target = "aba"
     word = "sdafffsdffqewrfqewrdsf;lrewjgkregnkngjkjfdkhgjklrem,gfdjkhgbjkfdhbjkbnruigfiu2tqrqwr"
     target = "lrewjgkregnkngjkjfd"
-    p_gz = GusfieldZ(word, "acababacaba")
-    # index = p_gz.find(target)
-    p_gz.concatenated_str = "acababacaba"
-    print(p_gz.generate_z_values())
-    # assert word[index:index+len(target)] == target, "Failed"
+    p_gz = GusfieldZ(word)
+    index = p_gz.find(target)
+    print(index)
+    print(compile_pattern.cache_info())
+    assert word[index:index+len(target)] == target, "Failed"
@@ -0,0 +1,237 @@
+"""
+Implement pattern matching solution
+Knuth-Morris-Pratt Algorithm and the Aho-Corasick automaton
+
+"""
+from array import array
+from collections import deque
+from typing import Iterable, NamedTuple
+
+
+def generate_failure_function(pattern: str) -> list:
+    """ Compute the KMP failure function of the pattern
+
+    :param pattern: a non-empty str or bytes object
+    :return: a list whose i-th value is the length of the longest proper
+        border of pattern[:i+1]
+    """
+    m = len(pattern)
+    failure = [0 for _ in range(m)]
+    k = 0
+    for i in range(1, m):
+        while k > 0 and pattern[i] != pattern[k]:
+            k = failure[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        failure[i] = k
+    return failure
+
+
+class KnuthMorrisPratt:
+    def __init__(self, text: str, pattern: str = None):
+        self.text = text
+        self.pattern = pattern
+        self.failure = None
+
+    def find(self, pattern: str) -> list:
+        """ Implement Knuth-Morris-Pratt Algorithm to find all
+                occurrences of input substring
+
+            Arg:
+                :param pattern: the substring of the original string
+            Rtn:
+                :return: the ascending indexes of all occurrences of pattern
+            Time Complexity (Worst case): O(M+N)
+        """
+        assert len(pattern) > 0, "The pattern is empty"
+        self.pattern = pattern
+        self.failure = generate_failure_function(pattern)
+        m = len(pattern)
+        occurrence = []
+        j = 0
+        for i, character in enumerate(self.text):
+            while j > 0 and character != pattern[j]:
+                j = self.failure[j - 1]
+            if character == pattern[j]:
+                j += 1
+            if j == m:
+                occurrence.append(i - m + 1)
+                j = self.failure[j - 1]
+        return occurrence
+
+
+class MatcherState(NamedTuple):
+    """ The resumable state of a KMPMatcher """
+    position: int    # the number of pattern characters currently matched
+    offset: int      # the absolute index of the next character to be fed
+
+
+class KMPMatcher:
+    """ A KMP matcher which consumes the text incrementally. Its whole
+        state is a MatcherState, so it can be checkpointed and restored
+        across restarts or handed between tasks
+    """
+
+    __slots__ = ("pattern", "failure", "position", "offset")
+
+    def __init__(self, pattern: str, state: MatcherState = None):
+        assert len(pattern) > 0, "The pattern is empty"
+        self.pattern = pattern
+        self.failure = generate_failure_function(pattern)
+        self.position = 0
+        self.offset = 0
+        if state is not None:
+            self.restore(state)
+
+    def __getstate__(self):
+        return self.pattern, self.checkpoint()
+
+    def __setstate__(self, state):
+        pattern, matcher_state = state
+        self.__init__(pattern, matcher_state)
+
+    def checkpoint(self) -> MatcherState:
+        """ Take a snapshot of the current matcher state
+
+        :return: a picklable MatcherState object
+        """
+        return MatcherState(self.position, self.offset)
+
+    def restore(self, state: MatcherState):
+        """ Resume matching from a previous checkpoint
+
+        :param state: a MatcherState object taken by checkpoint()
+        :return: None
+        """
+        position, offset = state
+        assert 0 <= position < len(self.pattern), "The matcher state does not belong to this pattern"
+        self.position, self.offset = position, offset
+
+    def feed(self, chunk: str) -> list:
+        """ Consume the next chunk of the text
+
+        :param chunk: a str or bytes object of the same type as the pattern
+        :return: the absolute indexes of the occurrences completed by this chunk
+        """
+        pattern, failure = self.pattern, self.failure
+        m = len(pattern)
+        j = self.position
+        base = self.offset - m + 1
+        occurrence = []
+        for i, character in enumerate(chunk):
+            while j > 0 and character != pattern[j]:
+                j = failure[j - 1]
+            if character == pattern[j]:
+                j += 1
+            if j == m:
+                occurrence.append(base + i)
+                j = failure[j - 1]
+        self.position = j
+        self.offset += len(chunk)
+        return occurrence
+
+
+class AhoCorasick:
+    """ The Aho-Corasick automaton. It is a trie of all patterns whose
+        failure links generalise the KMP failure function, so every
+        pattern is searched in a single pass over the text
+    """
+
+    def __init__(self, patterns: Iterable):
+        """ Object Initialization
+
+        :param patterns: non-empty str or bytes objects, the pattern id is their position
+        """
+        self.patterns = list(patterns)
+        self.goto = [{}]                # sparse transitions of each state
+        self.depth = array("l", [0])    # the length of the string spelled by each state
+        self.fail = array("l", [0])
+        self.output_link = array("l", [-1])    # the nearest terminal state on the failure chain
+        self.terminals = {}             # state -> ids of the patterns ending there
+        for pattern_id, pattern in enumerate(self.patterns):
+            self.add_pattern(pattern_id, pattern)
+        self.build_failure_links()
+
+    def add_pattern(self, pattern_id: int, pattern: str):
+        """ Insert a pattern into the trie
+
+        :param pattern_id: the id reported for occurrences of this pattern
+        :param pattern: a non-empty str or bytes object
+        :return: None
+        """
+        assert len(pattern) > 0, "The pattern is empty"
+        state = 0
+        for character in pattern:
+            next_state = self.goto[state].get(character)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.depth.append(self.depth[state] + 1)
+                self.fail.append(0)
+                self.output_link.append(-1)
+                self.goto[state][character] = next_state
+            state = next_state
+        self.terminals.setdefault(state, []).append(pattern_id)
+
+    def build_failure_links(self):
+        """ Compute failure and output links in breadth-first order, the same
+            way as the KMP failure function is extended one character at a time
+
+        :return: None
+        """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, child in self.goto[state].items():
+                link = self.fail[state]
+                while link and character not in self.goto[link]:
+                    link = self.fail[link]
+                target = self.goto[link].get(character, 0)
+                self.fail[child] = target if target != child else 0
+                target = self.fail[child]
+                self.output_link[child] = target if target in self.terminals else self.output_link[target]
+                queue.append(child)
+
+    def finditer(self, text: str):
+        """ Scan the text once and report every occurrence of every pattern
+
+        :param text: a str or bytes object of the same type as the patterns
+        :return: a generator of (pattern_id, offset) pairs ordered by end position
+        """
+        goto, fail, depth = self.goto, self.fail, self.depth
+        output_link, terminals = self.output_link, self.terminals
+        state = 0
+        for i, character in enumerate(text):
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            match = state if state in terminals else output_link[state]
+            while match > 0:
+                for pattern_id in terminals[match]:
+                    yield pattern_id, i - depth[match] + 1
+                match = output_link[match]
+
+    def find(self, text: str) -> list:
+        """ Find all occurrences of all patterns in the text
+
+        :param text: a str or bytes object of the same type as the patterns
+        :return: a list of (pattern_id, offset) pairs ordered by end position
+        """
+        return list(self.finditer(text))
+
+
+if __name__ == "__main__":
+    text = "aaacababacabaabcabcabacababacababjdcn"
+    target = "acababacaba"
+    p_kmp = KnuthMorrisPratt(text)
+    index = p_kmp.find(target)
+    print(index)
+    assert text[index[0]:index[0] + len(target)] == target, "Failed"
+
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    print(automaton.find("ushers"))
+
+    matcher = KMPMatcher(target)
+    print(matcher.feed(text[:20]))
+    resumed = KMPMatcher(target, matcher.checkpoint())
+    print(resumed.feed(text[20:]))
@@ -0,0 +1,86 @@
+"""
+Benchmark the streaming LZ77 compressor on sample corpora
+
+Every corpus is 1 MB. "logs" are synthetic access-log lines with timestamps,
+addresses, paths and status codes, "source" is the Python code of this
+repository repeated, "dna" is random ACGT and "random" is incompressible
+bytes. The ratio is compressed size / original size, throughput is in MB/s
+of original data, measured with CPython 3.11 and the default 32 KB window:
+
+    corpus    chain depth    ratio    compress     decompress
+    logs      4              0.268    1.17 MB/s    50.6 MB/s
+    logs      16             0.235    1.11 MB/s    30.5 MB/s
+    logs      64             0.216    0.80 MB/s    55.4 MB/s
+    source    4              0.523    1.07 MB/s    25.8 MB/s
+    source    16             0.458    0.86 MB/s    31.7 MB/s
+    source    64             0.428    0.58 MB/s    35.2 MB/s
+    dna       4              0.801    0.90 MB/s    18.7 MB/s
+    dna       16             0.674    0.42 MB/s    17.1 MB/s
+    dna       64             0.578    0.26 MB/s    18.8 MB/s
+    random    4              3.977    0.31 MB/s    12.5 MB/s
+    random    16             3.977    0.35 MB/s     9.2 MB/s
+    random    64             3.977    0.34 MB/s    10.6 MB/s
+
+Every token carries a literal, so a byte without a match costs 4 bytes and
+incompressible data expands almost 4 times; the LZSS package uses flag bits
+instead. Deeper chains trade compression speed for ratio, decompression speed
+does not depend on them. The source code is longer than the window, so only
+the repeats inside a 32 KB stretch are found.
+
+Run from this directory: python benchmark.py
+"""
+import glob
+import io
+import os
+import random
+import time
+
+from source import LZ77
+
+SIZE = 1 << 20
+
+
+def log_corpus() -> bytes:
+    paths = ["/", "/index.html", "/api/v1/users", "/api/v1/orders", "/static/app.js", "/login"]
+    agents = ["curl/8.4.0", "Mozilla/5.0 (X11; Linux x86_64)", "python-requests/2.31"]
+    lines = []
+    timestamp = 1700000000
+    while sum(map(len, lines)) < SIZE:
+        timestamp += random.randint(0, 3)
+        lines.append("10.0.{}.{} - - [{}] \"GET {} HTTP/1.1\" {} {} \"{}\"\n".format(
+            random.randint(0, 255), random.randint(0, 255), timestamp, random.choice(paths),
+            random.choice([200, 200, 200, 304, 404, 500]), random.randint(100, 50000),
+            random.choice(agents)).encode())
+    return b"".join(lines)[:SIZE]
+
+
+def source_corpus() -> bytes:
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    code = b"".join(open(path, "rb").read() for path in sorted(glob.glob(os.path.join(root, "*", "*.py"))))
+    return (code * (SIZE // len(code) + 1))[:SIZE]
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    corpora = {
+        "logs": log_corpus(),
+        "source": source_corpus(),
+        "dna": bytes(random.choice(b"ACGT") for _ in range(SIZE)),
+        "random": random.randbytes(SIZE),
+    }
+    print("{:<10}{:<15}{:<9}{:<13}{}".format("corpus", "chain depth", "ratio", "compress", "decompress"))
+    for name, data in corpora.items():
+        for depth in (4, 16, 64):
+            codec = LZ77(chain_depth=depth)
+            compressed = io.BytesIO()
+            start = time.perf_counter()
+            codec.compress(io.BytesIO(data), compressed)
+            compress_time = time.perf_counter() - start
+            restored = io.BytesIO()
+            start = time.perf_counter()
+            codec.decompress(io.BytesIO(compressed.getvalue()), restored)
+            decompress_time = time.perf_counter() - start
+            assert restored.getvalue() == data
+            print("{:<10}{:<15}{:<9.3f}{:.2f} MB/s    {:.1f} MB/s".format(
+                name, depth, len(compressed.getvalue()) / len(data),
+                len(data) / compress_time / 2 ** 20, len(data) / decompress_time / 2 ** 20))
@@ -0,0 +1,189 @@
+"""
+Build LZ77 compression
+A streaming encoder and decoder over file-like objects. Every token is an
+(offset, length, next byte) triple. The encoder finds matches with hash chains
+over a bounded sliding window, so both directions only keep the window and one
+input chunk in memory, whatever the size of the stream.
+"""
+import io
+import struct
+from array import array
+
+MAGIC = b"LZ77"
+HEADER = struct.Struct("<4sH")      # magic, window size
+TOKEN = struct.Struct("<HBB")       # offset, length, next byte
+MIN_MATCH = 3
+
+
+class LZ77:
+    def __init__(self, window_size: int = 32768, chain_depth: int = 16, max_length: int = 255,
+                 hash_bits: int = 15, chunk_size: int = 1 << 16):
+        """ Object Initialization
+
+        :param window_size: the number of previous bytes a match can refer to, at most 65535
+        :param chain_depth: the number of earlier positions with the same hash tried per match
+        :param max_length: the longest match, at most 255
+        :param hash_bits: the hash table has 2 ** hash_bits heads
+        :param chunk_size: the number of bytes read from or written to the streams at once
+        """
+        assert 1 <= window_size <= 65535, "The window size must be between 1 and 65535"
+        assert MIN_MATCH <= max_length <= 255, "The maximum length must be between 3 and 255"
+        assert chain_depth >= 1, "The chain depth must be positive"
+        self.window_size = window_size
+        self.chain_depth = chain_depth
+        self.max_length = max_length
+        self.hash_bits = hash_bits
+        self.chunk_size = chunk_size
+
+    def compress(self, source, destination) -> int:
+        """ Compress a stream. The hash table keeps the last position of every
+            3-byte hash and the chain keeps, for every position of the window,
+            the previous position with the same hash
+
+        :param source: a binary file-like object with read()
+        :param destination: a binary file-like object with write()
+        :return: the number of bytes written
+        """
+        window, max_length, chunk_size = self.window_size, self.max_length, self.chunk_size
+        shift = 32 - self.hash_bits
+        head = array("q", [-1]) * (1 << self.hash_bits)
+        chain = array("q", [-1]) * window
+        pack = TOKEN.pack
+
+        destination.write(HEADER.pack(MAGIC, window))
+        written = HEADER.size
+        out = bytearray()
+        buffer = bytearray()
+        base = 0            # the stream position of buffer[0]
+        position = 0        # the stream position of the next byte to encode
+        eof = False
+        while True:
+            if not eof and base + len(buffer) - position <= max_length:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    eof = True
+                    continue
+                # drop the history that left the window
+                drop = position - window - base
+                if drop > 0:
+                    del buffer[:drop]
+                    base += drop
+                buffer += chunk
+                continue
+
+            i = position - base
+            available = len(buffer) - i
+            if available == 0:
+                break
+            # the last byte of the stream must be left for the next byte of a token
+            limit = min(max_length, available - 1)
+            best_length = best_offset = 0
+            if limit >= MIN_MATCH:
+                candidate = head[((buffer[i] << 16 | buffer[i + 1] << 8 | buffer[i + 2])
+                                  * 2654435761 & 0xFFFFFFFF) >> shift]
+                depth = self.chain_depth
+                while candidate >= 0 and position - candidate <= window and depth:
+                    j = candidate - base
+                    # a candidate can only beat the best match if it agrees at its last byte
+                    if buffer[j + best_length] == buffer[i + best_length]:
+                        length = 0
+                        while length < limit and buffer[j + length] == buffer[i + length]:
+                            length += 1
+                        if length > best_length:
+                            best_length, best_offset = length, position - candidate
+                            if length == limit:
+                                break
+                    depth -= 1
+                    previous = chain[candidate % window]
+                    if previous >= candidate:
+                        break
+                    candidate = previous
+                if best_length < MIN_MATCH:
+                    best_length = best_offset = 0
+            out += pack(best_offset, best_length, buffer[i + best_length])
+
+            # index every position covered by the token
+            end = position + best_length + 1
+            last = base + len(buffer) - MIN_MATCH
+            while position < end:
+                if position <= last:
+                    k = position - base
+                    h = ((buffer[k] << 16 | buffer[k + 1] << 8 | buffer[k + 2]) * 2654435761 & 0xFFFFFFFF) >> shift
+                    chain[position % window] = head[h]
+                    head[h] = position
+                position += 1
+            if len(out) >= chunk_size:
+                destination.write(out)
+                written += len(out)
+                out.clear()
+        destination.write(out)
+        return written + len(out)
+
+    def decompress(self, source, destination) -> int:
+        """ Decompress a stream written by compress, with any window size
+
+        :param source: a binary file-like object with read()
+        :param destination: a binary file-like object with write()
+        :return: the number of bytes written
+        """
+        magic, window = HEADER.unpack(source.read(HEADER.size))
+        assert magic == MAGIC, "The stream is not LZ77 compressed"
+        chunk_size = max(self.chunk_size - self.chunk_size % TOKEN.size, TOKEN.size)
+        history = bytearray()
+        pending = 0         # history[pending:] is not written yet
+        written = 0
+        leftover = b""
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            data = leftover + chunk
+            usable = len(data) - len(data) % TOKEN.size
+            leftover = data[usable:]
+            for offset, length, literal in TOKEN.iter_unpack(data[:usable]):
+                if length:
+                    start = len(history) - offset
+                    if offset >= length:
+                        history += history[start:start + length]
+                    else:
+                        # the match overlaps the bytes it produces, repeat the period
+                        period = history[start:]
+                        history += (period * (length // offset + 1))[:length]
+                history.append(literal)
+            if len(history) > window + chunk_size:
+                destination.write(history[pending:])
+                written += len(history) - pending
+                del history[:len(history) - window]
+                pending = len(history)
+        assert not leftover, "The stream is truncated"
+        destination.write(history[pending:])
+        return written + len(history) - pending
+
+
+def compress(data: bytes, **options) -> bytes:
+    """ Compress bytes in memory
+
+    :param data: the bytes to compress
+    :param options: the parameters of LZ77
+    :return: the compressed bytes
+    """
+    destination = io.BytesIO()
+    LZ77(**options).compress(io.BytesIO(data), destination)
+    return destination.getvalue()
+
+
+def decompress(data: bytes) -> bytes:
+    """ Decompress bytes in memory
+
+    :param data: the bytes written by compress
+    :return: the original bytes
+    """
+    destination = io.BytesIO()
+    LZ77().decompress(io.BytesIO(data), destination)
+    return destination.getvalue()
+
+
+if __name__ == "__main__":
+    text = b"abracadabra abracadabra abracadabra, abracadabra!" * 4
+    compressed = compress(text, window_size=1024)
+    print(len(text), len(compressed), decompress(compressed) == text)
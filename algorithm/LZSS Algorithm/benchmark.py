@@ -0,0 +1,65 @@
+"""
+Benchmark block-parallel LZSS compression against the number of workers
+
+The corpus is 8 MB of synthetic access-log lines cut into 1 MB blocks. Every
+block is compressed on its own, so the work splits evenly across processes and
+the only serial parts are reading the input and writing the output in order.
+
+Measured with CPython 3.11 on a machine with a single core, so the extra
+workers only add the cost of pickling the blocks to and from the pool:
+
+    workers    compress     ratio    decompress one block
+    1          0.59 MB/s    0.205    0.06s
+    2          0.52 MB/s    0.205
+    4          0.61 MB/s    0.205
+
+The blocks share nothing, so on N cores the throughput should approach N times
+the single worker figure; this was not measured here. The ratio does not depend
+on the number of workers.
+A random block read only decompresses that block, whatever its position.
+
+Run from this directory: python benchmark.py
+"""
+import io
+import random
+import time
+
+from source import LZSS, LZSSReader
+
+SIZE = 8 << 20
+
+
+def log_corpus() -> bytes:
+    paths = ["/", "/index.html", "/api/v1/users", "/api/v1/orders", "/static/app.js", "/login"]
+    agents = ["curl/8.4.0", "Mozilla/5.0 (X11; Linux x86_64)", "python-requests/2.31"]
+    lines = []
+    length = 0
+    timestamp = 1700000000
+    while length < SIZE:
+        timestamp += random.randint(0, 3)
+        lines.append("10.0.{}.{} - - [{}] \"GET {} HTTP/1.1\" {} {} \"{}\"\n".format(
+            random.randint(0, 255), random.randint(0, 255), timestamp, random.choice(paths),
+            random.choice([200, 200, 200, 304, 404, 500]), random.randint(100, 50000),
+            random.choice(agents)).encode())
+        length += len(lines[-1])
+    return b"".join(lines)[:SIZE]
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    data = log_corpus()
+    print("{:<11}{:<13}{:<9}{}".format("workers", "compress", "ratio", "decompress one block"))
+    for workers in (1, 2, 4):
+        container = io.BytesIO()
+        start = time.perf_counter()
+        LZSS(workers=workers).compress(io.BytesIO(data), container)
+        elapsed = time.perf_counter() - start
+        line = "{:<11}{:.2f} MB/s    {:.3f}".format(
+            workers, len(data) / elapsed / 2 ** 20, len(container.getvalue()) / len(data))
+        if workers == 1:
+            reader = LZSSReader(container)
+            start = time.perf_counter()
+            block = reader.read_block(len(reader) // 2)
+            line += "    {:.2f}s".format(time.perf_counter() - start)
+            assert block == data[len(reader) // 2 * reader.block_size:][:reader.block_size]
+        print(line)
@@ -0,0 +1,312 @@
+"""
+Build LZSS compression
+The input is cut into fixed-size blocks which are compressed independently,
+in a process pool when there are several workers. Inside a block, a flag byte
+announces the kind of the next 8 tokens: a set bit is one literal byte, a clear
+bit is a 3 byte match (16-bit offset, 8-bit length - 3). Matches are found with
+hash chains over the previous 65535 bytes of the block.
+
+The container keeps an index of the blocks after the last one, so a reader can
+decompress any block, or a range of the original bytes, without decoding from
+the start:
+
+    header    magic, block size
+    blocks    the compressed blocks, one after another
+    index     the file offset, compressed size and original size of every block
+    footer    the file offset of the index, the number of blocks, magic
+"""
+import io
+import struct
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC = b"LZSSBLK1"
+HEADER = struct.Struct("<8sI")      # magic, block size
+ENTRY = struct.Struct("<QII")       # file offset, compressed size, original size
+FOOTER = struct.Struct("<QQ8s")     # index offset, block count, magic
+MATCH = struct.Struct("<HB")        # offset, length - MIN_MATCH
+MIN_MATCH = 3
+MAX_MATCH = MIN_MATCH + 255
+WINDOW_SIZE = 65535
+HASH_BITS = 15
+
+
+def compress_block(block: bytes, chain_depth: int = 16) -> bytes:
+    """ Compress one block on its own, this also runs in the worker processes
+
+    :param block: the bytes of the block
+    :param chain_depth: the number of earlier positions with the same hash tried per match
+    :return: the flag and token bytes
+    """
+    n = len(block)
+    shift = 32 - HASH_BITS
+    head = array("q", [-1]) * (1 << HASH_BITS)
+    chain = array("q", [-1]) * min(WINDOW_SIZE, max(n, 1))
+    window = len(chain)
+    pack = MATCH.pack
+    out = bytearray()
+    flags_at = 0
+    bit = 8
+    last = n - MIN_MATCH
+    i = 0
+    while i < n:
+        if bit == 8:
+            flags_at = len(out)
+            out.append(0)
+            bit = 0
+        limit = min(MAX_MATCH, n - i)
+        best_length = best_offset = 0
+        if limit >= MIN_MATCH:
+            candidate = head[((block[i] << 16 | block[i + 1] << 8 | block[i + 2]) * 2654435761 & 0xFFFFFFFF) >> shift]
+            depth = chain_depth
+            while candidate >= 0 and i - candidate <= WINDOW_SIZE and depth:
+                if best_length < limit and block[candidate + best_length] == block[i + best_length]:
+                    length = 0
+                    while length < limit and block[candidate + length] == block[i + length]:
+                        length += 1
+                    if length > best_length:
+                        best_length, best_offset = length, i - candidate
+                        if length == limit:
+                            break
+                depth -= 1
+                previous = chain[candidate % window]
+                if previous >= candidate:
+                    break
+                candidate = previous
+        if best_length >= MIN_MATCH:
+            out += pack(best_offset, best_length - MIN_MATCH)
+            end = i + best_length
+        else:
+            out[flags_at] |= 1 << bit
+            out.append(block[i])
+            end = i + 1
+        bit += 1
+        while i < end:
+            if i <= last:
+                h = ((block[i] << 16 | block[i + 1] << 8 | block[i + 2]) * 2654435761 & 0xFFFFFFFF) >> shift
+                chain[i % window] = head[h]
+                head[h] = i
+            i += 1
+    return bytes(out)
+
+
+def decompress_block(data: bytes, size: int) -> bytes:
+    """ Decompress one block, this also runs in the worker processes
+
+    :param data: the bytes written by compress_block
+    :param size: the original size of the block
+    :return: the original bytes
+    """
+    out = bytearray()
+    n = len(data)
+    i = 0
+    while i < n:
+        flags = data[i]
+        i += 1
+        for bit in range(8):
+            if i >= n:
+                break
+            if flags >> bit & 1:
+                out.append(data[i])
+                i += 1
+                continue
+            offset = data[i] | data[i + 1] << 8
+            length = data[i + 2] + MIN_MATCH
+            i += 3
+            start = len(out) - offset
+            if offset >= length:
+                out += out[start:start + length]
+            else:
+                # the match overlaps the bytes it produces, repeat the period
+                out += (out[start:] * (length // offset + 1))[:length]
+    assert len(out) == size, "The block is corrupted"
+    return bytes(out)
+
+
+def read_block(source, size: int) -> bytes:
+    """ Read a whole block from a stream. Raw streams like pipes and sockets may
+        return fewer bytes than asked, so reading goes on until the block is full
+
+    :param source: a binary file-like object with read()
+    :param size: the number of bytes of a block
+    :return: size bytes, fewer only at the end of the stream
+    """
+    block = source.read(size)
+    if len(block) == size or not block:
+        return block
+    parts = [block]
+    missing = size - len(block)
+    while missing:
+        part = source.read(missing)
+        if not part:
+            break
+        parts.append(part)
+        missing -= len(part)
+    return b"".join(parts)
+
+
+class LZSS:
+    def __init__(self, block_size: int = 1 << 20, chain_depth: int = 16, workers: int = 1):
+        """ Object Initialization
+
+        :param block_size: the number of original bytes in every block but the last
+        :param chain_depth: the number of earlier positions with the same hash tried per match
+        :param workers: the number of processes compressing blocks
+        """
+        assert 0 < block_size < 1 << 32, "The block size must fit in 32 bits"
+        self.block_size = block_size
+        self.chain_depth = chain_depth
+        self.workers = workers
+
+    def compress(self, source, destination) -> int:
+        """ Compress a stream into a container. At most two blocks per worker
+            are in flight, so memory does not grow with the input
+
+        :param source: a binary file-like object with read()
+        :param destination: a binary file-like object with write()
+        :return: the number of bytes written
+        """
+        blocks = iter(lambda: read_block(source, self.block_size), b"")
+        destination.write(HEADER.pack(MAGIC, self.block_size))
+        offset = HEADER.size
+        index = bytearray()
+        count = 0
+
+        def write(block: bytes, size: int):
+            nonlocal offset, count
+            destination.write(block)
+            index.extend(ENTRY.pack(offset, len(block), size))
+            offset += len(block)
+            count += 1
+
+        if self.workers <= 1:
+            for block in blocks:
+                write(compress_block(block, self.chain_depth), len(block))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                pending = deque()
+                for block in blocks:
+                    pending.append((executor.submit(compress_block, block, self.chain_depth), len(block)))
+                    if len(pending) >= 2 * self.workers:
+                        future, size = pending.popleft()
+                        write(future.result(), size)
+                while pending:
+                    future, size = pending.popleft()
+                    write(future.result(), size)
+        destination.write(index)
+        destination.write(FOOTER.pack(offset, count, MAGIC))
+        return offset + len(index) + FOOTER.size
+
+
+class LZSSReader:
+    """ Random access to a container written by LZSS.compress """
+
+    def __init__(self, file):
+        """ Object Initialization, only the header, the footer and the index are read
+
+        :param file: a binary file-like object with read() and seek()
+        """
+        self.file = file
+        file.seek(0)
+        magic, self.block_size = HEADER.unpack(file.read(HEADER.size))
+        assert magic == MAGIC, "The stream is not an LZSS container"
+        file.seek(-FOOTER.size, io.SEEK_END)
+        index_offset, count, magic = FOOTER.unpack(file.read(FOOTER.size))
+        assert magic == MAGIC, "The LZSS container is truncated"
+        file.seek(index_offset)
+        self.index = list(ENTRY.iter_unpack(file.read(count * ENTRY.size)))
+        # starts[i] is the position of block i in the original data, starts[-1] the total size
+        self.starts = [0]
+        for _, _, size in self.index:
+            self.starts.append(self.starts[-1] + size)
+        self.size = self.starts[-1]
+
+    def __len__(self):
+        return len(self.index)
+
+    def read_raw(self, i: int) -> bytes:
+        offset, compressed_size, _ = self.index[i]
+        self.file.seek(offset)
+        return self.file.read(compressed_size)
+
+    def read_block(self, i: int) -> bytes:
+        """ Decompress a single block
+
+        :param i: the number of the block
+        :return: its original bytes
+        """
+        return decompress_block(self.read_raw(i), self.index[i][2])
+
+    def read(self, offset: int, size: int) -> bytes:
+        """ Get a range of the original bytes, only the blocks it covers are decompressed
+
+        :param offset: the position of the first byte in the original data
+        :param size: the number of bytes
+        :return: the bytes, fewer if the range passes the end
+        """
+        stop = min(offset + size, self.size)
+        parts = []
+        # the blocks are found from the original sizes in the index, not from the
+        # block size, so a container with shorter blocks is still read correctly
+        i = bisect_right(self.starts, offset) - 1
+        while i < len(self.index) and self.starts[i] < stop:
+            block = self.read_block(i)
+            start = self.starts[i]
+            parts.append(block[max(offset - start, 0):stop - start])
+            i += 1
+        return b"".join(parts)
+
+    def decompress(self, destination, workers: int = 1) -> int:
+        """ Decompress every block in order
+
+        :param destination: a binary file-like object with write()
+        :param workers: the number of processes decompressing blocks
+        :return: the number of bytes written
+        """
+        if workers <= 1:
+            for i in range(len(self)):
+                destination.write(self.read_block(i))
+            return self.size
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for i in range(len(self)):
+                pending.append(executor.submit(decompress_block, self.read_raw(i), self.index[i][2]))
+                if len(pending) >= 2 * workers:
+                    destination.write(pending.popleft().result())
+            while pending:
+                destination.write(pending.popleft().result())
+        return self.size
+
+
+def compress(data: bytes, **options) -> bytes:
+    """ Compress bytes in memory
+
+    :param data: the bytes to compress
+    :param options: the parameters of LZSS
+    :return: the container bytes
+    """
+    destination = io.BytesIO()
+    LZSS(**options).compress(io.BytesIO(data), destination)
+    return destination.getvalue()
+
+
+def decompress(data: bytes, workers: int = 1) -> bytes:
+    """ Decompress a container in memory
+
+    :param data: the bytes written by compress
+    :param workers: the number of processes decompressing blocks
+    :return: the original bytes
+    """
+    destination = io.BytesIO()
+    LZSSReader(io.BytesIO(data)).decompress(destination, workers)
+    return destination.getvalue()
+
+
+if __name__ == "__main__":
+    text = b"".join(b"line %d: status=ok user=alice\n" % i for i in range(1000))
+    container = compress(text, block_size=4096, workers=2)
+    reader = LZSSReader(io.BytesIO(container))
+    print(len(text), len(container), len(reader), decompress(container) == text)
+    print(reader.read(10000, 31))
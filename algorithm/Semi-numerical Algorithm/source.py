@@ -0,0 +1,183 @@
+"""
+Build Shift-Or (Bitap) matching
+The state of the search is a bit-vector held in a Python int: bit i is 0 when
+the first i + 1 pattern elements match the text ending at the current character.
+Every text character costs a shift, an or and an and, plus the same again for
+every allowed error in the approximate searches (Wu-Manber).
+
+A pattern element is a character class, so patterns like "ERR[0-9][0-9]" or
+"user=.*" style wildcards (one "." per character) are matched at the same cost.
+"""
+from typing import Iterable
+
+ANY = None      # the pattern element matching every character
+
+
+def parse_pattern(pattern: str) -> list:
+    """ Split a pattern with character classes into its elements
+
+        "."         any character
+        "[abc]"     one of the listed characters, ranges like "[a-z0-9]" are allowed
+        "[^abc]"    any character but the listed ones
+        "\\x"        the character x itself
+
+    :param pattern: the pattern string
+    :return: a list of (set of characters, negated) pairs, (None, True) for "."
+    """
+    elements = []
+    i = 0
+    while i < len(pattern):
+        character = pattern[i]
+        if character == ".":
+            elements.append((ANY, True))
+        elif character == "\\":
+            assert i + 1 < len(pattern), "The pattern ends with an escape"
+            i += 1
+            elements.append((frozenset(pattern[i]), False))
+        elif character == "[":
+            end = pattern.find("]", i + 2)
+            assert end >= 0, "The character class at {} is not closed".format(i)
+            body = pattern[i + 1:end]
+            negated = body.startswith("^") and len(body) > 1
+            if negated:
+                body = body[1:]
+            characters = set()
+            j = 0
+            while j < len(body):
+                if j + 2 < len(body) and body[j + 1] == "-":
+                    assert body[j] <= body[j + 2], "The range {} is reversed".format(body[j:j + 3])
+                    characters.update(chr(code) for code in range(ord(body[j]), ord(body[j + 2]) + 1))
+                    j += 3
+                else:
+                    characters.add(body[j])
+                    j += 1
+            elements.append((frozenset(characters), negated))
+            i = end
+        else:
+            elements.append((frozenset(character), False))
+        i += 1
+    return elements
+
+
+class ShiftOr:
+    def __init__(self, pattern, classes: bool = False):
+        """ Object Initialization
+
+        :param pattern: a str or bytes pattern, or a list of elements where every element
+            is an iterable of allowed characters or None for any character
+        :param classes: parse ".", "[...]" and "\\" in a str pattern, see parse_pattern
+        """
+        if classes:
+            assert isinstance(pattern, str), "Character classes are only parsed in str patterns"
+            elements = parse_pattern(pattern)
+        elif isinstance(pattern, (str, bytes)):
+            elements = [(frozenset((character,)), False) for character in pattern]
+        else:
+            elements = [(ANY, True) if element is None else (frozenset(element), False) for element in pattern]
+        assert elements, "The pattern is empty"
+        self.pattern = pattern
+        self.m = len(elements)
+        self.full = (1 << self.m) - 1
+        self.high = 1 << (self.m - 1)
+        self.masks, self.default = self.generate_masks(elements)
+
+    def generate_masks(self, elements: list) -> tuple:
+        """ Build the mask of every character: bit i is 0 when element i accepts it
+
+        :param elements: the (set of characters, negated) pairs of the pattern
+        :return: a dict of masks for the characters named in the pattern, and the
+            mask of every other character
+        """
+        default = self.full
+        for i, (characters, negated) in enumerate(elements):
+            if negated:
+                default &= ~(1 << i)
+        masks = {}
+        for characters, _ in elements:
+            for character in characters or ():
+                if character in masks:
+                    continue
+                mask = self.full
+                for i, (accepted, negated) in enumerate(elements):
+                    if (accepted is not None and character in accepted) != negated:
+                        mask &= ~(1 << i)
+                masks[character] = mask
+        return masks, default
+
+    def finditer(self, text: Iterable):
+        """ Find every exact occurrence
+
+        :param text: a str, or bytes for a bytes pattern
+        :return: a generator of the start positions
+        """
+        get, default, full, high, m = self.masks.get, self.default, self.full, self.high, self.m
+        state = full
+        for i, character in enumerate(text):
+            state = (state << 1 | get(character, default)) & full
+            if not state & high:
+                yield i - m + 1
+
+    def find_all(self, text: Iterable) -> list:
+        return list(self.finditer(text))
+
+    def find_mismatches(self, text: Iterable, k: int) -> list:
+        """ Find every occurrence with at most k substituted characters (Hamming distance)
+
+        :param text: a str, or bytes for a bytes pattern
+        :param k: the number of allowed mismatches
+        :return: the start positions
+        """
+        assert 0 <= k < self.m, "k must be smaller than the pattern length"
+        get, default, full, high, m = self.masks.get, self.default, self.full, self.high, self.m
+        states = [full] * (k + 1)
+        result = []
+        for i, character in enumerate(text):
+            mask = get(character, default)
+            previous = states[0]
+            states[0] = (previous << 1 | mask) & full
+            for j in range(1, k + 1):
+                # a match with j mismatches either matches this character or
+                # extends a match with j - 1 mismatches by any character
+                current = states[j]
+                states[j] = (current << 1 | mask) & (previous << 1) & full
+                previous = current
+            if not states[k] & high:
+                result.append(i - m + 1)
+        return result
+
+    def find_edits(self, text: Iterable, k: int) -> list:
+        """ Find every substring within edit distance k of the pattern (Wu-Manber).
+            The start of such a substring is not unique, so the ends are reported
+
+        :param text: a str, or bytes for a bytes pattern
+        :param k: the number of allowed insertions, deletions and substitutions
+        :return: the end positions (exclusive), in increasing order
+        """
+        assert 0 <= k < self.m, "k must be smaller than the pattern length"
+        get, default, full, high = self.masks.get, self.default, self.full, self.high
+        # with j errors the first j pattern elements can be deleted before any text
+        states = [full & ~((1 << j) - 1) for j in range(k + 1)]
+        result = []
+        for i, character in enumerate(text):
+            mask = get(character, default)
+            previous = states[0]
+            states[0] = (previous << 1 | mask) & full
+            for j in range(1, k + 1):
+                current = states[j]
+                states[j] = ((current << 1 | mask)     # match
+                             & (previous << 1)          # substitution
+                             & previous                 # insertion of this character
+                             & (states[j - 1] << 1)     # deletion of a pattern element
+                             & full)
+                previous = current
+            if not states[k] & high:
+                result.append(i + 1)
+        return result
+
+
+if __name__ == "__main__":
+    log = "GET /index.html 200\nGET /lgoin 404\nPOST /login 302\nGET /api/v1 500\n"
+    print(ShiftOr("login").find_all(log))
+    print(ShiftOr("login").find_mismatches(log, 2))
+    print(ShiftOr("login").find_edits(log, 1))
+    print(ShiftOr(" [45]0[0-9]\n", classes=True).find_all(log))
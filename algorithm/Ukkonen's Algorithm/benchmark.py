@@ -0,0 +1,117 @@
+"""
+Benchmark the memory footprint of the suffix tree representations
+
+The array-backed SuffixTree is compared with the object-per-node layout it
+replaced (a Node object with a children dict, four attributes and two
+boolean flags), with the same object using __slots__ and with the
+SuffixArray engine, which keeps no nodes at all. The object trees
+are materialised from a built SuffixTree, so all three hold the same nodes.
+
+Bytes per input character measured with CPython 3.11 (64-bit). "kept" is
+the memory held by the result, "peak" the most memory traced during the
+build, which is what decides whether a text fits on a host:
+
+    text              nodes/char   arrays   peak   slots+dict   dict Node   SA kept   peak
+    random a-z 10^5         1.27       31     37          288         349         8     19
+    random DNA 10^5         1.62       40     47          393         471         8     18
+    random 0/1 10^5         2.00       51     59          519         615         8     17
+
+Run from this directory: python benchmark.py
+"""
+import random
+import time
+import tracemalloc
+
+from source import SuffixArray, SuffixTree
+
+
+class DictNode:
+    """ The original node layout, attributes live in a per-instance __dict__ """
+
+    def __init__(self, start: int = None, end: int = None):
+        self.children = {}
+        self.start_index = start
+        self.end_index = end
+        self.suffix_link_node = None
+        self.is_leaf_node = True
+        self.is_root_node = False
+
+
+class SlotsNode:
+    """ The original node layout with __slots__ """
+
+    __slots__ = ("children", "start_index", "end_index", "suffix_link_node", "is_leaf_node", "is_root_node")
+
+    def __init__(self, start: int = None, end: int = None):
+        self.children = {}
+        self.start_index = start
+        self.end_index = end
+        self.suffix_link_node = None
+        self.is_leaf_node = True
+        self.is_root_node = False
+
+
+def materialise(tree: SuffixTree, node_class) -> list:
+    """ Copy an array-backed tree into one object per node
+
+    :param tree: a built SuffixTree
+    :param node_class: DictNode or SlotsNode
+    :return: the list of all node objects, the root first
+    """
+    nodes = [node_class(tree.start_index[node], None if tree.is_leaf_node(node) else tree.end_index[node])
+             for node in range(len(tree))]
+    for node in range(len(tree)):
+        nodes[node].suffix_link_node = nodes[tree.suffix_link[node]]
+        for child in tree.get_connected_nodes(node):
+            nodes[node].children[tree.get_character(tree.start_index[child])] = nodes[child]
+            nodes[node].is_leaf_node = False
+    nodes[0].is_root_node = True
+    return nodes
+
+
+def measure(build) -> tuple:
+    """ Measure the memory kept alive by the result of build() and the peak while it runs
+
+    :param build: a function without arguments
+    :return: a tuple of the result, the retained bytes, the peak bytes and the elapsed seconds
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained - before, peak - before, elapsed
+
+
+def run(label: str, text: str):
+    n = len(text)
+
+    def build():
+        tree = SuffixTree(text)
+        tree.build_tree()
+        return tree
+
+    def build_array():
+        suffix_array = SuffixArray(text)
+        suffix_array.build_array()
+        return suffix_array
+
+    _, suffix_array_bytes, suffix_array_peak, _ = measure(build_array)
+    tree, array_bytes, array_peak, elapsed = measure(build)
+    _, slots_bytes, _, _ = measure(lambda: materialise(tree, SlotsNode))
+    _, dict_bytes, _, _ = measure(lambda: materialise(tree, DictNode))
+    print("{:<18} {:>10.2f} {:>8.0f} {:>8.0f} {:>12.0f} {:>11.0f} {:>9.2f}s {:>10.0f} {:>8.0f}".format(
+        label, len(tree) / n, array_bytes / n, array_peak / n, slots_bytes / n, dict_bytes / n, elapsed,
+        suffix_array_bytes / n, suffix_array_peak / n))
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    size = 10 ** 5
+    print("{:<18} {:>10} {:>8} {:>8} {:>12} {:>11} {:>10} {:>10} {:>8}".format(
+        "text", "nodes/char", "arrays", "peak", "slots+dict", "dict Node", "build", "SA kept", "peak"))
+    run("random a-z 10^5", "".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(size)))
+    run("random DNA 10^5", "".join(random.choice("ACGT") for _ in range(size)))
+    run("random 0/1 10^5", "".join(random.choice("01") for _ in range(size)))
@@ -4,244 +4,966 @@ Reference article: https://stackoverflow.com/questions/9452701/ukkonens-suffix-t
 """
 from __future__ import annotations
 
-
-class Node:
-    """ The Suffix-tree's Node"""
-
-    def __init__(self, start: int = None, end: int = None):
-        self.children = {}
-        self.start_index = start
-        self.end_index = end
-        self.suffix_link_node = None
-        self.is_leaf_node = True
-        self.is_root_node = False
+import mmap
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from typing import Iterable
+
+# the native UTF-32 codec, a str text is saved with it so that a mapped file can be indexed per character
+TEXT_ENCODING = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+
+class SuffixTreeBase:
+    """ The nodes, the steps of Ukkonen's algorithm and the queries shared by
+        SuffixTree and GeneralizedSuffixTree
+
+    Nodes are integer ids into parallel arrays (struct-of-arrays) rather than
+    Python objects. Every node costs one slot in each of start_index,
+    end_index, suffix_link, first_child, next_sibling and leaf_count, 4 bytes
+    each when the text is shorter than 2**30 characters. A tree has at most
+    2n+1 nodes, so it takes at most about 50 bytes per input character, against
+    several hundred bytes per character for a Node object with its own
+    children dict (see benchmark.py). Leaves do not store their end: their
+    end_index is LEAF_END and the shared leaf_end is used instead.
+    """
+
+    LEAF_END = -1
+    NO_NODE = -1
+
+    def __init__(self, text, typecode: str):
+        """ Object Initialization
+
+        :param text: the indexable text the edges refer to
+        :param typecode: the array typecode of the node arrays
+        """
+        self._text = text
+        self.active_node = None
+        self.active_edge = 0
+        self.active_length = 0
+        self.remainder = 0
+        self.leaf_end = -1
+        self.size = -1
+        self.root = None
+        self.start_index = array(typecode)
+        self.end_index = array(typecode)
+        self.suffix_link = array(typecode)
+        self.first_child = array(typecode)
+        self.next_sibling = array(typecode)
+        self.leaf_count = None
+        self._text_encoding = None    # set when a str text is mapped as UTF-32 code points
 
     def __len__(self):
-        return (self.end_index - self.start_index) + 1 if self.end_index else 1
-
-    def add_edge(self, key: str, new_node: Node):
-        self.children[key] = new_node
+        """ The number of nodes in this suffix tree """
+        return len(self.start_index)
+
+    def nbytes(self) -> int:
+        """ The number of bytes used by the node arrays, leaf_count included once it is computed """
+        buffers = [self.start_index, self.end_index, self.suffix_link, self.first_child, self.next_sibling]
+        if self.leaf_count is not None:
+            buffers.append(self.leaf_count)
+        return sum(buffer.itemsize * len(buffer) for buffer in buffers)
+
+    def new_node(self, start: int, end: int) -> int:
+        """ Append a node to the node arrays
+
+        :param start: the text index of the first letter of the edge leading to this node
+        :param end: the text index of the last letter of that edge, or LEAF_END
+        :return: the id of the new node
+        """
+        self.start_index.append(start)
+        self.end_index.append(end)
+        self.suffix_link.append(0)
+        self.first_child.append(self.NO_NODE)
+        self.next_sibling.append(self.NO_NODE)
+        return len(self.start_index) - 1
+
+    def new_leaf(self, start: int) -> int:
+        """ Append a leaf whose edge ends at the shared leaf_end
+
+        :param start: the text index of the first letter of the edge leading to this leaf
+        :return: the id of the new leaf
+        """
+        return self.new_node(start, self.LEAF_END)
 
-    def extend_edge(self, pos: int):
-        """ Extend the end position fot this node
+    def is_leaf_node(self, node: int) -> bool:
+        return node != self.root and self.first_child[node] == self.NO_NODE
 
-        :param pos: an integer value represents value
-        :return: None
-        """
-        self.end_index = pos
+    def get_character(self, index: int):
+        """ Get the character at index, index n is the virtual terminator (None) """
+        return self._text[index] if index < self.size else None
 
-    def get_edges(self):
-        """ Get all the edges extended from this node
+    def get_end(self, node: int) -> int:
+        """ Get the text index of the last letter of the edge leading to node """
+        end = self.end_index[node]
+        return self.leaf_end if end == self.LEAF_END else end
 
-        :return: a dict_keys object include all the first letter of extended edge
-        """
-        return self.children.keys()
+    def edge_length(self, node: int) -> int:
+        return self.get_end(node) - self.start_index[node] + 1
 
-    def get_connected_nodes(self):
+    def get_connected_nodes(self, node: int):
         """ Get all the nodes connected from this node
 
-        :return: a dict_values include all the connected Node object
+        :param node: a node id
+        :return: a generator of the child node ids
         """
-        return self.children.values()
+        child = self.first_child[node]
+        while child != self.NO_NODE:
+            yield child
+            child = self.next_sibling[child]
 
-    def get_node(self, character: str):
+    def get_node(self, node: int, character) -> int:
         """ Get a specific node from the connected nodes depending on its edge
 
-        :param character: a lowercase letter which is the first letter of extended edge
-        :return: a node object
+        :param node: a node id
+        :param character: the first letter of extended edge, None for the terminator
+        :return: the child node id, NO_NODE if there is no such edge
         """
-        return self.children[character]
-
-    def update_node(self, character: str, new_node: Node):
-        """ Update a node object for an extended edge
-
-        :param character: a lowercase letter which is the first letter of extended edge
-        :param new_node: a new node object
+        text, size, start_index, next_sibling = self._text, self.size, self.start_index, self.next_sibling
+        child = self.first_child[node]
+        while child != self.NO_NODE:
+            start = start_index[child]
+            if (text[start] if start < size else None) == character:
+                break
+            child = next_sibling[child]
+        return child
+
+    def add_edge(self, node: int, new_node: int):
+        self.next_sibling[new_node] = self.first_child[node]
+        self.first_child[node] = new_node
+
+    def update_node(self, node: int, old_node: int, new_node: int):
+        """ Replace a child of node by a new node on the same edge letter
+
+        :param node: the parent node id
+        :param old_node: the child node id being replaced
+        :param new_node: the new child node id
         :return: None
         """
-        self.children[character] = new_node
-
-    def update_suffix_link_node(self, new_node: Node):
-        """ Update the node which is pointed by suffix link
-
-        :param new_node: a node object
+        self.next_sibling[new_node] = self.next_sibling[old_node]
+        self.next_sibling[old_node] = self.NO_NODE
+        if self.first_child[node] == old_node:
+            self.first_child[node] = new_node
+            return
+        child = self.first_child[node]
+        while self.next_sibling[child] != old_node:
+            child = self.next_sibling[child]
+        self.next_sibling[child] = new_node
+
+    def extend(self, i: int):
+        """ Run the step of Ukkonen's algorithm which adds the character at index i
+
+        :param i: the index of the new character, all earlier steps must have run
         :return: None
         """
-        self.suffix_link_node = new_node
-
-
-class SuffixTree:
-    """ The Suffix-Tree """
-
-    def __init__(self, text: str):
-        self._text = text
-        self.active_node = None
-        self.active_edge = ""
-        self.active_length = 0
-        self.remainder = 1
-        self.leaf_end = None
-        self.size = -1
-        self.root = None
-
-    def build_tree(self):
-        self.size = len(self._text)
-        self.root = Node(0)
-        self.root.is_root_node = True
-        self.active_node = self.root
-
-        # Implement steps in Ukkonen's algorithm
-        for i in range(self.size):
-            updated_active_point = False
-            inserted_node = None
-            # update the end index for most of edges
-            if self.active_node.get_edges():
-                self.leaf_end = i
-            if self.remainder > 0:
-                current_character = self._text[i]
-                if self.remainder > 1 and self.active_edge != "":
-                    # implement additional insert
-                    remainder_count = self.remainder
-                    for _ in range(remainder_count, 1, -1):
-                        end_node = self.active_node.get_node(self.active_edge)
-                        start_index = max(0, end_node.start_index - len(self.active_node))
-                        current_index = start_index+self.active_length
-                        if (self._text[current_index] == current_character and self.active_node == self.root)\
-                                or (self.active_node != self.root and
-                                    self._text[current_index+len(self.active_node)] == current_character):
-                            if (not end_node.is_leaf_node) and self._text[end_node.end_index] == current_character:
-                                self.active_node = self.active_node.get_node(self.active_edge)
-                                self.active_edge = ""
-                                self.active_length = 0
-                                self.remainder += 1
-                            else:
-                                self.active_length += 1
-                            updated_active_point = True
-                            break
-                        else:
-                            # create an inner node and insert it into current tree
-                            inner_node = self.insert(end_node, current_character, i)
-
-                            has_split = True
-                            self.remainder -= 1
-
-                            # implement Rule - 2
-                            """
-                            If we split an edge and insert a new node, and if that is not the first node
-                            created during the current step, we connect the previously inserted node and 
-                            the new node through a special pointer, a suffix link. 
-                            """
-                            if inserted_node:
-                                inserted_node.update_suffix_link_node(inner_node)
-                            inserted_node = inner_node
-
-                        # implement Rule - 1
-                        """
-                        After an insertion from root, active_node remains root,
-                        active_edge is set to the first character of the new suffix we need to insert.
-                        """
-                        if self.active_node == self.root and has_split:
-                            self.active_edge = self._text[i-self.remainder+1]
-                            self.active_length -= 1
-
-                        # implement Rule - 3
-                        """
-                        After splitting an edge from an active_node that is not the root node, we follow 
-                        the suffix link going out of that node, if there is any, and reset the active_node 
-                        to the node it points to. If there is no suffix link, we set the active_node to the
-                        root. active_edge and active_length remain unchanged.
-                        """
-                        if self.active_node != self.root and has_split:
-                            if self.active_node.suffix_link_node:
-                                self.active_node = self.active_node.suffix_link_node
-                            else:
-                                self.active_node = self.root
-
-                # normal insertion for each step
-                if current_character in self.active_node.get_edges():
-                    # the character has existed in the current node's children
-                    # update the active point
-                    if not updated_active_point:
-                        self.active_edge, self.active_length = current_character, 1
-                    self.remainder += 1
-                else:
-                    if not updated_active_point:
-                        self.active_node.add_edge(current_character, Node(i))
-
-    def insert(self, current_end_node: Node, new_edge: str, new_edge_index: int):
+        # update the end index of every leaf at once
+        self.leaf_end = i
+        self.remainder += 1
+        inserted_node = None
+        current_character = self.get_character(i)
+        while self.remainder > 0:
+            if self.active_length == 0:
+                self.active_edge = i
+            end_node = self.get_node(self.active_node, self.get_character(self.active_edge))
+            if end_node == self.NO_NODE:
+                self.add_edge(self.active_node, self.new_leaf(i))
+                if inserted_node is not None:
+                    self.suffix_link[inserted_node] = self.active_node
+                    inserted_node = None
+            else:
+                # walk down when the active length covers the whole edge
+                length = self.edge_length(end_node)
+                if self.active_length >= length:
+                    self.active_edge += length
+                    self.active_length -= length
+                    self.active_node = end_node
+                    continue
+                # the character is already on the edge, this step ends here
+                if self.get_character(self.start_index[end_node] + self.active_length) == current_character:
+                    if inserted_node is not None and self.active_node != self.root:
+                        self.suffix_link[inserted_node] = self.active_node
+                    self.active_length += 1
+                    break
+                # create an inner node and insert it into current tree
+                inner_node = self.insert(end_node, i)
+
+                # implement Rule - 2
+                """
+                If we split an edge and insert a new node, and if that is not the first node
+                created during the current step, we connect the previously inserted node and
+                the new node through a special pointer, a suffix link.
+                """
+                if inserted_node is not None:
+                    self.suffix_link[inserted_node] = inner_node
+                inserted_node = inner_node
+            self.remainder -= 1
+
+            # implement Rule - 1
+            """
+            After an insertion from root, active_node remains root,
+            active_edge is set to the first character of the new suffix we need to insert.
+            """
+            if self.active_node == self.root and self.active_length > 0:
+                self.active_length -= 1
+                self.active_edge = i - self.remainder + 1
+            elif self.active_node != self.root:
+                # implement Rule - 3
+                """
+                After splitting an edge from an active_node that is not the root node, we follow
+                the suffix link going out of that node, if there is any, and reset the active_node
+                to the node it points to. If there is no suffix link, we set the active_node to the
+                root. active_edge and active_length remain unchanged.
+                """
+                self.active_node = self.suffix_link[self.active_node]
+
+    def extend_with_stats(self, i: int, stats):
+        """ The instrumented twin of extend, see "Instrumentation" in the algorithm package
+
+            child_lookups           the searches for the child edge of the active point
+            comparisons             the characters compared on an edge
+            walk_downs              the moves of the active point down a whole edge
+            leaves                  the new leaves
+            node_splits             the edges split by a new inner node
+            suffix_link.traversals  the moves of the active node along a suffix link
+
+        :param i: the index of the new character, all earlier steps must have run
+        :param stats: a collections.Counter which receives the event counts
+        :return: None
+        """
+        self.leaf_end = i
+        self.remainder += 1
+        inserted_node = None
+        current_character = self.get_character(i)
+        while self.remainder > 0:
+            if self.active_length == 0:
+                self.active_edge = i
+            stats["child_lookups"] += 1
+            end_node = self.get_node(self.active_node, self.get_character(self.active_edge))
+            if end_node == self.NO_NODE:
+                stats["leaves"] += 1
+                self.add_edge(self.active_node, self.new_leaf(i))
+                if inserted_node is not None:
+                    self.suffix_link[inserted_node] = self.active_node
+                    inserted_node = None
+            else:
+                length = self.edge_length(end_node)
+                if self.active_length >= length:
+                    stats["walk_downs"] += 1
+                    self.active_edge += length
+                    self.active_length -= length
+                    self.active_node = end_node
+                    continue
+                stats["comparisons"] += 1
+                if self.get_character(self.start_index[end_node] + self.active_length) == current_character:
+                    if inserted_node is not None and self.active_node != self.root:
+                        self.suffix_link[inserted_node] = self.active_node
+                    self.active_length += 1
+                    break
+                stats["node_splits"] += 1
+                stats["leaves"] += 1
+                inner_node = self.insert(end_node, i)
+                if inserted_node is not None:
+                    self.suffix_link[inserted_node] = inner_node
+                inserted_node = inner_node
+            self.remainder -= 1
+
+            if self.active_node == self.root and self.active_length > 0:
+                self.active_length -= 1
+                self.active_edge = i - self.remainder + 1
+            elif self.active_node != self.root:
+                stats["suffix_link.traversals"] += 1
+                self.active_node = self.suffix_link[self.active_node]
+
+    def insert(self, current_end_node: int, new_edge_index: int) -> int:
         """ Insert a new node into this suffix tree
 
         :param current_end_node: the previous node that connected with parent node
-        :param new_edge: the new edge that will be extended from the new inner node
         :param new_edge_index: the index of first letter of new edge
         :return: the new generated inner node which can be used to add suffix link
         """
         # create and update node info
-        inner_node = Node(current_end_node.start_index, current_end_node.start_index + self.active_length - 1)
-        current_end_node.start_index = current_end_node.start_index + self.active_length
-        new_node = Node(new_edge_index)
+        start = self.start_index[current_end_node]
+        inner_node = self.new_node(start, start + self.active_length - 1)
+        self.start_index[current_end_node] = start + self.active_length
 
         # update node connections
-        inner_node.is_leaf_node = False
-        self.active_node.update_node(self._text[inner_node.start_index], inner_node)
-        inner_node.add_edge(self._text[current_end_node.start_index], current_end_node)
-        inner_node.add_edge(new_edge, new_node)
-
+        self.update_node(self.active_node, current_end_node, inner_node)
+        self.add_edge(inner_node, current_end_node)
+        self.add_edge(inner_node, self.new_leaf(new_edge_index))
         return inner_node
 
-    def get_substring(self, node: Node):
+    def get_substring(self, node: int):
         """ Generate the substring object for a specific node depending on its position
 
         :param node: a suffix tree node
-        :return: a non-empty string object
+        :return: the edge label without the terminator, empty for the terminator leaf
         """
-        if node.is_leaf_node:
-            return self._text[node.start_index:]
+        if self.is_leaf_node(node):
+            substring = self._text[self.start_index[node]:]
         else:
-            return self._text[node.start_index:node.end_index+1]
+            substring = self._text[self.start_index[node]:self.end_index[node]+1]
+        if isinstance(substring, memoryview):
+            substring = substring.tobytes()
+            if self._text_encoding is not None:
+                substring = substring.decode(self._text_encoding)
+        return substring
+
+    def count_leaves(self):
+        """ Precompute the number of leaves below every node, so that the
+            number of occurrences of a pattern is read in O(1) once its
+            locus is found
+
+        :return: None
+        """
+        leaf_count = array(self.start_index.typecode, bytes(self.start_index.itemsize * len(self)))
+        stack = [(self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if self.is_leaf_node(node):
+                leaf_count[node] = 1
+            elif visited:
+                leaf_count[node] = sum(leaf_count[child] for child in self.get_connected_nodes(node))
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in self.get_connected_nodes(node))
+        self.leaf_count = leaf_count
+
+    def locate(self, pattern: str) -> tuple:
+        """ Walk down from the root along the pattern, comparing characters
+            against the text in place
+
+        :param pattern: a non-empty str or bytes object
+        :return: a tuple of the node whose edge the pattern ends on and the string
+            depth of its parent, or (NO_NODE, 0) if the pattern does not occur
+        """
+        text = self._text
+        if self._text_encoding is not None and isinstance(pattern, str):
+            pattern = memoryview(pattern.encode(self._text_encoding)).cast("I")
+        m = len(pattern)
+        node, depth, k = self.root, 0, 0
+        while True:
+            child = self.get_node(node, pattern[k])
+            if child == self.NO_NODE:
+                return self.NO_NODE, 0
+            start = self.start_index[child]
+            stop = min(self.get_end(child) + 1, self.size, start + m - k)
+            for position in range(start + 1, stop):
+                if text[position] != pattern[k + position - start]:
+                    return self.NO_NODE, 0
+            k += stop - start
+            if k == m:
+                return child, depth
+            if self.is_leaf_node(child) or stop <= self.get_end(child):
+                # the text or the terminator ends before the pattern does
+                return self.NO_NODE, 0
+            node, depth = child, depth + stop - start
 
     def match_pattern(self, pattern: str):
         """ Find out the pattern is existed in this suffix tree or not
 
-        :param pattern: a non-empty string which is only made of lowercase letters
+        :param pattern: a non-empty str or bytes object
         :return: return true if it is existed, otherwise return false
         """
-        return self.match_pattern_aux(self.root, pattern)
+        return self.locate(pattern)[0] != self.NO_NODE
 
-    def match_pattern_aux(self, parent_node: Node, pattern: str):
-        if parent_node.is_leaf_node and (not parent_node.is_root_node):
-            substring = self.get_substring(parent_node)
-        else:
-            try:
-                child_node = parent_node.get_node(pattern[0])
-                substring = self.get_substring(child_node)
-            except KeyError:
-                return False
-        mini_length = min(len(pattern), len(substring))
-        for i in range(mini_length):
-            if pattern[i] != substring[i]:
-                return False
-        if mini_length < len(pattern):
-            return True and self.match_pattern_aux(child_node, pattern[mini_length:])
-        else:
-            return True
+    def count(self, pattern: str) -> int:
+        """ Count the occurrences of the pattern in O(m)
+
+        :param pattern: a non-empty str or bytes object
+        :return: the number of occurrences
+        """
+        node, _ = self.locate(pattern)
+        return 0 if node == self.NO_NODE else self.leaf_count[node]
+
+    def iter_occurrences(self, pattern: str):
+        """ Enumerate the leaves below the locus of the pattern in O(m + occ)
 
-    def traversing(self, current: Node, prefix: str = ""):
+        :param pattern: a non-empty str or bytes object
+        :return: a generator of the start positions of all occurrences, in tree order
+        """
+        node, depth = self.locate(pattern)
+        if node == self.NO_NODE:
+            return
+        stack = [(node, depth)]
+        while stack:
+            node, depth = stack.pop()
+            if self.is_leaf_node(node):
+                yield self.start_index[node] - depth
+            else:
+                depth += self.edge_length(node)
+                stack.extend((child, depth) for child in self.get_connected_nodes(node))
+
+    def find_all(self, pattern: str) -> list:
+        """ Find all occurrences of the pattern
+
+        :param pattern: a non-empty str or bytes object
+        :return: the ascending indexes of all occurrences of pattern
+        """
+        return sorted(self.iter_occurrences(pattern))
+
+    def traversing(self, current: int, prefix: str = ""):
         """ Print out all the suffix existed in this suffix tree
 
         :param current: the current parent node
         :param prefix: a substring which may generated by inner node
         :return: None
         """
-        for end_node in current.get_connected_nodes():
-            if end_node.get_connected_nodes():
-                new_prefix = self._text[end_node.start_index:end_node.end_index+1]
-                self.traversing(end_node, prefix+new_prefix)
+        for end_node in self.get_connected_nodes(current):
+            if self.is_leaf_node(end_node):
+                suffix = prefix + self.get_substring(end_node)
+                if suffix:
+                    print(suffix)
+            else:
+                self.traversing(end_node, prefix + self.get_substring(end_node))
+
+
+class SuffixTree(SuffixTreeBase):
+    """ The Suffix-Tree of one text
+
+    The tree is built over text plus a virtual unique terminator at index n,
+    so every suffix ends at a leaf. A built tree can be saved to a flat file
+    and memory-mapped back with load().
+    """
+
+    # magic, node typecode, text kind (s)tr/(b)ytes, byte order, text length, node count, text bytes
+    FILE_MAGIC = b"UKKONEN1"
+    FILE_HEADER = struct.Struct("<8sccc5xQQQ")
+    NODE_ARRAYS = ("start_index", "end_index", "suffix_link", "first_child", "next_sibling", "leaf_count")
+
+    def __init__(self, text: str):
+        super().__init__(text, "i" if len(text) < 2 ** 30 else "q")
+        self._mmap = None
+
+    def build_tree(self, stats=None):
+        """ Build the tree over the whole text
+
+        :param stats: a collections.Counter which receives the event counts of
+            extend_with_stats and the time of the "extend" and "count_leaves" phases,
+            None to disable
+        :return: None
+        """
+        self.size = len(self._text)
+        self.root = self.new_node(-1, -1)
+        self.active_node = self.root
+
+        # Implement steps in Ukkonen's algorithm, the last step inserts the terminator
+        if stats is None:
+            for i in range(self.size + 1):
+                self.extend(i)
+            self.count_leaves()
+            return
+        start = time.perf_counter()
+        for i in range(self.size + 1):
+            self.extend_with_stats(i, stats)
+        stats["time.extend"] += time.perf_counter() - start
+        start = time.perf_counter()
+        self.count_leaves()
+        stats["time.count_leaves"] += time.perf_counter() - start
+
+    def save(self, path: str):
+        """ Write this built tree to a flat binary file: a header, the node
+            arrays and the text, each section aligned to 8 bytes
+
+        :param path: the path of the output file
+        :return: None
+        """
+        assert self.leaf_count is not None, "The tree has not been built"
+        if isinstance(self._text, str):
+            text_kind, text = b"s", self._text.encode(TEXT_ENCODING)
+        elif self._text_encoding is not None:
+            text_kind, text = b"s", self._text.tobytes()
+        else:
+            text_kind, text = b"b", bytes(self._text)
+        typecode = self.start_index.format if isinstance(self.start_index, memoryview) \
+            else self.start_index.typecode
+        byteorder = b"<" if sys.byteorder == "little" else b">"
+        with open(path, "wb") as file:
+            file.write(self.FILE_HEADER.pack(self.FILE_MAGIC, typecode.encode(), text_kind, byteorder,
+                                             self.size, len(self), len(text)))
+            for name in self.NODE_ARRAYS:
+                data = bytes(getattr(self, name))
+                file.write(data)
+                file.write(bytes(-len(data) % 8))
+            file.write(text)
+
+    @classmethod
+    def load(cls, path: str) -> SuffixTree:
+        """ Memory-map a file written by save(). The node arrays and the text
+            are memoryviews on the mapping, so nothing is deserialised and
+            processes loading the same file share its page cache
+
+        :param path: the path of a file written by save()
+        :return: a read-only SuffixTree which supports the query methods
+        """
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, typecode, text_kind, byteorder, size, node_count, text_nbytes = \
+            cls.FILE_HEADER.unpack_from(buffer)
+        if magic != cls.FILE_MAGIC:
+            raise ValueError("{} is not a suffix tree file".format(path))
+        if byteorder != (b"<" if sys.byteorder == "little" else b">"):
+            raise ValueError("{} was written on a machine with a different byte order".format(path))
+        typecode = typecode.decode()
+        view = memoryview(buffer)
+        offset = cls.FILE_HEADER.size
+        arrays = []
+        for _ in cls.NODE_ARRAYS:
+            nbytes = node_count * struct.calcsize(typecode)
+            arrays.append(view[offset:offset + nbytes].cast(typecode))
+            offset += nbytes + (-nbytes % 8)
+        text = view[offset:offset + text_nbytes]
+
+        tree = cls(text.cast("I") if text_kind == b"s" else text)
+        for name, values in zip(cls.NODE_ARRAYS, arrays):
+            setattr(tree, name, values)
+        tree.size = tree.leaf_end = size
+        tree.root = 0
+        tree._text_encoding = TEXT_ENCODING if text_kind == b"s" else None
+        tree._mmap = buffer
+        return tree
+
+    def close(self):
+        """ Release the memory map of a tree opened by load()
+
+        :return: None
+        """
+        if self._mmap is not None:
+            for name in self.NODE_ARRAYS:
+                getattr(self, name).release()
+            self._text.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+class GeneralizedSuffixTree(SuffixTreeBase):
+    """ The generalized Suffix-Tree of a collection of documents
+
+    Documents are appended to one character list, each followed by its own
+    terminator, the negative int -(doc_id + 1), which never equals a str or
+    bytes character. Ukkonen's algorithm simply continues over every new
+    document; once its terminator is inserted the leaves opened by that
+    document are closed at the terminator instead of sharing leaf_end.
+    """
+
+    def __init__(self, documents: Iterable = ()):
+        super().__init__([], "q")
+        self.document_starts = array("q")
+        self._open_leaves = []
+        self._empty = None
+        self.size = 0
+        self.root = self.new_node(-1, -1)
+        self.active_node = self.root
+        for document in documents:
+            self.add_document(document)
+
+    def new_leaf(self, start: int) -> int:
+        leaf = super().new_leaf(start)
+        self._open_leaves.append(leaf)
+        return leaf
+
+    def get_character(self, index: int):
+        return self._text[index]
+
+    def add_document(self, document: str, stats=None) -> int:
+        """ Insert every suffix of a new document into the tree
+
+        :param document: a non-empty str or bytes object, of the same type as the earlier documents
+        :param stats: a collections.Counter which receives the event counts of
+            extend_with_stats and the time of the "extend" phase, None to disable
+        :return: the id of the document
+        """
+        assert len(document) > 0, "The document is empty"
+        if self._empty is None:
+            self._empty = document[:0]
+        assert type(document) is type(self._empty), "All documents must have the same type"
+        doc_id = len(self.document_starts)
+        start = len(self._text)
+        self.document_starts.append(start)
+        self._text.extend(document)
+        self._text.append(-(doc_id + 1))
+        self.size = len(self._text)
+        if stats is None:
+            for i in range(start, self.size):
+                self.extend(i)
+        else:
+            started = time.perf_counter()
+            for i in range(start, self.size):
+                self.extend_with_stats(i, stats)
+            stats["time.extend"] += time.perf_counter() - started
+
+        # close the leaves of this document at its terminator
+        for leaf in self._open_leaves:
+            self.end_index[leaf] = self.size - 1
+        self._open_leaves = []
+        self.leaf_count = None
+        return doc_id
+
+    def get_label(self, start: int, stop: int):
+        """ Get the text between two indexes as an object of the documents' type
+
+        :param start: the first index
+        :param stop: the index after the last one, it must not cover a terminator
+        :return: a str or bytes object
+        """
+        items = self._text[start:stop]
+        return self._empty.join(items) if isinstance(self._empty, str) else bytes(items)
+
+    def get_substring(self, node: int):
+        stop = self.get_end(node) + 1
+        if self.is_leaf_node(node):
+            stop -= 1    # drop the terminator
+        return self.get_label(self.start_index[node], stop)
+
+    def get_document(self, position: int) -> tuple:
+        """ Map an index of the character list to a document
+
+        :param position: an index of the character list
+        :return: a tuple of the document id and the offset inside that document
+        """
+        doc_id = bisect_right(self.document_starts, position) - 1
+        return doc_id, position - self.document_starts[doc_id]
+
+    def count(self, pattern: str) -> int:
+        """ Count the occurrences of the pattern over all documents
+
+        :param pattern: a non-empty str or bytes object
+        :return: the number of occurrences
+        """
+        if self.leaf_count is None:
+            self.count_leaves()
+        return super().count(pattern)
+
+    def find_all(self, pattern: str) -> list:
+        """ Find all occurrences of the pattern over all documents
+
+        :param pattern: a non-empty str or bytes object
+        :return: the ascending (doc_id, offset) pairs of all occurrences
+        """
+        return sorted(self.get_document(position) for position in self.iter_occurrences(pattern))
+
+    def longest_common_substring(self, doc_ids: Iterable = None):
+        """ Find the longest substring shared by several documents in O(n)
+            (Hui's counting). Every leaf counts 1 for its document, and the
+            lowest common ancestor of two leaves of the same document that are
+            consecutive in depth-first order counts -1, so the sum over a
+            subtree is the number of distinct documents below it. The
+            ancestors are found during the traversal with a union-find of the
+            finished nodes (Tarjan's offline LCA), the deepest node covering
+            all of doc_ids wins
+
+        :param doc_ids: the ids of at least two documents, all documents by default
+        :return: the longest common substring, empty if there is none
+        """
+        doc_ids = set(range(len(self.document_starts)) if doc_ids is None else doc_ids)
+        assert len(doc_ids) >= 2, "At least two documents are needed"
+        selected = bytearray(len(self.document_starts))
+        for doc_id in doc_ids:
+            selected[doc_id] = 1
+        node_count = len(self)
+        counts = array("q", bytes(8 * node_count))
+        positions = array("q", bytes(8 * node_count))    # the start of one suffix below every node
+        parents = array("q", [-1]) * node_count
+        # finished nodes point to their parent, an unfinished node represents itself
+        ancestors = array("q", range(node_count))
+        last_leaf = array("q", [-1]) * len(self.document_starts)
+
+        def find_ancestor(node: int) -> int:
+            while ancestors[node] != node:
+                ancestors[node] = ancestors[ancestors[node]]
+                node = ancestors[node]
+            return node
+
+        def finish(node: int):
+            parent = parents[node]
+            if parent >= 0:
+                counts[parent] += counts[node]
+                positions[parent] = positions[node]
+                ancestors[node] = parent
+
+        best_depth, best_position = 0, 0
+        stack = [(self.root, 0, False)]
+        while stack:
+            node, depth, visited = stack.pop()
+            if self.is_leaf_node(node):
+                positions[node] = self.start_index[node] - depth
+                doc_id = self.get_document(positions[node])[0]
+                if selected[doc_id]:
+                    counts[node] = 1
+                    if last_leaf[doc_id] >= 0:
+                        counts[find_ancestor(last_leaf[doc_id])] -= 1
+                    last_leaf[doc_id] = node
+                finish(node)
+            elif not visited:
+                depth = depth + self.edge_length(node) if node != self.root else 0
+                stack.append((node, depth, True))
+                for child in self.get_connected_nodes(node):
+                    parents[child] = node
+                    stack.append((child, depth, False))
             else:
-                start = end_node.start_index
-                if end_node.end_index:
-                    print(prefix+self._text[start:end_node.end_index+1])
-                else:
-                    print(prefix+self._text[start:])
+                if counts[node] == len(doc_ids) and depth > best_depth:
+                    best_depth, best_position = depth, positions[node]
+                finish(node)
+        return self.get_label(best_position, best_position + best_depth)
+
+
+def induced_sort(values, upper: int, typecode: str = "i") -> array:
+    """ Build the suffix array of an integer sequence with SA-IS in O(n). Every
+        buffer is a flat array, so a build peaks at about 20 bytes per value
+
+    :param values: a sequence of integers between 0 and upper, e.g. bytes or an array
+    :param upper: the largest possible value
+    :param typecode: the array typecode of the positions, "i" or "q"
+    :return: the array of suffix start positions in lexicographic order
+    """
+    n = len(values)
+    if n <= 1:
+        return array(typecode, range(n))
+    if n == 2:
+        return array(typecode, [0, 1] if values[0] < values[1] else [1, 0])
+
+    # classify every position as S-type (1) or L-type (0)
+    s_type = bytearray(n)
+    for i in range(n - 2, -1, -1):
+        s_type[i] = s_type[i + 1] if values[i] == values[i + 1] else values[i] < values[i + 1]
+
+    # bucket starts for L-type and S-type suffixes of every value
+    sum_l = array(typecode, bytes(array(typecode).itemsize * (upper + 2)))
+    sum_s = array(typecode, sum_l)
+    for i in range(n):
+        if not s_type[i]:
+            sum_s[values[i]] += 1
+        else:
+            sum_l[values[i] + 1] += 1
+    for i in range(upper + 1):
+        sum_s[i] += sum_l[i]
+        sum_l[i + 1] += sum_s[i]
+
+    suffix_array = array(typecode, [-1]) * n
+
+    def induce(lms_positions):
+        for i in range(n):
+            suffix_array[i] = -1
+        bucket = sum_s[:]
+        for position in lms_positions:
+            suffix_array[bucket[values[position]]] = position
+            bucket[values[position]] += 1
+        bucket = sum_l[:]
+        suffix_array[bucket[values[n - 1]]] = n - 1
+        bucket[values[n - 1]] += 1
+        for i in range(n):
+            position = suffix_array[i]
+            if position >= 1 and not s_type[position - 1]:
+                suffix_array[bucket[values[position - 1]]] = position - 1
+                bucket[values[position - 1]] += 1
+        bucket = sum_l[:]
+        for i in range(n - 1, -1, -1):
+            position = suffix_array[i]
+            if position >= 1 and s_type[position - 1]:
+                bucket[values[position - 1] + 1] -= 1
+                suffix_array[bucket[values[position - 1] + 1]] = position - 1
+
+    # sort the LMS substrings, then the LMS suffixes recursively if two substrings are equal
+    lms_rank = array(typecode, [-1]) * (n + 1)
+    lms = array(typecode)
+    for i in range(1, n):
+        if not s_type[i - 1] and s_type[i]:
+            lms_rank[i] = len(lms)
+            lms.append(i)
+    induce(lms)
+    m = len(lms)
+    if m:
+        sorted_lms = array(typecode, (position for position in suffix_array if lms_rank[position] != -1))
+        reduced = array(typecode, bytes(sorted_lms.itemsize * m))
+        reduced_upper = 0
+        for i in range(1, m):
+            left, right = sorted_lms[i - 1], sorted_lms[i]
+            end_left = lms[lms_rank[left] + 1] if lms_rank[left] + 1 < m else n
+            end_right = lms[lms_rank[right] + 1] if lms_rank[right] + 1 < m else n
+            same = end_left - left == end_right - right
+            if same:
+                while left < end_left and values[left] == values[right]:
+                    left += 1
+                    right += 1
+                if left == n or values[left] != values[right]:
+                    same = False
+            if not same:
+                reduced_upper += 1
+            reduced[lms_rank[sorted_lms[i]]] = reduced_upper
+        # free the naming buffers before the recursion allocates its own
+        del sorted_lms, lms_rank
+        reduced_array = induced_sort(reduced, reduced_upper, typecode)
+        del reduced
+        for i in range(m):
+            reduced_array[i] = lms[reduced_array[i]]
+        induce(reduced_array)
+    return suffix_array
+
+
+class SuffixArray:
+    """ The Suffix-Array with its LCP array
+
+    A low-memory alternative to SuffixTree with the same query methods. The
+    suffix array is built by SA-IS and the LCP array by Kasai's algorithm,
+    both in O(n), and both are kept as int32 arrays (int64 for texts of 2**31
+    characters or more), 8 bytes per input character in total. The build
+    peaks at 17-19 bytes per character of a str text, see benchmark.py.
+
+    Queries are a plain binary search in O(m log n): every probe skips the
+    characters shared with both bounds, which needs no table. The LCP array
+    is not used to search, it answers longest_repeated_substring; the
+    LCP-LR tables of an O(m + log n) search would double the memory.
+    """
+
+    def __init__(self, text: str):
+        self._text = text
+        self.size = len(text)
+        typecode = "i" if self.size < 2 ** 31 else "q"
+        self.suffix_array = array(typecode)
+        self.lcp = array(typecode)
+
+    def __len__(self):
+        return self.size
+
+    def nbytes(self) -> int:
+        """ The number of bytes used by the suffix and LCP arrays """
+        return (len(self.suffix_array) + len(self.lcp)) * self.suffix_array.itemsize
+
+    def build_array(self):
+        text = self._text
+        typecode = self.suffix_array.typecode
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            # the bytes are already small integers, SA-IS reads them without a copy
+            values, upper = text, 255
+        else:
+            # rank the distinct characters so that the buckets stay small
+            alphabet = {character: rank for rank, character in enumerate(sorted(set(text)))}
+            values = array(typecode, (alphabet[character] for character in text))
+            upper = max(len(alphabet) - 1, 0)
+        self.suffix_array = induced_sort(values, upper, typecode)
+        del values
+        self.lcp = self.generate_lcp()
+
+    def generate_lcp(self) -> array:
+        """ Implement Kasai's algorithm
+
+        :return: an array whose i-th value is the longest common prefix of the
+            suffixes at suffix_array[i-1] and suffix_array[i], 0 for i = 0
+        """
+        text, n, suffix_array = self._text, self.size, self.suffix_array
+        rank = array(suffix_array.typecode, bytes(suffix_array.itemsize * n))
+        for i, position in enumerate(suffix_array):
+            rank[position] = i
+        lcp = array(suffix_array.typecode, bytes(suffix_array.itemsize * n))
+        h = 0
+        for position in range(n):
+            if rank[position] == 0:
+                h = 0
+                continue
+            previous = suffix_array[rank[position] - 1]
+            while position + h < n and previous + h < n and text[position + h] == text[previous + h]:
+                h += 1
+            lcp[rank[position]] = h
+            if h > 0:
+                h -= 1
+        return lcp
+
+    def compare(self, pattern: str, position: int, k: int) -> tuple:
+        """ Compare the pattern with the suffix at position, knowing that
+            their first k characters are equal
+
+        :param pattern: a non-empty str or bytes object
+        :param position: the start of a suffix
+        :param k: the length of a known common prefix
+        :return: a tuple of their longest common prefix length and 0 if the pattern
+            is a prefix of the suffix, 1 if the suffix is smaller, otherwise -1
+        """
+        text, n, m = self._text, self.size, len(pattern)
+        while k < m and position + k < n and text[position + k] == pattern[k]:
+            k += 1
+        if k == m:
+            return k, 0
+        if position + k == n or text[position + k] < pattern[k]:
+            return k, 1
+        return k, -1
+
+    def search(self, pattern: str, upper: bool) -> int:
+        """ Binary search over the suffix array. The comparison of each probe
+            starts after min(lcp(pattern, low), lcp(pattern, high)) characters
+
+        :param pattern: a non-empty str or bytes object
+        :param upper: find the end instead of the start of the pattern's range
+        :return: the first index whose suffix does not sort before (after, if upper) the pattern
+        """
+        low, high = 0, self.size
+        low_lcp, high_lcp = 0, 0
+        while low < high:
+            middle = (low + high) // 2
+            k, order = self.compare(pattern, self.suffix_array[middle], min(low_lcp, high_lcp))
+            if order == 1 or (upper and order == 0):
+                low, low_lcp = middle + 1, k
+            else:
+                high, high_lcp = middle, k
+        return low
+
+    def get_range(self, pattern: str) -> tuple:
+        """ Find the suffix array range of all suffixes starting with the pattern
+
+        :param pattern: a non-empty str or bytes object
+        :return: a tuple (start, stop) of suffix array indexes
+        """
+        start = self.search(pattern, False)
+        if start == self.size or self.compare(pattern, self.suffix_array[start], 0)[1] != 0:
+            return start, start
+        return start, self.search(pattern, True)
+
+    def match_pattern(self, pattern: str):
+        """ Find out the pattern is existed in this suffix array or not
+
+        :param pattern: a non-empty str or bytes object
+        :return: return true if it is existed, otherwise return false
+        """
+        start, stop = self.get_range(pattern)
+        return start < stop
+
+    def count(self, pattern: str) -> int:
+        """ Count the occurrences of the pattern in O(m log n)
+
+        :param pattern: a non-empty str or bytes object
+        :return: the number of occurrences
+        """
+        start, stop = self.get_range(pattern)
+        return stop - start
+
+    def iter_occurrences(self, pattern: str):
+        """ Enumerate the suffix array range of the pattern
+
+        :param pattern: a non-empty str or bytes object
+        :return: a generator of the start positions of all occurrences, in suffix order
+        """
+        start, stop = self.get_range(pattern)
+        for i in range(start, stop):
+            yield self.suffix_array[i]
+
+    def find_all(self, pattern: str) -> list:
+        """ Find all occurrences of the pattern
+
+        :param pattern: a non-empty str or bytes object
+        :return: the ascending indexes of all occurrences of pattern
+        """
+        start, stop = self.get_range(pattern)
+        return sorted(self.suffix_array[start:stop])
+
+    def longest_repeated_substring(self):
+        """ Read the longest substring occurring at least twice off the LCP array
+
+        :return: the longest repeated substring, empty if there is none
+        """
+        if self.size < 2:
+            return self._text[:0]
+        best = max(range(self.size), key=self.lcp.__getitem__)
+        return self._text[self.suffix_array[best]:self.suffix_array[best] + self.lcp[best]]
 
 
 if __name__ == "__main__":
@@ -250,5 +972,23 @@ if __name__ == "__main__":
     suffix_tree = SuffixTree(content)
     suffix_tree.build_tree()
     suffix_tree.traversing(suffix_tree.root)
-    # print(suffix_tree.match_pattern("abxa"))
-    # print(suffix_tree.match_pattern("cabxabcdd"))
+    print(suffix_tree.match_pattern("abba"))
+    print(suffix_tree.match_pattern("abbb"))
+    print(suffix_tree.find_all("abb"), suffix_tree.count("abb"))
+    print(len(suffix_tree), suffix_tree.nbytes())
+    import os
+    import tempfile
+    tree_path = os.path.join(tempfile.gettempdir(), "suffix_tree.bin")
+    suffix_tree.save(tree_path)
+    mapped_tree = SuffixTree.load(tree_path)
+    mapped_tree.traversing(mapped_tree.root)
+    print(mapped_tree.find_all("abb"))
+    mapped_tree.close()
+
+    collection = GeneralizedSuffixTree(["xabxac", "abcabxabcd", "bxabq"])
+    print(collection.find_all("abx"), collection.count("ab"))
+    print(collection.longest_common_substring())
+
+    suffix_array = SuffixArray(content)
+    suffix_array.build_array()
+    print(suffix_array.find_all("abb"), suffix_array.count("abb"), suffix_array.longest_repeated_substring())
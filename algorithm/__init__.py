@@ -0,0 +1,87 @@
+"""
+Algorithm implementations
+
+The package directories have names like "Boyer-Moore Algorithm" which are not
+valid module names, so their source.py files are importable under the names of
+SUBMODULES instead. Nothing is loaded by "import algorithm": a submodule is
+imported from its path the first time it is accessed, which keeps short-lived
+processes fast.
+
+    import algorithm
+    algorithm.boyer_moore.compile_pattern("needle").find(text)
+    from algorithm.ukkonen import SuffixArray
+    algorithm.search(text, "needle")
+
+The demo of a submodule runs with "python -m algorithm.<name>" from the
+repository root.
+
+Instrumentation
+
+The hot loops of BoyerMoorePattern.find, extend_z_values, ZPattern.finditer
+and SuffixTree.extend take an optional stats argument, a collections.Counter
+which receives event counts and phase times. With stats=None the plain loop
+runs and the instrumentation costs one test per call. Otherwise the call is
+handed to a twin named <loop>_with_stats, a copy of the loop with counters
+added, whose docstring lists the events it counts. A twin must take exactly
+the same steps as its loop: a change to one is made to both, and
+algorithm_test/test_stats.py checks that both give identical results.
+"""
+import importlib
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+SUBMODULES = {
+    "b_tree": "B-tree",
+    "binomial_heap": "Binomial Heap",
+    "boyer_moore": "Boyer-Moore Algorithm",
+    "disjoint_set": "Disjoint-Set",
+    "fibonacci_heap": "Fibonacci Heaps",
+    "gusfield_z": "Gusfield's Z-Algorithm",
+    "kmp": "Knuth-Morris-Pratt Algorithm",
+    "lz77": "LZ77 Algorithm",
+    "lzss": "LZSS Algorithm",
+    "shift_or": "Semi-numerical Algorithm",
+    "ukkonen": "Ukkonen's Algorithm",
+}
+
+# names re-exported from the regular modules of this package, loaded on first access
+LAZY_ATTRIBUTES = {
+    "search": "facade",
+    "search_file": "facade",
+    "choose_engine": "facade",
+    "SearchIndex": "facade",
+}
+
+__all__ = sorted(SUBMODULES) + sorted(LAZY_ATTRIBUTES)
+
+
+class SubmoduleFinder:
+    """ Find the source.py of a package directory for "algorithm.<name>" imports """
+
+    @staticmethod
+    def find_spec(fullname: str, path=None, target=None):
+        package, _, name = fullname.rpartition(".")
+        if package != __name__ or name not in SUBMODULES:
+            return None
+        return importlib.util.spec_from_file_location(fullname, os.path.join(ROOT, SUBMODULES[name], "source.py"))
+
+
+if not any(isinstance(finder, SubmoduleFinder) for finder in sys.meta_path):
+    sys.meta_path.append(SubmoduleFinder())
+
+
+def __getattr__(name: str):
+    if name in SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module("." + LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,176 @@
+"""
+Search a text with the engine which suits the input
+
+    search(text, "needle")              the ascending offsets of "needle"
+    search(text, ["he", "she"])         a dict of the ascending offsets of every pattern
+    search(SearchIndex(text), "needle") the same answer from a prebuilt suffix array
+    search_file(path, b"needle", 8)     the byte offsets of b"needle" in a file, on 8 processes
+
+The engines are loaded only when they are first used.
+"""
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+
+# patterns up to this length are searched with Shift-Or, a few integer operations per character
+SHORT_PATTERN = 8
+# texts with at most this many distinct characters in their first SAMPLE_SIZE characters
+# are searched with KMP, whose state machine does not care about the alphabet size while
+# the Boyer-Moore shifts become short
+SMALL_ALPHABET = 4
+SAMPLE_SIZE = 4096
+# the pattern types searched as one pattern, any other iterable is a set of patterns
+SINGLE_PATTERN_TYPES = (str, bytes, bytearray, memoryview)
+# the size of the file ranges scanned by search_file, unless there are more workers than ranges
+RANGE_SIZE = 64 << 20
+
+
+class SearchIndex:
+    """ A suffix array of a text, for many queries against the same text.
+        It is built in O(n) and answers every query in O(m log n + occurrences)
+    """
+
+    def __init__(self, text: str):
+        from . import ukkonen
+
+        self.text = text
+        self.suffix_array = ukkonen.SuffixArray(text)
+        self.suffix_array.build_array()
+
+    def find_all(self, pattern: str) -> list:
+        return self.suffix_array.find_all(pattern)
+
+    def count(self, pattern: str) -> int:
+        return self.suffix_array.count(pattern)
+
+
+def choose_engine(text, pattern) -> str:
+    """ Pick the engine search would use
+
+    :param text: a str or bytes object, or a SearchIndex
+    :param pattern: a str or bytes-like object, or a collection of them
+    :return: "suffix_array", "aho_corasick", "shift_or", "kmp" or "boyer_moore"
+    """
+    if isinstance(text, SearchIndex):
+        return "suffix_array"
+    if not isinstance(pattern, SINGLE_PATTERN_TYPES):
+        return "aho_corasick"
+    if len(pattern) <= SHORT_PATTERN:
+        return "shift_or"
+    if len(set(text[:SAMPLE_SIZE])) <= SMALL_ALPHABET:
+        return "kmp"
+    return "boyer_moore"
+
+
+def search(text, pattern, engine: str = None):
+    """ Find all occurrences of one or several patterns
+
+    :param text: a str or bytes object, or a SearchIndex for repeated queries
+    :param pattern: a non-empty str, or bytes-like object for a bytes-like text,
+        or an iterable of them
+    :param engine: one of the names returned by choose_engine, chosen from the input if None
+    :return: the ascending offsets of the pattern, or a dict mapping every pattern
+        to its ascending offsets
+    """
+    if not isinstance(pattern, SINGLE_PATTERN_TYPES):
+        patterns = list(dict.fromkeys(pattern))
+        assert patterns, "No pattern is given"
+        engine = engine or choose_engine(text, patterns)
+        if engine == "aho_corasick":
+            return find_pattern_set(text, patterns)
+        return {single: search(text, single, engine) for single in patterns}
+
+    if not isinstance(pattern, (str, bytes)):
+        # the engines hash and slice the pattern, a mutable buffer is frozen first
+        pattern = bytes(pattern)
+    assert len(pattern) > 0, "The pattern is empty"
+    engine = engine or choose_engine(text, pattern)
+    if isinstance(text, SearchIndex):
+        assert engine == "suffix_array", "A SearchIndex is only searched by its suffix array"
+        return text.find_all(pattern)
+    if engine == "shift_or":
+        from . import shift_or
+        return shift_or.ShiftOr(pattern).find_all(text)
+    if engine == "kmp":
+        from . import kmp
+        return kmp.KnuthMorrisPratt(text).find(pattern)
+    if engine == "boyer_moore":
+        from . import boyer_moore
+        return boyer_moore.compile_pattern(pattern).find(text)
+    if engine == "gusfield_z":
+        from . import gusfield_z
+        return gusfield_z.compile_pattern(pattern).find_all(text)
+    if engine == "suffix_array":
+        return SearchIndex(text).find_all(pattern)
+    if engine == "aho_corasick":
+        return find_pattern_set(text, [pattern])[pattern]
+    raise ValueError("Unknown engine {!r}".format(engine))
+
+
+def find_pattern_set(text, patterns: Iterable) -> dict:
+    """ Search every pattern in one pass with the Aho-Corasick automaton
+
+    :param text: a str or bytes object
+    :param patterns: distinct non-empty str or bytes objects
+    :return: a dict mapping every pattern to its ascending offsets
+    """
+    from . import kmp
+
+    patterns = list(patterns)
+    result = {pattern: [] for pattern in patterns}
+    for pattern_id, offset in kmp.AhoCorasick(patterns).finditer(text):
+        result[patterns[pattern_id]].append(offset)
+    # occurrences are reported by end position, which orders the offsets of one pattern too
+    return result
+
+
+def search_file(path: str, pattern, workers: int = 1, engine: str = None) -> list:
+    """ Find all occurrences of a pattern in a file, which is memory-mapped rather
+        than read. The file is split into ranges and every range is extended by
+        m - 1 bytes, so that a match crossing its end is still seen; a match is
+        only reported by the range it starts in, so none is reported twice
+
+    :param path: the path of the file
+    :param pattern: a non-empty bytes-like object, a str is encoded as UTF-8
+    :param workers: the number of processes scanning ranges
+    :param engine: one of the single pattern engines of search, chosen from the
+        first bytes of the file if None
+    :return: the ascending byte offsets of all occurrences
+    """
+    pattern = pattern.encode("utf-8") if isinstance(pattern, str) else bytes(pattern)
+    assert len(pattern) > 0, "The pattern is empty"
+    size = os.path.getsize(path)
+    if size < len(pattern):
+        return []
+    if engine is None:
+        with open(path, "rb") as file:
+            engine = choose_engine(file.read(SAMPLE_SIZE), pattern)
+    count = max(workers, -(-size // RANGE_SIZE))
+    bounds = [size * i // count for i in range(count + 1)]
+    ranges = [(path, bounds[i], bounds[i + 1], pattern, engine) for i in range(count) if bounds[i] < bounds[i + 1]]
+    if workers <= 1:
+        results = [scan_range(*arguments) for arguments in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(scan_range, *zip(*ranges)))
+    # the ranges are disjoint and in file order, so the offsets are already sorted
+    return [offset for result in results for offset in result]
+
+
+def scan_range(path: str, start: int, stop: int, pattern: bytes, engine: str) -> list:
+    """ Search the matches starting in [start, stop) of a file, this runs in the
+        worker processes of search_file. The engine reads a memoryview of the
+        mapped file, no byte of the range is copied
+
+    :param path: the path of the file
+    :param start: the first byte offset of the range
+    :param stop: the end of the range, matches may extend past it
+    :param pattern: a non-empty bytes object
+    :param engine: the name of a single pattern engine of search
+    :return: the ascending byte offsets of the matches
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        end = min(stop + len(pattern) - 1, len(mapped))
+        with memoryview(mapped) as view, view[start:end] as window:
+            return [start + offset for offset in search(window, pattern, engine) if start + offset < stop]
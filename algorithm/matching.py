@@ -0,0 +1,61 @@
+"""
+Shared pieces of the compiled patterns of boyer_moore and gusfield_z
+"""
+from functools import lru_cache
+from typing import Callable, Iterable
+
+# the maximum number of compiled patterns kept by every compile_pattern()
+CACHE_SIZE = 4096
+
+
+def find_stream(chunks: Iterable, pattern: str, search: Callable):
+    """ Search a text which arrives as a sequence of chunks. Only the
+        last m-1 characters are carried over between chunks, so memory
+        does not grow with the length of the text
+
+    :param chunks: an iterable of str or bytes objects of the same type as the pattern
+    :param pattern: a non-empty str or bytes object
+    :param search: a function which gives the ascending indexes of all occurrences of pattern in a text
+    :return: a generator of the absolute indexes of all occurrences of pattern
+    """
+    keep = len(pattern) - 1
+    carry = pattern[:0]
+    offset = 0    # absolute index of the first character of carry
+    for chunk in chunks:
+        buffer = carry + chunk
+        for index in search(buffer):
+            yield offset + index
+        carry = buffer[max(0, len(buffer) - keep):] if keep else buffer[:0]
+        offset += len(buffer) - len(carry)
+
+
+class ImmutablePattern:
+    """ The base of the compiled patterns. Their fields are set once by
+        set_fields in __init__ and can not be changed or deleted afterwards
+    """
+
+    __slots__ = ()
+
+    def set_fields(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("{} object is immutable".format(type(self).__name__))
+
+    def __delattr__(self, key):
+        raise AttributeError("{} object is immutable".format(type(self).__name__))
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.pattern)
+
+
+def pattern_cache(pattern_class):
+    """ Make a function which preprocesses every pattern once and keeps the
+        compiled patterns in a bounded LRU cache. Cache statistics are
+        available from its cache_info()
+
+    :param pattern_class: a subclass of ImmutablePattern built from a non-empty hashable str or bytes object
+    :return: the caching function of a pattern
+    """
+    return lru_cache(maxsize=CACHE_SIZE)(pattern_class)
@@ -0,0 +1,305 @@
+"""
+Benchmark the matchers, the suffix tree and the disjoint set on generated corpora
+
+Every case reports its best time out of a few runs, its throughput, the peak
+memory traced while it runs once more, and for the string engines the number
+of text characters read, which is the number of character comparisons against
+the text. Times depend on the machine; the comparison counts are exact and
+only change when an algorithm changes.
+
+The results are printed as JSON and can be compared against a saved baseline:
+
+    python algorithm_test/benchmark.py --save algorithm_test/baseline.json
+    python algorithm_test/benchmark.py --compare algorithm_test/baseline.json
+
+A case regresses when it makes more comparisons than the baseline at all, or
+uses more memory by more than the tolerance; the exit status is 1 when any
+case regressed. Both are reproducible. Times are first scaled by a
+calibration workload timed in both runs, which absorbs a uniformly faster or
+slower machine, but on a busy machine they still move by tens of percent, so
+a slower case is only reported as a warning. Time differences below
+TIME_FLOOR are not reported at all. With --strict-time slower cases fail the
+comparison too.
+
+The corpora are random texts over a binary, a DNA, a lowercase and a full
+byte alphabet (the code points 0-255 in a str), plus the adversarial text
+"aaaa...a" searched for "aaa...ab". The patterns are random strings over the
+same alphabet, so they occur early in small alphabets and rarely in large
+ones; naive_algorithm and GusfieldZ.find stop at the first occurrence while
+BoyerMoore.find reports all of them. The pattern caches of GusfieldZ and
+BoyerMoore are cleared before every search, so their times include the
+preprocessing of the pattern.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+if not __package__:
+    # run as a script, the repository root is not on the path yet
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from algorithm import boyer_moore, disjoint_set, gusfield_z, ukkonen
+
+ALPHABETS = {
+    "binary": "01",
+    "dna": "ACGT",
+    "lowercase": string.ascii_lowercase,
+    "bytes": "".join(map(chr, range(256))),
+}
+
+# time differences below this many seconds are never reported, they are noise
+TIME_FLOOR = 0.001
+
+
+class CountingText:
+    """ A read-only text which counts the characters read from it """
+
+    __slots__ = ("text", "reads")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.text)
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return self.text[index]
+
+
+def generate_corpus(alphabet: str, n: int, m: int, seed: int) -> tuple:
+    """ Generate a text and a pattern
+
+    :param alphabet: a key of ALPHABETS or "adversarial"
+    :param n: the length of the text
+    :param m: the length of the pattern
+    :param seed: the seed of the random generator
+    :return: the text and the pattern
+    """
+    if alphabet == "adversarial":
+        return "a" * n, "a" * (m - 1) + "b"
+    generator = random.Random(seed)
+    characters = ALPHABETS[alphabet]
+    text = "".join(generator.choice(characters) for _ in range(n))
+    pattern = "".join(generator.choice(characters) for _ in range(m))
+    return text, pattern
+
+
+def measure(run, repeat: int, min_seconds: float = 0.1) -> dict:
+    """ Time a function, then trace its peak memory in one more run. Like
+        timeit, fast functions are looped until one timing takes min_seconds
+
+    :param run: a function without arguments
+    :param repeat: the number of timings
+    :param min_seconds: the shortest duration of a timing
+    :return: the best time of one run in seconds and the peak of traced memory in bytes
+    """
+    def timing(loops: int) -> float:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        return time.perf_counter() - start
+
+    loops = 1
+    elapsed = timing(loops)
+    while elapsed < min_seconds:
+        loops *= 2
+        elapsed = timing(loops)
+    seconds = elapsed / loops
+    for _ in range(repeat - 1):
+        seconds = min(seconds, timing(loops) / loops)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def cold_find(module, matcher_class):
+    """ Search with an empty pattern cache, so every run preprocesses the pattern again
+
+    :param module: the module of the matcher, whose compile_pattern caches the patterns
+    :param matcher_class: the matcher built on the text
+    :return: a function of the text and the pattern
+    """
+    def search(text, pattern):
+        module.compile_pattern.cache_clear()
+        return matcher_class(text).find(pattern)
+
+    return search
+
+
+def matcher_cases(sizes: list, pattern_lengths: list, repeat: int):
+    engines = {
+        "naive_algorithm": lambda text, pattern: gusfield_z.naive_algorithm(pattern, text),
+        "GusfieldZ.find": cold_find(gusfield_z, gusfield_z.GusfieldZ),
+        "BoyerMoore.find": cold_find(boyer_moore, boyer_moore.BoyerMoore),
+    }
+
+    for alphabet in list(ALPHABETS) + ["adversarial"]:
+        for n in sizes:
+            for m in pattern_lengths:
+                text, pattern = generate_corpus(alphabet, n, m, seed=n * 1000 + m)
+                for engine, search in engines.items():
+                    result = measure(lambda: search(text, pattern), repeat)
+                    counting_text = CountingText(text)
+                    search(counting_text, pattern)
+                    result.update(throughput=n / result["seconds"] / 1e6, unit="Mchar/s",
+                                  comparisons=counting_text.reads)
+                    yield "{}/{}/n={}/m={}".format(engine, alphabet, n, m), result
+
+            # the suffix tree is built once per text and then queried with every pattern length
+            text, _ = generate_corpus(alphabet, n, 1, seed=n)
+
+            def build():
+                tree = ukkonen.SuffixTree(text)
+                tree.build_tree()
+                return tree
+
+            result = measure(build, repeat)
+            counting_text = CountingText(text)
+            ukkonen.SuffixTree(counting_text).build_tree()
+            result.update(throughput=n / result["seconds"] / 1e6, unit="Mchar/s", comparisons=counting_text.reads)
+            yield "SuffixTree.build_tree/{}/n={}".format(alphabet, n), result
+
+            tree = build()
+            for m in pattern_lengths:
+                patterns = [generate_corpus(alphabet, n, m, seed=n * 1000 + m + query)[1] for query in range(100)]
+
+                def match():
+                    for query in patterns:
+                        tree.match_pattern(query)
+
+                result = measure(match, repeat)
+                counting_tree = ukkonen.SuffixTree(CountingText(text))
+                counting_tree.build_tree()
+                counting_tree._text.reads = 0
+                for query in patterns:
+                    counting_tree.match_pattern(query)
+                result.update(throughput=len(patterns) / result["seconds"], unit="queries/s",
+                              comparisons=counting_tree._text.reads)
+                yield "SuffixTree.match_pattern/{}/n={}/m={}".format(alphabet, n, m), result
+
+
+def disjoint_set_cases(sizes: list, repeat: int):
+    for n in sizes:
+        generator = random.Random(n)
+        pairs = [(generator.randrange(n), generator.randrange(n)) for _ in range(n)]
+        queries = [generator.randrange(n) for _ in range(n)]
+        for mode in ("size", "height"):
+            def union():
+                components = disjoint_set.DisjointSet(range(n), mode)
+                for item_1, item_2 in pairs:
+                    components.union(item_1, item_2)
+                return components
+
+            result = measure(union, repeat)
+            result.update(throughput=n / result["seconds"] / 1e6, unit="Mop/s", comparisons=None)
+            yield "DisjointSet.union/{}/n={}".format(mode, n), result
+
+            components = union()
+
+            def find():
+                for item in queries:
+                    components.find(item)
+
+            result = measure(find, repeat)
+            result.update(throughput=n / result["seconds"] / 1e6, unit="Mop/s", comparisons=None)
+            yield "DisjointSet.find/{}/n={}".format(mode, n), result
+
+
+def calibrate() -> float:
+    """ Time a fixed pure Python workload, the times of two runs are compared
+        relative to their calibration so that a slower machine is not a regression
+
+    :return: the time of the workload in seconds
+    """
+    def workload():
+        table = {}
+        for i in range(20000):
+            key = "k{}".format(i % 1000)
+            table[key] = table.get(key, 0) + i
+
+    return measure(workload, repeat=5)["seconds"]
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> tuple:
+    """ Find the cases which got worse than the baseline
+
+    :param report: the report of this run
+    :param baseline: the report of the baseline run
+    :param tolerance: the allowed relative increase of time and memory
+    :return: a tuple of two lists of messages, the regressions of comparison
+        counts and memory, and the warnings about slower cases
+    """
+    speed = baseline["calibration_seconds"] / report["calibration_seconds"]
+    results = report["results"]
+    regressions = []
+    warnings = []
+    for name, old in baseline["results"].items():
+        new = results.get(name)
+        if new is None:
+            continue
+        seconds = new["seconds"] * speed
+        if seconds > old["seconds"] * (1 + tolerance) and seconds - old["seconds"] >= TIME_FLOOR:
+            warnings.append("{}: {:.4f}s -> {:.4f}s (calibrated)".format(name, old["seconds"], seconds))
+        if new["peak_bytes"] > old["peak_bytes"] * (1 + tolerance):
+            regressions.append("{}: {} -> {} peak bytes".format(name, old["peak_bytes"], new["peak_bytes"]))
+        if old["comparisons"] is not None and new["comparisons"] > old["comparisons"]:
+            regressions.append("{}: {} -> {} comparisons".format(name, old["comparisons"], new["comparisons"]))
+    return regressions, warnings
+
+
+def main(arguments: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="text lengths")
+    parser.add_argument("--pattern-lengths", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best is kept")
+    parser.add_argument("--filter", default="", help="only run the cases whose name contains this")
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="compare the results against this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed increase, 0.5 is 50%%")
+    parser.add_argument("--strict-time", action="store_true", help="fail on slower cases, not only warn")
+    options = parser.parse_args(arguments)
+
+    calibration = calibrate()
+    results = {}
+    cases = [matcher_cases(options.sizes, options.pattern_lengths, options.repeat),
+             disjoint_set_cases([10 * n for n in options.sizes], options.repeat)]
+    for generator in cases:
+        for name, result in generator:
+            if options.filter in name:
+                results[name] = result
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "options": {"sizes": options.sizes, "pattern_lengths": options.pattern_lengths, "repeat": options.repeat},
+        # the mean of a calibration before and after the cases, to follow a drifting machine
+        "calibration_seconds": (calibration + calibrate()) / 2,
+        "results": results,
+    }
+    status = 0
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        report["regressions"], report["warnings"] = compare(report, baseline, options.tolerance)
+        if options.strict_time:
+            report["regressions"] += report["warnings"]
+        status = 1 if report["regressions"] else 0
+    if options.save:
+        with open(options.save, "w") as file:
+            json.dump(report, file, indent=1, sort_keys=True)
+    json.dump(report, sys.stdout, indent=1, sort_keys=True)
+    print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
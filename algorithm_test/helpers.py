@@ -0,0 +1,43 @@
+""" Checks shared by several test modules """
+import random
+
+
+def occurrences(text, pattern) -> list:
+    """ The start of every occurrence of the pattern, by comparing every window """
+    return [i for i in range(len(text) - len(pattern) + 1) if text[i:i + len(pattern)] == pattern]
+
+
+def random_string(generator: random.Random, alphabet: str, low: int, high: int) -> str:
+    return "".join(generator.choice(alphabet) for _ in range(generator.randrange(low, high)))
+
+
+def check_against_sorted_list(heap_class, seed: int, steps: int):
+    """ Run a random mix of operations on two heaps, modelled as dicts of their live nodes """
+    generator = random.Random(seed)
+    heap, other = heap_class(), heap_class()
+    model, other_model = {}, {}
+    for _ in range(steps):
+        operation = generator.random()
+        if operation < 0.35:
+            key = generator.randrange(1000)
+            model[heap.insert(key)] = key
+        elif operation < 0.45:
+            key = generator.randrange(1000)
+            other_model[other.insert(key)] = key
+        elif operation < 0.5:
+            heap.meld(other)
+            model.update(other_model)
+            other_model.clear()
+        elif operation < 0.75 and model:
+            node = generator.choice(list(model))
+            key = model[node] - generator.randrange(100)
+            heap.decrease_key(node, key)
+            model[node] = key
+        elif model:
+            node = heap.extract_min()
+            assert node.key == min(model.values())
+            assert model.pop(node) == node.key
+        assert len(heap) == len(model) and len(other) == len(other_model)
+    heap.meld(other)
+    model.update(other_model)
+    assert [heap.extract_min().key for _ in range(len(heap))] == sorted(model.values())
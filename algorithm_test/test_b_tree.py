@@ -0,0 +1,57 @@
+import random
+
+from algorithm import b_tree
+
+
+def check_against_dict(tree: b_tree.BTree, model: dict, generator: random.Random):
+    assert len(tree) == len(model)
+    assert list(tree.items()) == sorted(model.items())
+    for _ in range(20):
+        key = generator.randrange(-1000, 1000)
+        assert tree.get(key) == model.get(key)
+        assert (key in tree) == (key in model)
+        start, stop = sorted(generator.randrange(-1100, 1100) for _ in range(2))
+        expected = sorted((k, v) for k, v in model.items() if start <= k < stop)
+        assert list(tree.items(start, stop)) == expected
+        assert list(tree.items(start)) == sorted((k, v) for k, v in model.items() if k >= start)
+        assert list(tree.items(None, stop)) == sorted((k, v) for k, v in model.items() if k < stop)
+
+
+def test_insert_matches_dict(tmp_path):
+    for seed, (order, cache_size, n) in enumerate([(3, 1, 200), (4, 4, 1000), (5, 8, 3000), (None, 256, 3000)]):
+        generator = random.Random(seed)
+        path = str(tmp_path / "insert-{}.idx".format(seed))
+        model = {}
+        with b_tree.BTree(path, order=order, cache_size=cache_size) as tree:
+            for _ in range(n):
+                key, value = generator.randrange(-1000, 1000), generator.randrange(-2 ** 63, 2 ** 63)
+                tree.insert(key, value)
+                model[key] = value
+            check_against_dict(tree, model, generator)
+        # reopening keeps the page size, order and every pair
+        with b_tree.BTree(path, cache_size=cache_size) as tree:
+            assert tree.order == (order or tree.order)
+            check_against_dict(tree, model, generator)
+            for _ in range(n // 2):
+                key = generator.randrange(-1000, 1000)
+                tree.insert(key, key)
+                model[key] = key
+            check_against_dict(tree, model, generator)
+
+
+def test_bulk_load_matches_dict(tmp_path):
+    for seed, (order, cache_size, n) in enumerate([(3, 1, 0), (3, 1, 1), (3, 2, 100), (4, 4, 1000), (7, 16, 2000)]):
+        generator = random.Random(seed)
+        path = str(tmp_path / "bulk-{}.idx".format(seed))
+        model = {key: generator.randrange(-2 ** 63, 2 ** 63) for key in generator.sample(range(-1000, 1000), n)}
+        with b_tree.BTree(path, order=order, cache_size=cache_size) as tree:
+            tree.bulk_load(sorted(model.items()))
+            check_against_dict(tree, model, generator)
+        with b_tree.BTree(path, cache_size=cache_size) as tree:
+            check_against_dict(tree, model, generator)
+            # a bulk loaded tree keeps accepting inserts
+            for _ in range(300):
+                key = generator.randrange(-1000, 1000)
+                tree.insert(key, -key)
+                model[key] = -key
+            check_against_dict(tree, model, generator)
@@ -0,0 +1,30 @@
+from algorithm_test import benchmark
+
+
+def report(seconds: float, peak_bytes: int, comparisons, calibration: float = 1.0) -> dict:
+    return {"calibration_seconds": calibration,
+            "results": {"case": {"seconds": seconds, "peak_bytes": peak_bytes, "comparisons": comparisons}}}
+
+
+def test_slower_cases_only_warn():
+    regressions, warnings = benchmark.compare(report(0.2, 100, 10), report(0.1, 100, 10), 0.5)
+    assert regressions == [] and len(warnings) == 1
+
+
+def test_time_differences_below_the_floor_are_ignored():
+    regressions, warnings = benchmark.compare(report(0.0004, 100, 10), report(0.0001, 100, 10), 0.5)
+    assert regressions == [] and warnings == []
+
+
+def test_times_are_calibrated():
+    # this run is twice as slow on a machine whose calibration is twice as slow
+    assert benchmark.compare(report(0.2, 100, 10, 2.0), report(0.1, 100, 10), 0.5) == ([], [])
+
+
+def test_comparisons_and_memory_regress():
+    regressions, _ = benchmark.compare(report(0.1, 100, 11), report(0.1, 100, 10), 0.5)
+    assert len(regressions) == 1
+    regressions, _ = benchmark.compare(report(0.1, 200, 10), report(0.1, 100, 10), 0.5)
+    assert len(regressions) == 1
+    regressions, _ = benchmark.compare(report(0.1, 100, None), report(0.1, 100, None), 0.5)
+    assert regressions == []
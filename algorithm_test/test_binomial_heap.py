@@ -0,0 +1,18 @@
+import pytest
+
+from algorithm import binomial_heap
+from algorithm_test.helpers import check_against_sorted_list
+
+
+def test_heap_matches_sorted_list():
+    for seed, steps in enumerate([10, 100, 2000, 5000]):
+        check_against_sorted_list(binomial_heap.BinomialHeap, seed, steps)
+
+
+def test_decrease_key_of_extracted_item():
+    heap = binomial_heap.BinomialHeap()
+    handles = [heap.insert(key) for key in [5, 3, 8]]
+    assert heap.extract_min() is handles[1]
+    with pytest.raises(AssertionError):
+        heap.decrease_key(handles[1], 0)
+    assert [heap.extract_min().key for _ in range(len(heap))] == [5, 8]
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from algorithm import boyer_moore, gusfield_z
+from algorithm_test.helpers import occurrences
+
+
+def test_find_matches_brute_force():
+    generator = random.Random(1)
+    for alphabet in ("ab", "ACGT", "abcdefghijklmnopqrstuvwxyz", "".join(map(chr, range(256)))):
+        for _ in range(150):
+            text = "".join(generator.choice(alphabet) for _ in range(generator.randrange(60)))
+            pattern = "".join(generator.choice(alphabet[:3]) for _ in range(generator.randrange(1, 7)))
+            assert boyer_moore.BoyerMoore(text).find(pattern) == occurrences(text, pattern)
+            assert boyer_moore.compile_pattern(pattern.encode("latin-1")).find(text.encode("latin-1")) \
+                == occurrences(text, pattern)
+
+
+def test_find_stream_matches_find():
+    generator = random.Random(2)
+    for _ in range(100):
+        text = "".join(generator.choice("abc") for _ in range(generator.randrange(100)))
+        pattern = "".join(generator.choice("abc") for _ in range(generator.randrange(1, 5)))
+        size = generator.randrange(1, 10)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(boyer_moore.find_stream(chunks, pattern)) == occurrences(text, pattern)
+
+
+def test_shift_rules_are_reachable_from_boyer_moore():
+    matcher = boyer_moore.BoyerMoore("abcab", "aab")
+    compiled_pattern = boyer_moore.compile_pattern("aab")
+    for index in range(3):
+        for character in "abz":
+            assert matcher.get_next_shift(index, character) == compiled_pattern.get_next_shift(index, character) \
+                == max(compiled_pattern.get_bad_character_shift(index, character),
+                       compiled_pattern.get_good_suffix_shift(index))
+
+
+def test_compiled_patterns_are_cached_and_immutable():
+    for module, name in ((boyer_moore, "BoyerMoorePattern"), (gusfield_z, "ZPattern")):
+        module.compile_pattern.cache_clear()
+        compiled_pattern = module.compile_pattern("abab")
+        assert module.compile_pattern("abab") is compiled_pattern
+        assert module.compile_pattern.cache_info().hits == 1
+        assert repr(compiled_pattern) == "{}('abab')".format(name)
+        with pytest.raises(AttributeError):
+            compiled_pattern.pattern = "b"
+        with pytest.raises(AttributeError):
+            del compiled_pattern.pattern
+        assert compiled_pattern.pattern == "abab"
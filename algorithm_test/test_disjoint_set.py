@@ -0,0 +1,120 @@
+import random
+
+from algorithm import disjoint_set
+
+
+def brute_force_labels(n: int, edges: list) -> list:
+    """ Label the connected components by a graph search, numbered by their first item """
+    neighbours = [[] for _ in range(n)]
+    for item_1, item_2 in edges:
+        neighbours[item_1].append(item_2)
+        neighbours[item_2].append(item_1)
+    labels = [-1] * n
+    count = 0
+    for start in range(n):
+        if labels[start] >= 0:
+            continue
+        labels[start] = count
+        stack = [start]
+        while stack:
+            for neighbour in neighbours[stack.pop()]:
+                if labels[neighbour] < 0:
+                    labels[neighbour] = count
+                    stack.append(neighbour)
+        count += 1
+    return labels
+
+
+def random_edges(seed: int, n: int, e: int) -> list:
+    generator = random.Random(seed)
+    return [(generator.randrange(n), generator.randrange(n)) for _ in range(e)]
+
+
+def test_union_many_matches_graph_search():
+    for seed, (n, e) in enumerate([(1, 0), (10, 5), (100, 60), (500, 2000)]):
+        edges = random_edges(seed, n, e)
+        expected = brute_force_labels(n, edges)
+        for mode in ("size", "height"):
+            sequential_set = disjoint_set_of(n, mode)
+            merged = sequential_set.union_many(iter(edges), chunk_size=7)
+            assert list(sequential_set.components()) == expected
+            assert merged == n - len(set(expected)) == n - sequential_set.num_components
+
+
+def test_parallel_union_many_matches_sequential():
+    n = 300
+    edges = random_edges(7, n, 1000)
+    expected = brute_force_labels(n, edges)
+
+    indexed_set = disjoint_set_of(n)
+    assert indexed_set.union_many(edges, workers=3, chunk_size=64) == n - len(set(expected))
+    assert list(indexed_set.components()) == expected
+
+    # items which are not 0..n-1 are mapped to indexes in the workers
+    names = ["item-{}".format(i) for i in range(n)]
+    named_set = disjoint_set.DisjointSet(names)
+    named_set.union_many([(names[i], names[j]) for i, j in edges], workers=2, chunk_size=100)
+    assert list(named_set.components()) == expected
+
+
+def test_union_of_connected_items_is_a_no_op():
+    small_set = disjoint_set_of(4)
+    assert small_set.union(0, 1)
+    assert not small_set.union(1, 0)
+    assert small_set.num_components == 3
+
+
+def disjoint_set_of(n: int, mode: str = "size"):
+    return disjoint_set.DisjointSet(range(n), mode)
+
+
+def check_against_set_of_sets(seed: int, mode: str, aggregate: str, steps: int):
+    """ Run random adds and unions, modelled as a list of Python sets """
+    generator = random.Random(seed)
+    function = disjoint_set.DisjointSet.AGGREGATES[aggregate]
+    n = generator.randrange(1, 10)
+    values = {i: generator.randrange(-100, 100) for i in range(n)}
+    tested_set = disjoint_set.DisjointSet(range(n), mode, aggregate, [values[i] for i in range(n)])
+    model = [{i} for i in range(n)]
+    items = list(range(n))
+    for step in range(steps):
+        operation = generator.random()
+        if operation < 0.2:
+            # the next index keeps the 0..n-1 fast path until a name is added
+            item = len(items) if generator.random() < 0.7 else "item-{}".format(step)
+            values[item] = generator.randrange(-100, 100)
+            fast_path = tested_set.index_data is None
+            assert tested_set.add(item, values[item]) == len(items)
+            assert (tested_set.index_data is None) == (fast_path and type(item) is int)
+            items.append(item)
+            model.append({item})
+        else:
+            item_1, item_2 = generator.choice(items), generator.choice(items)
+            set_1 = next(members for members in model if item_1 in members)
+            set_2 = next(members for members in model if item_2 in members)
+            assert tested_set.union(item_1, item_2) == (set_1 is not set_2)
+            if set_1 is not set_2:
+                set_1 |= set_2
+                model.remove(set_2)
+        assert tested_set.num_components == len(model)
+        item = generator.choice(items)
+        members = next(members for members in model if item in members)
+        assert tested_set.size_of(item) == len(members)
+        expected = [values[member] for member in members]
+        total = expected[0]
+        for value in expected[1:]:
+            total = function(total, value)
+        assert tested_set.aggregate_of(item) == total
+        assert tested_set.find(item) in members
+    return tested_set
+
+
+def test_add_and_aggregates_match_set_of_sets():
+    seed = 0
+    for mode in ("size", "height"):
+        for aggregate in ("sum", "min", "max"):
+            for steps in (5, 50, 400):
+                tested_set = check_against_set_of_sets(seed, mode, aggregate, steps)
+                seed += 1
+            # the long runs added names, so the dictionary index took over
+            assert tested_set.index_data is not None
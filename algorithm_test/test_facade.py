@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+import algorithm
+from algorithm import facade
+from algorithm_test.helpers import occurrences, random_string
+
+ENGINES = ["shift_or", "kmp", "boyer_moore", "gusfield_z", "suffix_array", "aho_corasick"]
+
+
+def test_every_engine_matches_brute_force():
+    generator = random.Random(1)
+    for _ in range(100):
+        text = random_string(generator, "abcd", 0, 80)
+        pattern = random_string(generator, "abcd", 1, 12)
+        expected = occurrences(text, pattern)
+        assert algorithm.search(text, pattern) == expected
+        for engine in ENGINES:
+            assert algorithm.search(text, pattern, engine) == expected
+
+
+def test_pattern_sets():
+    generator = random.Random(2)
+    for _ in range(100):
+        text = random_string(generator, "abc", 0, 60)
+        patterns = [random_string(generator, "abc", 1, 4) for _ in range(4)]
+        expected = {pattern: occurrences(text, pattern) for pattern in patterns}
+        assert algorithm.search(text, patterns) == expected
+        assert algorithm.search(text, patterns, "kmp") == expected
+
+
+def test_bytes_like_patterns_are_single_patterns():
+    assert algorithm.search(b"hello", bytearray(b"ll")) == [2]
+    assert algorithm.search(b"hello", memoryview(b"l")) == [2, 3]
+    assert facade.choose_engine(b"hello", bytearray(b"ll")) == "shift_or"
+    assert algorithm.search(b"hello hello", memoryview(b"lo hel"), "boyer_moore") == [3]
+
+
+def test_search_index():
+    index = algorithm.SearchIndex("abracadabra")
+    assert algorithm.search(index, "abra") == [0, 7]
+    assert index.count("a") == 5
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_file(tmp_path, monkeypatch, workers):
+    # small ranges so that matches cross range boundaries
+    monkeypatch.setattr(facade, "RANGE_SIZE", 64)
+    generator = random.Random(3)
+    data = random_string(generator, "ab", 1000, 1001).encode()
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    for pattern in (b"ab", b"abba", bytearray(b"babab"), "aaa"):
+        expected = occurrences(data, pattern.encode() if isinstance(pattern, str) else bytes(pattern))
+        assert algorithm.search_file(str(path), pattern, workers) == expected
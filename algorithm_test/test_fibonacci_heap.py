@@ -0,0 +1,89 @@
+import heapq
+import random
+
+import pytest
+
+from algorithm import fibonacci_heap
+from algorithm_test.helpers import check_against_sorted_list
+
+
+def test_heap_matches_sorted_list():
+    for seed, steps in enumerate([10, 100, 2000, 5000]):
+        check_against_sorted_list(fibonacci_heap.FibonacciHeap, seed, steps)
+
+
+def test_decrease_key_of_extracted_node():
+    heap = fibonacci_heap.FibonacciHeap()
+    nodes = [heap.insert(key) for key in [5, 3, 8]]
+    extracted = heap.extract_min()
+    assert extracted is nodes[1]
+    with pytest.raises(AssertionError):
+        heap.decrease_key(extracted, 0)
+    assert [heap.extract_min().key for _ in range(len(heap))] == [5, 8]
+
+
+def test_decrease_key_on_empty_heap():
+    heap = fibonacci_heap.FibonacciHeap()
+    node = heap.insert(1)
+    heap.extract_min()
+    with pytest.raises(AssertionError):
+        heap.decrease_key(node, 0)
+    # a node of another heap cannot be decreased in an empty one either
+    with pytest.raises(AssertionError):
+        heap.decrease_key(fibonacci_heap.FibonacciHeap().insert(2), 0)
+
+
+def random_graph(seed: int, n: int, e: int) -> dict:
+    """ An undirected graph on 0..n-1 with random non-negative weights """
+    generator = random.Random(seed)
+    graph = {vertex: [] for vertex in range(n)}
+    for _ in range(e):
+        vertex_1, vertex_2, weight = generator.randrange(n), generator.randrange(n), generator.randrange(50)
+        graph[vertex_1].append((vertex_2, weight))
+        graph[vertex_2].append((vertex_1, weight))
+    return graph
+
+
+def heapq_dijkstra(graph: dict, source) -> dict:
+    distances = {}
+    queue = [(0, source)]
+    while queue:
+        distance, vertex = heapq.heappop(queue)
+        if vertex in distances:
+            continue
+        distances[vertex] = distance
+        for neighbour, weight in graph[vertex]:
+            if neighbour not in distances:
+                heapq.heappush(queue, (distance + weight, neighbour))
+    return distances
+
+
+def kruskal_total(graph: dict, vertices) -> int:
+    """ The weight of a minimum spanning tree of the given component """
+    parents = {vertex: vertex for vertex in vertices}
+
+    def find(vertex):
+        while parents[vertex] != vertex:
+            vertex = parents[vertex]
+        return vertex
+
+    edges = sorted((weight, vertex, neighbour) for vertex in vertices for neighbour, weight in graph[vertex])
+    total = 0
+    for weight, vertex, neighbour in edges:
+        root_1, root_2 = find(vertex), find(neighbour)
+        if root_1 != root_2:
+            parents[root_1] = root_2
+            total += weight
+    return total
+
+
+def test_dijkstra_and_prim_match_oracles():
+    for seed, (n, e) in enumerate([(1, 0), (5, 3), (30, 60), (200, 400), (300, 3000)]):
+        graph = random_graph(seed, n, e)
+        distances = fibonacci_heap.dijkstra(graph, 0)
+        assert distances == heapq_dijkstra(graph, 0)
+
+        edges = fibonacci_heap.prim(graph, 0)
+        assert len(edges) == len(distances) - 1
+        assert {vertex for _, vertex, _ in edges} == set(distances) - {0}
+        assert sum(weight for _, _, weight in edges) == kruskal_total(graph, distances)
@@ -0,0 +1,45 @@
+import random
+
+from algorithm import ukkonen
+
+
+def random_documents(generator: random.Random, count: int, max_length: int) -> list:
+    return ["".join(generator.choice("abc") for _ in range(generator.randrange(1, max_length)))
+            for _ in range(count)]
+
+
+def substrings(document: str) -> set:
+    return {document[i:j] for i in range(len(document)) for j in range(i + 1, len(document) + 1)}
+
+
+def test_find_all_and_count():
+    generator = random.Random(1)
+    for _ in range(50):
+        documents = random_documents(generator, generator.randrange(1, 5), 30)
+        tree = ukkonen.GeneralizedSuffixTree(documents)
+        for pattern in ("a", "ab", "bca", "cc"):
+            expected = [(doc_id, offset) for doc_id, document in enumerate(documents)
+                        for offset in range(len(document)) if document.startswith(pattern, offset)]
+            assert tree.find_all(pattern) == expected
+            assert tree.count(pattern) == len(expected)
+
+
+def test_longest_common_substring_matches_brute_force():
+    generator = random.Random(2)
+    for _ in range(150):
+        documents = random_documents(generator, generator.randrange(2, 6), 25)
+        tree = ukkonen.GeneralizedSuffixTree(documents)
+        doc_ids = generator.sample(range(len(documents)), generator.randrange(2, len(documents) + 1))
+        common = set.intersection(*(substrings(documents[doc_id]) for doc_id in doc_ids))
+        result = tree.longest_common_substring(doc_ids)
+        assert len(result) == max(map(len, common), default=0)
+        assert not result or result in common
+        assert len(tree.longest_common_substring()) == max(
+            map(len, set.intersection(*map(substrings, documents))), default=0)
+
+
+def test_single_text_methods_are_absent():
+    tree = ukkonen.GeneralizedSuffixTree(["abc", "bcd"])
+    for name in ("build_tree", "save", "load", "close"):
+        assert not hasattr(tree, name)
+    assert tree.find_all("bc") == [(0, 1), (1, 0)]
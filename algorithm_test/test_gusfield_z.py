@@ -0,0 +1,49 @@
+import random
+
+from algorithm import boyer_moore, gusfield_z
+from algorithm_test.helpers import occurrences
+
+
+def brute_force_z_values(string) -> list:
+    z_values = [0 for _ in range(len(string))]
+    for k in range(1, len(string)):
+        while k + z_values[k] < len(string) and string[z_values[k]] == string[k + z_values[k]]:
+            z_values[k] += 1
+    return z_values
+
+
+def random_strings(seed: int, count: int, max_length: int, alphabet: str = "ab"):
+    generator = random.Random(seed)
+    for _ in range(count):
+        yield "".join(generator.choice(alphabet) for _ in range(generator.randrange(max_length)))
+
+
+def test_z_values_match_brute_force():
+    # small alphabets make long Z-boxes, which exercise the extension of Case 2b
+    for string in random_strings(1, 500, 40):
+        expected = brute_force_z_values(string)
+        assert gusfield_z.extend_z_values(string, [0 for _ in range(len(string))]) == expected
+        assert boyer_moore.generate_z_values(string) == expected
+
+
+def test_naive_algorithm_finds_the_first_occurrence():
+    # a mismatch at the last pattern position must not be reported as a match
+    assert gusfield_z.naive_algorithm("ab", "aa") is None
+    assert gusfield_z.naive_algorithm("aab", "aaaab") == 2
+    generator = random.Random(2)
+    for text in random_strings(3, 300, 30, "abc"):
+        pattern = "".join(generator.choice("abc") for _ in range(generator.randrange(1, 4)))
+        expected = occurrences(text, pattern)
+        assert gusfield_z.naive_algorithm(pattern, text) == (expected[0] if expected else None)
+
+
+def test_z_pattern_matches_brute_force():
+    generator = random.Random(4)
+    for text in random_strings(5, 300, 60, "abc"):
+        pattern = "".join(generator.choice("abc") for _ in range(generator.randrange(1, 6)))
+        expected = occurrences(text, pattern)
+        assert gusfield_z.GusfieldZ(text).find_all(pattern) == expected
+        assert gusfield_z.GusfieldZ(text).find(pattern) == (expected[0] if expected else None)
+        assert gusfield_z.compile_pattern(pattern.encode()).find_all(text.encode()) == expected
+        chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+        assert list(gusfield_z.find_stream(chunks, pattern)) == expected
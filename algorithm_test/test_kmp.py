@@ -0,0 +1,42 @@
+import pickle
+import random
+
+from algorithm import kmp
+from algorithm_test.helpers import occurrences, random_string
+
+
+def test_knuth_morris_pratt_matches_brute_force():
+    generator = random.Random(1)
+    for _ in range(300):
+        text = random_string(generator, "abc", 0, 60)
+        pattern = random_string(generator, "abc", 1, 6)
+        assert kmp.KnuthMorrisPratt(text).find(pattern) == occurrences(text, pattern)
+        assert kmp.KnuthMorrisPratt(text.encode()).find(pattern.encode()) == occurrences(text, pattern)
+
+
+def test_matcher_resumes_from_checkpoints():
+    generator = random.Random(2)
+    for _ in range(100):
+        text = random_string(generator, "ab", 0, 80)
+        pattern = random_string(generator, "ab", 1, 5)
+        matcher = kmp.KMPMatcher(pattern)
+        found = []
+        for i in range(0, len(text), 9):
+            found += matcher.feed(text[i:i + 9])
+            # continue in a new matcher, once from a checkpoint and once through pickle
+            matcher = kmp.KMPMatcher(pattern, matcher.checkpoint()) if i % 2 else pickle.loads(pickle.dumps(matcher))
+        assert found == occurrences(text, pattern)
+
+
+def test_aho_corasick_matches_brute_force():
+    generator = random.Random(3)
+    for _ in range(200):
+        text = random_string(generator, "abc", 0, 60)
+        patterns = list(dict.fromkeys(random_string(generator, "abc", 1, 5) for _ in range(generator.randrange(1, 6))))
+        expected = sorted((offset + len(patterns[pattern_id]), pattern_id, offset)
+                          for pattern_id, pattern in enumerate(patterns) for offset in occurrences(text, pattern))
+        found = kmp.AhoCorasick(patterns).find(text)
+        # the occurrences are ordered by end position, patterns ending together in any order
+        assert sorted((offset + len(patterns[pattern_id]), pattern_id, offset)
+                      for pattern_id, offset in found) == expected
+        assert [offset + len(patterns[pattern_id]) for pattern_id, offset in found] == [end for end, _, _ in expected]
@@ -0,0 +1,47 @@
+import io
+import random
+
+from algorithm import lz77
+
+
+def random_data(seed: int, n: int, alphabet: bytes) -> bytes:
+    generator = random.Random(seed)
+    return bytes(generator.choice(alphabet) for _ in range(n))
+
+
+def round_trip(data: bytes, **options) -> bytes:
+    """ Compress and decompress through streams, checking the reported sizes """
+    compressed, restored = io.BytesIO(), io.BytesIO()
+    codec = lz77.LZ77(**options)
+    assert codec.compress(io.BytesIO(data), compressed) == len(compressed.getvalue())
+    compressed.seek(0)
+    assert codec.decompress(compressed, restored) == len(data)
+    return restored.getvalue()
+
+
+def test_round_trip_across_parameters():
+    texts = [b"", b"a", b"ab", b"abc", b"aaaa" * 100,
+             random_data(0, 3000, b"ab"), random_data(1, 3000, b"abcd "), random_data(2, 2000, bytes(range(256)))]
+    for window_size in (1, 2, 3, 17, 255, 4096, 65535):
+        for max_length in (3, 4, 17, 255):
+            for data in texts:
+                assert round_trip(data, window_size=window_size, max_length=max_length) == data
+
+
+def test_round_trip_with_single_byte_chunks():
+    for seed, window_size in enumerate([1, 5, 64, 65535]):
+        data = random_data(seed, 1500, b"abc")
+        assert round_trip(data, window_size=window_size, chunk_size=1) == data
+        # a stream written with any chunk size decompresses with any other
+        assert lz77.decompress(lz77.compress(data, window_size=window_size, chunk_size=1)) == data
+        compressed = lz77.compress(data, window_size=window_size)
+        restored = io.BytesIO()
+        lz77.LZ77(chunk_size=1).decompress(io.BytesIO(compressed), restored)
+        assert restored.getvalue() == data
+
+
+def test_round_trip_of_long_random_input():
+    generator = random.Random(3)
+    data = bytes(generator.randrange(256) for _ in range(70000)) + random_data(4, 70000, b"xyz")
+    assert lz77.decompress(lz77.compress(data, window_size=1000, chunk_size=4096)) == data
+    assert lz77.decompress(lz77.compress(data)) == data
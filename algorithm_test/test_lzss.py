@@ -0,0 +1,76 @@
+import io
+import random
+
+from algorithm import lzss
+
+
+class TrickleStream(io.RawIOBase):
+    """ A raw stream which returns at most chunk bytes per read, like a pipe """
+
+    def __init__(self, data: bytes, chunk: int):
+        self.data = data
+        self.chunk = chunk
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        size = self.chunk if size < 0 else min(size, self.chunk)
+        part = self.data[self.position:self.position + size]
+        self.position += len(part)
+        return part
+
+
+def random_data(seed: int, n: int) -> bytes:
+    generator = random.Random(seed)
+    return bytes(generator.choice(b"abcd ") for _ in range(n))
+
+
+def test_round_trip():
+    for seed, n in enumerate([0, 1, 2, 3, 100, 5000, 20000]):
+        data = random_data(seed, n)
+        assert lzss.decompress(lzss.compress(data, block_size=4096)) == data
+
+
+def test_short_reads_fill_whole_blocks():
+    data = random_data(1, 30000)
+    destination = io.BytesIO()
+    lzss.LZSS(block_size=4096).compress(TrickleStream(data, 1000), destination)
+    reader = lzss.LZSSReader(io.BytesIO(destination.getvalue()))
+    assert [size for _, _, size in reader.index] == [4096] * 7 + [30000 - 7 * 4096]
+    assert reader.read(5000, 10) == data[5000:5010]
+
+
+def test_read_ranges_with_uneven_blocks():
+    data = random_data(2, 20000)
+    # a container whose blocks are shorter than its block size, as older writers produced
+    blocks = [data[:1000], data[1000:5000], data[5000:5001], data[5001:]]
+    container = io.BytesIO()
+    container.write(lzss.HEADER.pack(lzss.MAGIC, 4096))
+    index = bytearray()
+    offset = lzss.HEADER.size
+    for block in blocks:
+        compressed = lzss.compress_block(block)
+        container.write(compressed)
+        index += lzss.ENTRY.pack(offset, len(compressed), len(block))
+        offset += len(compressed)
+    container.write(index)
+    container.write(lzss.FOOTER.pack(offset, len(blocks), lzss.MAGIC))
+
+    reader = lzss.LZSSReader(container)
+    generator = random.Random(3)
+    for _ in range(300):
+        start = generator.randrange(len(data) + 100)
+        size = generator.randrange(6000)
+        assert reader.read(start, size) == data[start:start + size]
+
+
+def test_parallel_round_trip_matches_sequential():
+    data = random_data(4, 50000)
+    container = lzss.compress(data, block_size=4096, workers=2)
+    assert container == lzss.compress(data, block_size=4096, workers=1)
+    destination = io.BytesIO()
+    assert lzss.LZSSReader(io.BytesIO(container)).decompress(destination, workers=2) == len(data)
+    assert destination.getvalue() == data
+    assert lzss.decompress(container, workers=2) == data
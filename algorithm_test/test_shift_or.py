@@ -0,0 +1,58 @@
+import random
+
+from algorithm import shift_or
+from algorithm_test.helpers import random_string
+
+
+def edit_distance_ends(text: str, pattern: str, k: int) -> list:
+    """ The ends of the substrings within edit distance k of the pattern, by dynamic programming """
+    m = len(pattern)
+    column = list(range(m + 1))    # a match may start anywhere, so row 0 stays 0
+    ends = []
+    for i, character in enumerate(text):
+        previous, column[0] = column[0], 0
+        for j in range(1, m + 1):
+            current = column[j]
+            column[j] = min(current + 1, column[j - 1] + 1, previous + (pattern[j - 1] != character))
+            previous = current
+        if column[m] <= k:
+            ends.append(i + 1)
+    return ends
+
+
+def test_exact_matches():
+    generator = random.Random(1)
+    for _ in range(300):
+        text = random_string(generator, "abc", 0, 60)
+        pattern = random_string(generator, "abc", 1, 6)
+        expected = [i for i in range(len(text) - len(pattern) + 1) if text.startswith(pattern, i)]
+        assert shift_or.ShiftOr(pattern).find_all(text) == expected
+        assert shift_or.ShiftOr(pattern.encode()).find_all(text.encode()) == expected
+
+
+def test_mismatches():
+    generator = random.Random(2)
+    for _ in range(300):
+        text = random_string(generator, "abc", 0, 60)
+        pattern = random_string(generator, "abc", 1, 6)
+        k = generator.randrange(len(pattern))
+        expected = [i for i in range(len(text) - len(pattern) + 1)
+                    if sum(a != b for a, b in zip(text[i:], pattern)) <= k]
+        assert shift_or.ShiftOr(pattern).find_mismatches(text, k) == expected
+
+
+def test_edits():
+    generator = random.Random(3)
+    for _ in range(300):
+        text = random_string(generator, "abc", 0, 40)
+        pattern = random_string(generator, "abc", 1, 6)
+        k = generator.randrange(len(pattern))
+        assert shift_or.ShiftOr(pattern).find_edits(text, k) == edit_distance_ends(text, pattern, k)
+
+
+def test_character_classes():
+    log = "ERR01 ok ERR9x ERR42 err77"
+    assert shift_or.ShiftOr("ERR[0-9][0-9]", classes=True).find_all(log) == [0, 15]
+    assert shift_or.ShiftOr("ERR[^0-9].", classes=True).find_all("ERRxy ERR12") == [0]
+    assert shift_or.ShiftOr("a.c", classes=True).find_all("abc a-c ac") == [0, 4]
+    assert shift_or.ShiftOr("\\[x\\]", classes=True).find_all("[x] x") == [0]
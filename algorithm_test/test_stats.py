@@ -0,0 +1,68 @@
+import random
+from collections import Counter
+
+from algorithm import boyer_moore, gusfield_z, ukkonen
+from algorithm_test.helpers import random_string
+
+NODE_ARRAYS = ("start_index", "end_index", "suffix_link", "first_child", "next_sibling")
+
+
+def test_boyer_moore_find():
+    generator = random.Random(1)
+    for _ in range(300):
+        text = random_string(generator, "abc", 0, 80)
+        pattern = random_string(generator, "abc", 1, 6)
+        stats = Counter()
+        compiled_pattern = boyer_moore.compile_pattern(pattern)
+        assert compiled_pattern.find(text, stats) == compiled_pattern.find(text)
+        assert boyer_moore.BoyerMoore(text).find(pattern, Counter()) == boyer_moore.BoyerMoore(text).find(pattern)
+        assert stats["comparisons"] <= len(text) * len(pattern)
+
+
+def test_z_values():
+    generator = random.Random(2)
+    for _ in range(300):
+        string = random_string(generator, "ab", 0, 60)
+        stats = Counter()
+        assert gusfield_z.extend_z_values(string, [0] * len(string), stats=stats) \
+            == gusfield_z.extend_z_values(string, [0] * len(string))
+        assert stats["z.explicit"] + stats["z.box_reuses"] + stats["z.box_extensions"] == max(len(string) - 1, 0)
+
+
+def test_z_pattern_scan():
+    generator = random.Random(3)
+    for _ in range(300):
+        text = random_string(generator, "ab", 0, 80)
+        pattern = random_string(generator, "ab", 1, 6)
+        compiled_pattern = gusfield_z.compile_pattern(pattern)
+        assert compiled_pattern.find_all(text, Counter()) == compiled_pattern.find_all(text)
+        assert compiled_pattern.find(text, Counter()) == compiled_pattern.find(text)
+        assert gusfield_z.GusfieldZ(text).find_all(pattern, Counter()) == gusfield_z.GusfieldZ(text).find_all(pattern)
+
+
+def test_suffix_tree_build():
+    generator = random.Random(4)
+    for _ in range(100):
+        text = random_string(generator, generator.choice(["ab", "ACGT"]), 0, 120)
+        plain_tree = ukkonen.SuffixTree(text)
+        plain_tree.build_tree()
+        stats = Counter()
+        counted_tree = ukkonen.SuffixTree(text)
+        counted_tree.build_tree(stats)
+        for name in NODE_ARRAYS:
+            assert getattr(counted_tree, name) == getattr(plain_tree, name)
+        assert stats["leaves"] == len(text) + 1
+
+
+def test_generalized_suffix_tree_documents():
+    generator = random.Random(5)
+    for _ in range(50):
+        documents = [random_string(generator, "ab", 1, 30) for _ in range(generator.randrange(1, 5))]
+        plain_tree = ukkonen.GeneralizedSuffixTree(documents)
+        stats = Counter()
+        counted_tree = ukkonen.GeneralizedSuffixTree()
+        for document in documents:
+            counted_tree.add_document(document, stats)
+        for name in NODE_ARRAYS:
+            assert getattr(counted_tree, name) == getattr(plain_tree, name)
+        assert stats["leaves"] == sum(len(document) + 1 for document in documents)
@@ -0,0 +1,96 @@
+import random
+
+from algorithm import ukkonen
+from algorithm_test.helpers import occurrences
+
+ALPHABETS = ["ab", "ACGT", "abcdefghijklmnopqrstuvwxyz"]
+
+
+def random_texts(seed: int, count: int, max_length: int):
+    """ Generate random str texts, and every other one as bytes """
+    generator = random.Random(seed)
+    for i in range(count):
+        alphabet = ALPHABETS[i % len(ALPHABETS)]
+        text = "".join(generator.choice(alphabet) for _ in range(generator.randrange(max_length)))
+        yield text.encode() if i % 2 else text
+
+
+def random_patterns(text, generator: random.Random, count: int) -> list:
+    """ Substrings of the text and a few random strings which may not occur """
+    patterns = []
+    for _ in range(count):
+        if text and generator.random() < 0.7:
+            start = generator.randrange(len(text))
+            patterns.append(text[start:start + generator.randrange(1, 8)])
+        else:
+            pattern = "".join(generator.choice("abcGT") for _ in range(generator.randrange(1, 4)))
+            patterns.append(pattern.encode() if isinstance(text, bytes) else pattern)
+    return patterns
+
+
+def test_induced_sort_matches_sorted_suffixes():
+    for text in random_texts(1, 200, 200):
+        suffix_array = ukkonen.SuffixArray(text)
+        suffix_array.build_array()
+        assert list(suffix_array.suffix_array) == sorted(range(len(text)), key=lambda i: text[i:])
+
+
+def test_suffix_array_queries():
+    generator = random.Random(2)
+    for text in random_texts(3, 100, 300):
+        suffix_array = ukkonen.SuffixArray(text)
+        suffix_array.build_array()
+        for pattern in random_patterns(text, generator, 10):
+            expected = occurrences(text, pattern)
+            assert suffix_array.find_all(pattern) == expected
+            assert suffix_array.count(pattern) == len(expected)
+            assert suffix_array.match_pattern(pattern) == bool(expected)
+
+
+def build_tree(text):
+    tree = ukkonen.SuffixTree(text)
+    tree.build_tree()
+    return tree
+
+
+def test_suffix_tree_queries():
+    generator = random.Random(4)
+    for text in random_texts(5, 100, 300):
+        tree = build_tree(text)
+        for pattern in random_patterns(text, generator, 10):
+            expected = occurrences(text, pattern)
+            assert tree.find_all(pattern) == expected
+            assert tree.count(pattern) == len(expected)
+            assert bool(tree.match_pattern(pattern)) == bool(expected)
+
+
+def test_suffix_tree_holds_every_suffix():
+    for text in random_texts(6, 60, 60):
+        tree = build_tree(text)
+        for start in range(len(text)):
+            assert start in tree.find_all(text[start:])
+
+
+def test_saved_tree_answers_like_the_built_one(tmp_path):
+    generator = random.Random(7)
+    for i, text in enumerate(random_texts(8, 20, 300)):
+        tree = build_tree(text)
+        path = str(tmp_path / "tree-{}.bin".format(i))
+        tree.save(path)
+        mapped_tree = ukkonen.SuffixTree.load(path)
+        try:
+            assert len(mapped_tree) == len(tree)
+            assert mapped_tree.nbytes() == tree.nbytes()
+            for pattern in random_patterns(text, generator, 10):
+                assert mapped_tree.find_all(pattern) == tree.find_all(pattern)
+                assert mapped_tree.count(pattern) == tree.count(pattern)
+        finally:
+            mapped_tree.close()
+
+
+def test_nbytes_counts_every_node_array():
+    tree = ukkonen.SuffixTree("mississippi")
+    tree.build_tree()
+    assert tree.nbytes() == sum(getattr(tree, name).itemsize * len(tree) for name in ukkonen.SuffixTree.NODE_ARRAYS)
+    # six 4 byte slots for every node and at most 2n+1 nodes
+    assert tree.nbytes() <= 24 * (2 * 11 + 1)